@@ -1,4 +1,19 @@
-from ..analyzers.base_analyzer import BaseAnalyzer
-from ..analyzers.deepseek_analyzer import DeepSeekAnalyzer
+from typing import TYPE_CHECKING
 
-__all__ = ['BaseAnalyzer', 'DeepSeekAnalyzer'] 
\ No newline at end of file
+from ..utils.lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from ..analyzers.base_analyzer import BaseAnalyzer
+    from ..analyzers.deepseek_analyzer import DeepSeekAnalyzer
+    from ..analyzers.multi_backend_analyzer import MultiBackendAnalyzer
+
+# 导入openai较慢，子模块在首次访问时才导入
+_EXPORTS = {
+    'BaseAnalyzer': ('base_analyzer', 'BaseAnalyzer'),
+    'DeepSeekAnalyzer': ('deepseek_analyzer', 'DeepSeekAnalyzer'),
+    'MultiBackendAnalyzer': ('multi_backend_analyzer', 'MultiBackendAnalyzer')
+}
+
+__all__ = list(_EXPORTS)
+
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS, globals())
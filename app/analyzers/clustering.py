@@ -0,0 +1,304 @@
+#!/usr/bin/env python
+"""
+主题聚类模块
+
+把一批文章按主题分组，以便每组单独生成一个较小的分析请求并发调用。
+标题和正文开头的字符n-gram经TF-IDF加权后存为SciPy稀疏矩阵，
+按行归一化后用余弦相似度做球面小批量k-means，文章太少的主题并入最相近的主题。
+依赖NumPy和SciPy；未安装时不拆分
+"""
+
+import math
+from typing import Dict, List, Optional, Tuple
+
+try:
+    import numpy as np
+    from scipy import sparse
+except ImportError:  # NumPy/SciPy是可选依赖，缺少时不聚类
+    np = None
+    sparse = None
+
+from ..config.settings import (
+    CLUSTER_MIN_ARTICLES,
+    CLUSTER_TARGET_SIZE,
+    CLUSTER_MAX_CLUSTERS,
+    CLUSTER_MIN_SIZE,
+    CLUSTER_NGRAM_RANGE,
+    CLUSTER_MAX_FEATURES,
+    CLUSTER_TEXT_CHARS
+)
+from ..models.article import Article
+from ..utils.logger import logger
+
+# 小批量k-means参数
+_BATCH_SIZE = 64
+_ITERATIONS = 30
+_KEYWORDS = 3
+
+
+def char_ngrams(text: str, ngram_range: Tuple[int, int] = CLUSTER_NGRAM_RANGE) -> List[str]:
+    """
+    提取字符n-gram，跳过含空白或标点的片段
+
+    Args:
+        text: 文本
+        ngram_range: n的最小值和最大值
+
+    Returns:
+        List[str]: n-gram列表
+    """
+    text = text.lower()
+    grams = []
+    low, high = ngram_range
+    for n in range(low, high + 1):
+        grams.extend(
+            gram for gram in (text[i:i + n] for i in range(len(text) - n + 1))
+            if gram.isalnum()
+        )
+    return grams
+
+
+def tfidf_matrix(
+    texts: List[str],
+    ngram_range: Tuple[int, int] = CLUSTER_NGRAM_RANGE,
+    max_features: int = CLUSTER_MAX_FEATURES,
+    min_df: int = 2
+) -> Tuple["sparse.csr_matrix", List[str]]:
+    """
+    构建按行L2归一化的TF-IDF稀疏矩阵
+
+    Args:
+        texts: 文本列表
+        ngram_range: 字符n-gram的长度范围
+        max_features: 按文档频率保留的最多特征数
+        min_df: 特征至少出现的文档数
+
+    Returns:
+        Tuple[sparse.csr_matrix, List[str]]: 文本数 x 特征数的矩阵和特征列表
+    """
+    vocabulary: Dict[str, int] = {}
+    indptr = [0]
+    columns = []
+    counts = []
+    for text in texts:
+        row: Dict[int, int] = {}
+        for gram in char_ngrams(text, ngram_range):
+            column = vocabulary.setdefault(gram, len(vocabulary))
+            row[column] = row.get(column, 0) + 1
+        columns.extend(row.keys())
+        counts.extend(row.values())
+        indptr.append(len(columns))
+
+    columns = np.asarray(columns, dtype=np.int64)
+    matrix = sparse.csr_matrix(
+        (np.asarray(counts, dtype=np.float32), columns, np.asarray(indptr, dtype=np.int64)),
+        shape=(len(texts), len(vocabulary))
+    )
+
+    # 按文档频率筛选特征
+    df = np.bincount(columns, minlength=len(vocabulary))
+    candidates = np.flatnonzero(df >= min(min_df, len(texts)))
+    if len(candidates) > max_features:
+        candidates = candidates[np.argsort(-df[candidates], kind="stable")[:max_features]]
+        candidates.sort()
+    matrix = matrix[:, candidates].tocsr()
+    df = df[candidates]
+
+    # 次线性TF * 平滑IDF，按行归一化
+    matrix.data = 1.0 + np.log(matrix.data)
+    idf = np.log((1.0 + len(texts)) / (1.0 + df)) + 1.0
+    matrix = matrix @ sparse.diags(idf.astype(np.float32))
+    norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+    matrix = sparse.diags(1.0 / np.where(norms > 0, norms, 1.0)) @ matrix
+
+    names = list(vocabulary)
+    return matrix.tocsr(), [names[i] for i in candidates]
+
+
+def _normalize_rows(centers: "np.ndarray") -> "np.ndarray":
+    """把聚类中心归一化到单位长度"""
+    norms = np.linalg.norm(centers, axis=1, keepdims=True)
+    return centers / np.where(norms > 0, norms, 1.0)
+
+
+def minibatch_kmeans(
+    matrix: "sparse.csr_matrix",
+    k: int,
+    batch_size: int = _BATCH_SIZE,
+    iterations: int = _ITERATIONS,
+    seed: int = 0
+) -> Tuple["np.ndarray", "np.ndarray"]:
+    """
+    球面小批量k-means(余弦相似度)，k-means++初始化
+
+    Args:
+        matrix: 按行归一化的稀疏矩阵
+        k: 聚类数
+        batch_size: 每次迭代抽样的行数
+        iterations: 迭代次数
+        seed: 随机种子
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: 相似度矩阵(行数 x k)和聚类中心
+    """
+    rng = np.random.default_rng(seed)
+    rows = matrix.shape[0]
+
+    # k-means++：按与已选中心的余弦距离平方抽样
+    chosen = [int(rng.integers(rows))]
+    distance = np.full(rows, np.inf)
+    for _ in range(1, k):
+        similarity = np.asarray((matrix @ matrix[chosen[-1]].T).todense()).ravel()
+        distance = np.minimum(distance, np.clip(1.0 - similarity, 0.0, None) ** 2)
+        total = distance.sum()
+        if total <= 0:
+            break
+        chosen.append(int(rng.choice(rows, p=distance / total)))
+    centers = matrix[chosen].toarray()
+    k = len(chosen)
+
+    counts = np.zeros(k)
+    for _ in range(iterations):
+        batch = rng.choice(rows, size=min(batch_size, rows), replace=False)
+        sample = matrix[batch]
+        labels = np.asarray(sample @ centers.T).argmax(axis=1)
+        for center in np.unique(labels):
+            members = sample[labels == center]
+            counts[center] += members.shape[0]
+            rate = members.shape[0] / counts[center]
+            centers[center] = (1.0 - rate) * centers[center] + rate * np.asarray(members.mean(axis=0)).ravel()
+        centers = _normalize_rows(centers)
+
+    return np.asarray(matrix @ centers.T), centers
+
+
+class TopicCluster:
+    """一个主题下的文章"""
+
+    def __init__(self, articles: List[Article], keywords: List[str]):
+        self.articles = articles
+        self.keywords = keywords
+
+    @property
+    def label(self) -> str:
+        """主题标签，由关键词拼成"""
+        return "、".join(self.keywords) if self.keywords else "其他"
+
+    def __len__(self) -> int:
+        return len(self.articles)
+
+
+class TopicClusterer:
+    """文章主题聚类器"""
+
+    def __init__(
+        self,
+        min_articles: int = CLUSTER_MIN_ARTICLES,
+        target_size: int = CLUSTER_TARGET_SIZE,
+        max_clusters: int = CLUSTER_MAX_CLUSTERS,
+        min_size: int = CLUSTER_MIN_SIZE,
+        ngram_range: Tuple[int, int] = CLUSTER_NGRAM_RANGE,
+        max_features: int = CLUSTER_MAX_FEATURES,
+        text_chars: int = CLUSTER_TEXT_CHARS,
+        seed: int = 0
+    ):
+        """
+        初始化聚类器
+
+        Args:
+            min_articles: 文章数达到该值才聚类
+            target_size: 每个主题的目标文章数
+            max_clusters: 最多的主题数
+            min_size: 文章数少于该值的主题并入最相近的主题
+            ngram_range: 字符n-gram的长度范围
+            max_features: 最多保留的特征数
+            text_chars: 每篇文章参与聚类的正文字符数
+            seed: 随机种子，相同输入得到相同分组
+        """
+        self.min_articles = min_articles
+        self.target_size = target_size
+        self.max_clusters = max_clusters
+        self.min_size = min_size
+        self.ngram_range = ngram_range
+        self.max_features = max_features
+        self.text_chars = text_chars
+        self.seed = seed
+        self.logger = logger
+        self._warned = False
+
+    @property
+    def available(self) -> bool:
+        """是否安装了NumPy和SciPy"""
+        return np is not None and sparse is not None
+
+    def should_cluster(self, articles: List[Article]) -> bool:
+        """文章数是否达到聚类的门槛"""
+        if len(articles) < max(self.min_articles, 2):
+            return False
+        if not self.available:
+            if not self._warned:
+                self.logger.warning("未安装numpy/scipy，跳过主题聚类: pip install numpy scipy")
+                self._warned = True
+            return False
+        return True
+
+    def cluster(self, articles: List[Article], k: Optional[int] = None) -> List[TopicCluster]:
+        """
+        按主题分组
+
+        Args:
+            articles: 文章列表
+            k: 聚类数，默认按target_size和max_clusters确定
+
+        Returns:
+            List[TopicCluster]: 按文章数从多到少排列的主题，组内保持原有顺序
+        """
+        if k is None:
+            k = min(self.max_clusters, math.ceil(len(articles) / self.target_size))
+        k = min(k, len(articles))
+        if k <= 1 or not self.available:
+            return [TopicCluster(list(articles), [])]
+
+        # 标题出现两次以提高权重
+        texts = [f"{a.title}\n{a.title}\n{a.content[:self.text_chars]}" for a in articles]
+        matrix, features = tfidf_matrix(texts, self.ngram_range, self.max_features)
+        if matrix.shape[1] == 0:
+            return [TopicCluster(list(articles), [])]
+
+        similarity, centers = minibatch_kmeans(matrix, k, seed=self.seed)
+        labels = similarity.argmax(axis=1)
+
+        # 太小的主题并入最相近的主题
+        sizes = np.bincount(labels, minlength=centers.shape[0])
+        valid = np.flatnonzero(sizes >= self.min_size)
+        if len(valid) == 0:
+            return [TopicCluster(list(articles), [])]
+        labels = valid[similarity[:, valid].argmax(axis=1)]
+
+        clusters = []
+        for center in valid:
+            members = [article for article, label in zip(articles, labels) if label == center]
+            if not members:
+                continue
+            top = np.argsort(-centers[center], kind="stable")[:_KEYWORDS * 3]
+            clusters.append(TopicCluster(members, self._keywords([features[i] for i in top])))
+        clusters.sort(key=len, reverse=True)
+        return clusters
+
+    @staticmethod
+    def _keywords(grams: List[str], max_length: int = 6) -> List[str]:
+        """把首尾相接的n-gram拼成短语，去掉被已有短语包含的n-gram"""
+        keywords: List[str] = []
+        for gram in grams:
+            for i, keyword in enumerate(keywords):
+                if gram in keyword:
+                    break
+                if len(keyword) < max_length and keyword.endswith(gram[:-1]):
+                    keywords[i] = keyword + gram[-1]
+                    break
+                if len(keyword) < max_length and keyword.startswith(gram[1:]):
+                    keywords[i] = gram[0] + keyword
+                    break
+            else:
+                keywords.append(gram)
+        return keywords[:_KEYWORDS]
@@ -0,0 +1,268 @@
+#!/usr/bin/env python
+"""
+抽取式预压缩模块
+
+在调用模型前于本地挑选每篇文章的关键句：先去掉免责声明、"相关阅读"等套话，
+再以字二元组/英文单词为特征计算句子的TF-IDF向量，在余弦相似度图上跑TextRank，
+按得分从高到低保留句子直到达到目标比例，最后按原文顺序拼接。
+只用CPU和NumPy；未安装NumPy时原样返回
+"""
+
+import math
+import re
+import time
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # NumPy是可选依赖，缺少时跳过压缩
+    np = None
+
+from ..config.settings import (
+    COMPRESSION_RATIO,
+    COMPRESSION_MIN_TOKENS,
+    COMPRESSION_MIN_SENTENCES,
+    COMPRESSION_LEAD_BONUS,
+    COMPRESSION_BOILERPLATE_PATTERNS
+)
+from ..utils.logger import logger
+from ..utils.tokens import estimate_tokens
+
+# 句子：到句末标点(可带右引号)或换行为止
+_SENTENCE_RE = re.compile(r"[^。！？!?；;\n]+(?:[。！？!?；;]+[”’」』\"']?)?")
+_WORD_RE = re.compile(r"[a-z0-9]+")
+_CJK_RUN_RE = re.compile(r"[\u4e00-\u9fff]+")
+
+# TextRank参数
+_DAMPING = 0.85
+_MAX_ITERATIONS = 50
+_TOLERANCE = 1e-6
+
+
+def split_sentences(text: str) -> List[Tuple[int, str]]:
+    """
+    把正文切分为句子，保留句末标点
+
+    Args:
+        text: 正文
+
+    Returns:
+        List[Tuple[int, str]]: (所在段落序号, 去掉首尾空白后的句子)
+    """
+    sentences = []
+    for paragraph_index, paragraph in enumerate(text.split("\n")):
+        for sentence in _SENTENCE_RE.findall(paragraph):
+            sentence = sentence.strip()
+            if sentence:
+                sentences.append((paragraph_index, sentence))
+    return sentences
+
+
+def sentence_features(sentence: str) -> List[str]:
+    """句子的特征：英文单词和数字，以及汉字二元组(单字句子用单字)"""
+    lowered = sentence.lower()
+    features = _WORD_RE.findall(lowered)
+    for run in _CJK_RUN_RE.findall(lowered):
+        if len(run) == 1:
+            features.append(run)
+        else:
+            features.extend(run[i:i + 2] for i in range(len(run) - 1))
+    return features
+
+
+def textrank_scores(sentences: List[str]) -> "np.ndarray":
+    """
+    计算句子的TextRank得分
+
+    Args:
+        sentences: 句子列表
+
+    Returns:
+        np.ndarray: 每个句子的得分，总和为1
+    """
+    count = len(sentences)
+    vocabulary: Dict[str, int] = {}
+    rows, cols, values = [], [], []
+    for row, sentence in enumerate(sentences):
+        for feature, tf in Counter(sentence_features(sentence)).items():
+            rows.append(row)
+            cols.append(vocabulary.setdefault(feature, len(vocabulary)))
+            values.append(1.0 + math.log(tf))
+
+    if not vocabulary:
+        return np.full(count, 1.0 / count)
+
+    # 次线性TF * 平滑IDF，按行归一化后点积即为余弦相似度
+    matrix = np.zeros((count, len(vocabulary)), dtype=np.float32)
+    matrix[rows, cols] = values
+    df = np.count_nonzero(matrix, axis=0)
+    matrix *= (np.log((1.0 + count) / (1.0 + df)) + 1.0).astype(np.float32)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    matrix /= np.where(norms > 0, norms, 1.0)
+
+    similarity = matrix @ matrix.T
+    np.fill_diagonal(similarity, 0.0)
+
+    # 按行归一化为转移矩阵，孤立句子均匀跳转
+    weights = similarity.sum(axis=1, keepdims=True)
+    transition = np.where(weights > 0, similarity / np.where(weights > 0, weights, 1.0), 1.0 / count)
+
+    scores = np.full(count, 1.0 / count)
+    for _ in range(_MAX_ITERATIONS):
+        updated = (1.0 - _DAMPING) / count + _DAMPING * (transition.T @ scores)
+        if np.abs(updated - scores).sum() < _TOLERANCE:
+            scores = updated
+            break
+        scores = updated
+    return scores
+
+
+def _join_sentences(sentences: List[Tuple[int, str]]) -> str:
+    """按段落拼接句子，同一段落内的英文句子之间补空格"""
+    parts = []
+    previous = None
+    for paragraph_index, sentence in sentences:
+        if previous is not None:
+            if paragraph_index != previous:
+                parts.append("\n")
+            elif parts[-1][-1:].isascii() and sentence[:1].isascii():
+                parts.append(" ")
+        parts.append(sentence)
+        previous = paragraph_index
+    return "".join(parts)
+
+
+class CompressionReport:
+    """一次压缩的统计结果"""
+
+    def __init__(self):
+        self.articles = 0
+        self.compressed = 0
+        self.tokens_before = 0
+        self.tokens_after = 0
+        self.elapsed = 0.0
+
+    @property
+    def ratio(self) -> float:
+        """压缩后与压缩前的token比例"""
+        return self.tokens_after / self.tokens_before if self.tokens_before else 1.0
+
+    def to_dict(self) -> Dict[str, float]:
+        """转换为字典"""
+        return {
+            "articles": self.articles,
+            "compressed_articles": self.compressed,
+            "tokens_before": self.tokens_before,
+            "tokens_after": self.tokens_after,
+            "ratio": round(self.ratio, 3),
+            "elapsed_ms": round(self.elapsed * 1000, 3)
+        }
+
+
+class ExtractiveCompressor:
+    """抽取式压缩器"""
+
+    def __init__(
+        self,
+        ratio: float = COMPRESSION_RATIO,
+        min_tokens: int = COMPRESSION_MIN_TOKENS,
+        min_sentences: int = COMPRESSION_MIN_SENTENCES,
+        lead_bonus: float = COMPRESSION_LEAD_BONUS,
+        boilerplate_patterns: Optional[List[str]] = None
+    ):
+        """
+        初始化压缩器
+
+        Args:
+            ratio: 每篇文章保留的token比例
+            min_tokens: 正文少于该token数的文章不压缩(套话仍会去掉)
+            min_sentences: 每篇文章至少保留的句子数
+            lead_bonus: 导语(前两句)的得分加成
+            boilerplate_patterns: 命中即去掉的句子片段，默认使用COMPRESSION_BOILERPLATE_PATTERNS
+        """
+        self.ratio = ratio
+        self.min_tokens = min_tokens
+        self.min_sentences = min_sentences
+        self.lead_bonus = lead_bonus
+        self.boilerplate_patterns = (
+            COMPRESSION_BOILERPLATE_PATTERNS if boilerplate_patterns is None else boilerplate_patterns
+        )
+        self.logger = logger
+        self._warned = False
+
+    @property
+    def available(self) -> bool:
+        """是否安装了NumPy"""
+        return np is not None
+
+    def is_boilerplate(self, sentence: str) -> bool:
+        """句子是否是套话"""
+        return any(pattern in sentence for pattern in self.boilerplate_patterns)
+
+    def compress(self, text: str) -> str:
+        """
+        压缩一篇文章的正文
+
+        Args:
+            text: 正文
+
+        Returns:
+            str: 按原文顺序拼接的关键句
+        """
+        all_sentences = split_sentences(text)
+        sentences = [item for item in all_sentences if not self.is_boilerplate(item[1])]
+        if not sentences:
+            return text
+
+        sizes = [estimate_tokens(sentence) for _, sentence in sentences]
+        total = sum(sizes)
+        if total < self.min_tokens or len(sentences) <= self.min_sentences:
+            # 短文章只去掉套话
+            return _join_sentences(sentences) if len(sentences) < len(all_sentences) else text
+
+        scores = textrank_scores([sentence for _, sentence in sentences])
+        scores[:2] *= 1.0 + self.lead_bonus
+
+        target = total * self.ratio
+        kept = set()
+        kept_tokens = 0
+        for index in np.argsort(-scores, kind="stable"):
+            if kept_tokens >= target and len(kept) >= self.min_sentences:
+                break
+            kept.add(int(index))
+            kept_tokens += sizes[index]
+
+        return _join_sentences([item for index, item in enumerate(sentences) if index in kept])
+
+    def compress_many(self, texts: List[str]) -> Tuple[List[str], CompressionReport]:
+        """
+        压缩多篇文章的正文
+
+        Args:
+            texts: 各篇文章的正文
+
+        Returns:
+            Tuple[List[str], CompressionReport]: 压缩后的正文和统计结果
+        """
+        report = CompressionReport()
+        report.articles = len(texts)
+        report.tokens_before = sum(estimate_tokens(text) for text in texts)
+
+        if not self.available:
+            if not self._warned:
+                self.logger.warning("未安装numpy，跳过抽取式压缩: pip install numpy")
+                self._warned = True
+            report.tokens_after = report.tokens_before
+            return list(texts), report
+
+        start = time.perf_counter()
+        compressed = []
+        for text in texts:
+            result = self.compress(text)
+            if result != text:
+                report.compressed += 1
+            compressed.append(result)
+        report.elapsed = time.perf_counter() - start
+        report.tokens_after = sum(estimate_tokens(text) for text in compressed)
+        return compressed, report
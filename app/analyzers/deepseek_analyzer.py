@@ -3,73 +3,195 @@
 DeepSeek分析器实现
 """
 
-from typing import List, Optional
+import hashlib
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
 
 import openai
 
 from ..analyzers.base_analyzer import BaseAnalyzer
+from ..analyzers.clustering import TopicCluster, TopicClusterer
+from ..analyzers.compression import CompressionReport, ExtractiveCompressor
+from ..analyzers.llm_scheduler import LLMScheduler, PRIORITY_BATCH, get_scheduler
+from ..analyzers.prompt_budget import BudgetReport, PromptBudgetPlanner
 from ..config.settings import (
     DEEPSEEK_API_KEY, 
     DEEPSEEK_BASE_URL, 
     DEEPSEEK_MODEL, 
     DEEPSEEK_MAX_TOKENS, 
     DEEPSEEK_TEMPERATURE, 
-    DEEPSEEK_SYSTEM_PROMPT
+    DEEPSEEK_TIMEOUT,
+    DEEPSEEK_SYSTEM_PROMPT,
+    COMPRESSION_ENABLED,
+    CLUSTERING_ENABLED,
+    CLUSTER_WORKERS,
+    LLM_SCHEDULER_ENABLED
 )
 from ..models.article import Article
+from ..utils.metrics import LLM_TOKENS, LLM_LATENCY, LLM_PROMPT_TRIMMED
+from ..utils.timing import timed
+from ..utils.tokens import estimate_tokens
+
+# 用户提示词前缀，后面接文章内容
+USER_PROMPT_PREFIX = "以下是多篇新闻文章，请对它们进行综合分析，生成一份详细的分析报告：\n\n"
+
+# 增量报告的用户提示词前缀，填入上一份报告的时间和摘要，后面接新文章内容
+DELTA_PROMPT_PREFIX = (
+    "以下是{since}之后新增的新闻文章。{since}生成的上一份分析报告摘要如下：\n\n"
+    "{summary}\n\n"
+    "请只分析这些新文章带来的新事件、新进展，以及需要修正或补充的判断，不要重复上一份报告已有的内容，"
+    "生成一份\"{since}以来的更新\"报告：\n\n"
+)
 
 
 class DeepSeekAnalyzer(BaseAnalyzer):
     """DeepSeek新闻分析器"""
     
-    def __init__(self):
-        """初始化DeepSeek分析器"""
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        base_url: Optional[str] = None,
+        model: Optional[str] = None,
+        stream: bool = False,
+        planner: Optional[PromptBudgetPlanner] = None,
+        compressor: Optional[ExtractiveCompressor] = None,
+        compress: bool = COMPRESSION_ENABLED,
+        clusterer: Optional[TopicClusterer] = None,
+        cluster: bool = CLUSTERING_ENABLED,
+        cluster_workers: int = CLUSTER_WORKERS,
+        scheduler: Optional[LLMScheduler] = None,
+        use_scheduler: bool = LLM_SCHEDULER_ENABLED,
+        priority: int = PRIORITY_BATCH
+    ):
+        """
+        初始化DeepSeek分析器
+        
+        Args:
+            api_key: API密钥，默认使用DEEPSEEK_API_KEY
+            base_url: 兼容OpenAI接口的服务地址，默认使用DEEPSEEK_BASE_URL
+            model: 模型名称，默认使用DEEPSEEK_MODEL
+            stream: 是否使用流式输出接收结果
+            planner: 提示词预算规划器，默认按DEEPSEEK_CONTEXT_WINDOW规划
+            compressor: 抽取式压缩器，默认按COMPRESSION_RATIO压缩
+            compress: 是否在调用模型前做抽取式压缩
+            clusterer: 主题聚类器，默认文章数达到CLUSTER_MIN_ARTICLES时聚类
+            cluster: 是否把较多的文章按主题拆分成多个请求
+            cluster_workers: 按主题拆分后并发调用的请求数
+            scheduler: 请求调度器，默认使用进程内共享的调度器
+            use_scheduler: 是否经调度器发出请求，关闭时由openai客户端自行重试
+            priority: 请求在调度器中的优先级，Web交互请求应使用PRIORITY_INTERACTIVE
+        """
         super().__init__(name="deepseek_analyzer")
-        self.client = None
+        self.model = model or DEEPSEEK_MODEL
+        self.stream = stream
+        self.planner = planner or PromptBudgetPlanner()
+        self.compressor = (compressor or ExtractiveCompressor()) if compress else None
+        self.clusterer = (clusterer or TopicClusterer()) if cluster else None
+        self.cluster_workers = max(cluster_workers, 1)
+        self.scheduler = (scheduler or get_scheduler()) if use_scheduler else None
+        self.priority = priority
+        # 最近一次prepare_content的压缩和预算统计
+        self.last_compression: Optional[CompressionReport] = None
+        self.last_budget: Optional[BudgetReport] = None
+        # 最近一次分析中实际发给模型且分析成功的文章(不含超出预算被丢弃的和所在主题分析失败的)
+        self.last_analyzed: List[Article] = []
         
-        if DEEPSEEK_API_KEY:
-            self.client = openai.OpenAI(
-                api_key=DEEPSEEK_API_KEY,
-                base_url=DEEPSEEK_BASE_URL
-            )
-        else:
+        self.client = self._create_client(api_key, base_url)
+        
+    def _create_client(self, api_key: Optional[str], base_url: Optional[str]) -> Optional[openai.OpenAI]:
+        """
+        创建openai客户端
+        
+        Args:
+            api_key: API密钥，默认使用DEEPSEEK_API_KEY
+            base_url: 服务地址，默认使用DEEPSEEK_BASE_URL
+            
+        Returns:
+            Optional[openai.OpenAI]: 客户端，没有API密钥时返回None
+        """
+        api_key = api_key or DEEPSEEK_API_KEY
+        if not api_key:
             self.logger.error("DEEPSEEK_API_KEY未设置，请设置环境变量")
+            return None
+            
+        options = {}
+        if self.scheduler is not None:
+            # 由调度器负责重试和退避
+            options["max_retries"] = 0
+        return openai.OpenAI(
+            api_key=api_key,
+            base_url=base_url or DEEPSEEK_BASE_URL,
+            timeout=DEEPSEEK_TIMEOUT,
+            **options
+        )
             
-    def prepare_content(self, articles: List[Article]) -> str:
+    def prepare_content(self, articles: List[Article], prompt_prefix: str = USER_PROMPT_PREFIX) -> str:
         """
         准备文章内容，用于输入到分析模型
         
+        开启压缩时先抽取每篇文章的关键句；正文总量仍超出提示词预算时，
+        最长的文章先被截断。统计保存在self.last_compression和self.last_budget中
+        
         Args:
             articles: 文章对象列表
+            prompt_prefix: 文章内容之前的用户提示词，计入提示词预算
             
         Returns:
             str: 准备好的内容
         """
-        contents = []
+        heads = []
+        tails = []
         
         for i, article in enumerate(articles, 1):
-            content = f"## 文章{i}: {article.title}\n\n"
+            head = f"## 文章{i}: {article.title}\n\n"
             
             if article.published_time:
-                content += f"发布时间: {article.published_time.strftime('%Y-%m-%d %H:%M')}\n"
+                head += f"发布时间: {article.published_time.strftime('%Y-%m-%d %H:%M')}\n"
                 
             if article.source:
-                content += f"来源: {article.source}"
+                head += f"来源: {article.source}"
                 if article.author:
-                    content += f" - {article.author}"
-                content += "\n"
+                    head += f" - {article.author}"
+                head += "\n"
                 
             if article.category:
-                content += f"分类: {article.category}\n"
+                head += f"分类: {article.category}\n"
                 
-            content += f"\n{article.content}\n\n"
-            content += f"原文链接: {article.url}\n\n"
-            content += "---\n\n"
-            
-            contents.append(content)
-            
-        return "".join(contents)
+            heads.append(head + "\n")
+            tails.append(f"\n\n原文链接: {article.url}\n\n---\n\n")
+        
+        bodies = [article.content for article in articles]
+        
+        # 抽取关键句
+        if self.compressor is not None:
+            with timed("compress"):
+                bodies, compression = self.compressor.compress_many(bodies)
+            self.last_compression = compression
+            self.logger.info(
+                "抽取式压缩: %s -> %s tokens (%.0f%%)，压缩 %s/%s 篇，耗时 %.1f ms",
+                compression.tokens_before, compression.tokens_after, compression.ratio * 100,
+                compression.compressed, compression.articles, compression.elapsed * 1000
+            )
+        
+        # 按预算截断正文
+        budget = self.planner.input_budget(DEEPSEEK_SYSTEM_PROMPT + prompt_prefix)
+        overheads = [estimate_tokens(head) + estimate_tokens(tail) for head, tail in zip(heads, tails)]
+        bodies, report = self.planner.fit(bodies, overheads, budget)
+        self.last_budget = report
+        
+        if report.trimmed_tokens > 0:
+            LLM_PROMPT_TRIMMED.inc(report.trimmed_tokens, model=self.model)
+            self.logger.info(
+                "提示词超出预算(%s tokens)，估算 %s -> %s tokens，截断 %s 篇，丢弃 %s 篇",
+                report.input_budget, report.tokens_before, report.tokens_after, report.truncated, report.dropped
+            )
+        
+        return "".join(head + body + tail for head, body, tail in zip(heads, bodies, tails))
         
+    @timed("analyze")
     def analyze(self, articles: List[Article]) -> Optional[str]:
         """
         使用DeepSeek API分析新闻文章
@@ -80,43 +202,292 @@ class DeepSeekAnalyzer(BaseAnalyzer):
         Returns:
             Optional[str]: 分析结果，失败则返回None
         """
+        self.last_analyzed = []
         if not articles:
             self.logger.warning("没有文章可以分析")
             return None
             
-        if not self.client:
+        if not self.ready:
             self.logger.error("DeepSeek客户端未初始化")
             return None
         
-        # 准备文章内容
-        article_text = self.prepare_content(articles)
+        if self.clusterer is not None and self.clusterer.should_cluster(articles):
+            with timed("cluster"):
+                clusters = self.clusterer.cluster(articles)
+            if len(clusters) > 1:
+                return self.analyze_clusters(clusters)
         
-        # 准备用户提示词
-        user_prompt = f"以下是多篇新闻文章，请对它们进行综合分析，生成一份详细的分析报告：\n\n{article_text}"
+        self.logger.info("调用DeepSeek API进行分析")
+        messages = self.build_messages(articles)
+        sent = self._sent_articles(articles)
+        analysis_content = self._complete_safely(messages)
+        if analysis_content:
+            self.last_analyzed = sent
+            self.logger.info("分析完成")
+        return analysis_content
         
-        # 调用DeepSeek API
-        try:
-            self.logger.info("调用DeepSeek API进行分析")
-            
-            response = self.client.chat.completions.create(
-                model=DEEPSEEK_MODEL,
-                messages=[
-                    {"role": "system", "content": DEEPSEEK_SYSTEM_PROMPT},
-                    {"role": "user", "content": user_prompt}
-                ],
-                max_tokens=DEEPSEEK_MAX_TOKENS,
-                temperature=DEEPSEEK_TEMPERATURE
-            )
+    def analyze_clusters(self, clusters: List[TopicCluster]) -> Optional[str]:
+        """
+        每个主题单独生成一个请求并发调用，再合并成一份报告
+        
+        Args:
+            clusters: 主题列表
             
-            analysis_content = response.choices[0].message.content
+        Returns:
+            Optional[str]: 合并后的分析结果，所有主题都失败时返回None
+        """
+        self.logger.info(
+            "%s 篇文章分为 %s 个主题: %s",
+            sum(len(cluster) for cluster in clusters), len(clusters),
+            "; ".join(f"{cluster.label}({len(cluster)}篇)" for cluster in clusters)
+        )
+        
+        # prepare_content会更新统计属性，在当前线程中依次准备
+        self.last_analyzed = []
+        prompts = []
+        sent = []
+        for cluster in clusters:
+            prompts.append(self.build_messages(cluster.articles))
+            sent.append(self._sent_articles(cluster.articles))
+        
+        self.logger.info("并发调用DeepSeek API分析 %s 个主题", len(clusters))
+        with ThreadPoolExecutor(
+            max_workers=min(self.cluster_workers, len(clusters)),
+            thread_name_prefix="analyze"
+        ) as executor:
+            results = list(executor.map(self._complete_safely, prompts))
+        
+        if not any(results):
+            return None
+        
+        self.last_analyzed = [article for articles, result in zip(sent, results) if result for article in articles]
+        self.logger.info("分析完成，%s/%s 个主题成功", sum(1 for result in results if result), len(clusters))
+        return merge_cluster_reports(clusters, results)
+        
+    @timed("analyze")
+    def analyze_delta(self, articles: List[Article], previous_summary: str, since: str) -> Optional[str]:
+        """
+        只分析上一份报告之后的新文章，上一份报告的摘要作为背景一起发给模型
+        
+        新文章通常不多，不做主题聚类，全部放入一个请求
+        
+        Args:
+            articles: 新文章列表
+            previous_summary: 上一份报告的摘要
+            since: 上一份报告的生成时间，如"14:30"
             
-            if not analysis_content:
-                self.logger.error("DeepSeek API返回空内容")
-                return None
-                
+        Returns:
+            Optional[str]: 更新报告，失败则返回None
+        """
+        self.last_analyzed = []
+        if not articles:
+            self.logger.warning("没有新文章可以分析")
+            return None
+            
+        if not self.ready:
+            self.logger.error("DeepSeek客户端未初始化")
+            return None
+        
+        self.logger.info("调用DeepSeek API分析 %s 以来的 %s 篇新文章", since, len(articles))
+        prompt_prefix = DELTA_PROMPT_PREFIX.format(since=since, summary=previous_summary or "(无)")
+        messages = self.build_messages(articles, prompt_prefix)
+        sent = self._sent_articles(articles)
+        analysis_content = self._complete_safely(messages)
+        if analysis_content:
+            self.last_analyzed = sent
             self.logger.info("分析完成")
-            return analysis_content
+        return analysis_content
+        
+    def _sent_articles(self, articles: List[Article]) -> List[Article]:
+        """按最近一次prepare_content的预算统计，取出实际放入提示词的文章(超出预算时丢弃的是排在最后的文章)"""
+        if self.last_budget is None or not self.last_budget.dropped:
+            return list(articles)
+        return list(articles[:len(articles) - self.last_budget.dropped])
+        
+    @property
+    def ready(self) -> bool:
+        """是否可以发出请求"""
+        return self.client is not None
+        
+    def request_identity(self) -> List[str]:
+        """标识请求目标(服务地址和模型)，与消息一起决定哪些请求可以合并"""
+        return [str(self.client.base_url), self.model]
+        
+    def build_messages(
+        self,
+        articles: List[Article],
+        prompt_prefix: str = USER_PROMPT_PREFIX
+    ) -> List[Dict[str, str]]:
+        """
+        生成一次分析请求的对话消息
+        
+        Args:
+            articles: 文章对象列表
+            prompt_prefix: 文章内容之前的用户提示词
             
+        Returns:
+            List[Dict[str, str]]: 对话消息列表
+        """
+        with timed("prepare_content") as timer:
+            article_text = self.prepare_content(articles, prompt_prefix)
+            timer.add_bytes(len(article_text.encode("utf-8")))
+        
+        return [
+            {"role": "system", "content": DEEPSEEK_SYSTEM_PROMPT},
+            {"role": "user", "content": prompt_prefix + article_text}
+        ]
+        
+    def _complete_safely(self, messages: List[Dict[str, str]]) -> Optional[str]:
+        """调用接口，出错或返回空内容时记录日志并返回None"""
+        try:
+            analysis_content = self.complete(messages)
         except Exception as e:
-            self.logger.error(f"调用DeepSeek API出错: {e}")
-            return None 
\ No newline at end of file
+            self.logger.error("调用DeepSeek API出错: %s", e)
+            return None
+            
+        if not analysis_content:
+            self.logger.error("DeepSeek API返回空内容")
+            return None
+        return analysis_content
+            
+    @timed("llm.complete")
+    def complete(self, messages: List[Dict[str, str]]) -> Optional[str]:
+        """
+        调用聊天补全接口，流式模式下拼接所有增量内容
+        
+        启用调度器时请求经调度器排队、限速和重试，相同的请求同时只发出一次
+        
+        Args:
+            messages: 对话消息列表
+            
+        Returns:
+            Optional[str]: 模型输出的文本
+        """
+        if self.scheduler is None:
+            return self._request(messages)
+        
+        # 按估算的输入加输出上限预留TPM，请求结束后按实际用量归还
+        reserved = sum(estimate_tokens(message["content"]) for message in messages) + DEEPSEEK_MAX_TOKENS
+        key = hashlib.sha256(
+            json.dumps(self.request_identity() + [messages], ensure_ascii=False).encode("utf-8")
+        ).hexdigest()
+        return self.scheduler.submit(
+            lambda: self._request(messages, reserved),
+            tokens=reserved,
+            priority=self.priority,
+            key=key
+        )
+        
+    def _request(self, messages: List[Dict[str, str]], reserved: int = 0) -> Optional[str]:
+        """
+        发出一次聊天补全请求
+        
+        Args:
+            messages: 对话消息列表
+            reserved: 在调度器中预留的token数，用于按实际用量归还
+            
+        Returns:
+            Optional[str]: 模型输出的文本
+        """
+        content, usage = self._chat(self.client, self.model, messages)
+        self._refund(usage, reserved)
+        return content
+        
+    def _chat(
+        self,
+        client: openai.OpenAI,
+        model: str,
+        messages: List[Dict[str, str]],
+        cancelled: Optional[threading.Event] = None,
+        stream: Optional[bool] = None
+    ) -> Tuple[Optional[str], Any]:
+        """
+        用指定的客户端和模型发出一次聊天补全请求，记录耗时和token用量
+        
+        Args:
+            client: openai客户端
+            model: 模型名称
+            messages: 对话消息列表
+            cancelled: 流式模式下每收到一块检查一次，被设置时关闭连接并返回None
+            stream: 是否使用流式输出，默认按self.stream；需要中途取消的请求应使用流式输出
+            
+        Returns:
+            Tuple[Optional[str], Any]: 模型输出的文本，以及接口返回的用量(没有时为None)
+        """
+        start = time.perf_counter()
+        outcome = "error"
+        stream = self.stream if stream is None else stream
+        try:
+            if not stream:
+                response = client.chat.completions.create(
+                    model=model,
+                    messages=messages,
+                    max_tokens=DEEPSEEK_MAX_TOKENS,
+                    temperature=DEEPSEEK_TEMPERATURE
+                )
+                self._record_usage(response.usage, model)
+                outcome = "ok"
+                return response.choices[0].message.content, response.usage
+                
+            response = client.chat.completions.create(
+                model=model,
+                messages=messages,
+                max_tokens=DEEPSEEK_MAX_TOKENS,
+                temperature=DEEPSEEK_TEMPERATURE,
+                stream=True,
+                stream_options={"include_usage": True}
+            )
+            
+            parts = []
+            usage = None
+            for chunk in response:
+                if cancelled is not None and cancelled.is_set():
+                    response.close()
+                    outcome = "cancelled"
+                    return None, None
+                if chunk.choices and chunk.choices[0].delta.content:
+                    parts.append(chunk.choices[0].delta.content)
+                if getattr(chunk, "usage", None):
+                    usage = chunk.usage
+                    self._record_usage(usage, model)
+            outcome = "ok"
+            return "".join(parts), usage
+        finally:
+            LLM_LATENCY.observe(time.perf_counter() - start, model=model, outcome=outcome)
+            
+    def _record_usage(self, usage, model: str):
+        """记录接口返回的token用量"""
+        if usage is None:
+            return
+        LLM_TOKENS.inc(usage.prompt_tokens or 0, model=model, direction="in")
+        LLM_TOKENS.inc(usage.completion_tokens or 0, model=model, direction="out")
+        
+    def _refund(self, usage, reserved: int):
+        """按实际用量把多预留的token还给调度器"""
+        if usage is not None and self.scheduler is not None and reserved:
+            self.scheduler.refund(reserved - (usage.prompt_tokens or 0) - (usage.completion_tokens or 0))
+
+
+def merge_cluster_reports(clusters: List[TopicCluster], results: List[Optional[str]]) -> str:
+    """
+    把各主题的分析结果合并成一份报告，各主题报告的标题整体降一级
+    
+    Args:
+        clusters: 主题列表
+        results: 与主题一一对应的分析结果，失败的为None
+        
+    Returns:
+        str: 合并后的报告
+    """
+    total = sum(len(cluster) for cluster in clusters)
+    sections = [f"本次共分析 {total} 篇文章，按主题分为 {len(clusters)} 组。"]
+    
+    for i, (cluster, result) in enumerate(zip(clusters, results), 1):
+        sections.append(f"# 主题{i}: {cluster.label}（{len(cluster)}篇）")
+        if result:
+            sections.append("\n".join("#" + line if line.startswith("#") else line for line in result.strip().splitlines()))
+        else:
+            titles = "\n".join(f"- {article.title}" for article in cluster.articles)
+            sections.append(f"该主题分析失败，包含的文章：\n\n{titles}")
+    
+    return "\n\n".join(sections) + "\n"
\ No newline at end of file
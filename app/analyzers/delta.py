@@ -0,0 +1,216 @@
+#!/usr/bin/env python
+"""
+增量报告模块
+
+每份保存的报告都在报告清单中记下它分析过的文章ID和一段摘要。开启增量模式时，
+只把上一份报告之后的新文章和上一份报告的摘要发给模型，生成"HH:MM以来的更新"报告，
+每次调用的token用量和耗时随新闻量而不是爬取数量增长。
+距上一份完整报告超过DELTA_MAX_AGE时重新生成完整报告，避免更新链无限延长
+"""
+
+import re
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, List, Optional
+
+from ..config.settings import DELTA_REPORTS, DELTA_SUMMARY_TOKENS, DELTA_MAX_AGE
+from ..models.article import Article
+from ..storage.report_manifest import ReportManifest, ReportRecord, get_report_manifest
+from ..utils.file import save_report
+from ..utils.logger import logger
+from ..utils.metrics import REPORT_ARTICLES
+from ..utils.tokens import estimate_tokens
+
+# 摘要中每行最多保留的字符数
+_SUMMARY_LINE_CHARS = 120
+
+# 一行中的第一句
+_FIRST_SENTENCE_RE = re.compile(r"^.*?[。！？!?]")
+
+
+class DeltaResult:
+    """一次报告生成的结果"""
+
+    def __init__(
+        self,
+        content: Optional[str],
+        path: Optional[Path],
+        delta: bool,
+        since: Optional[str] = None,
+        analyzed: int = 0,
+        skipped: int = 0
+    ):
+        """
+        初始化结果
+
+        Args:
+            content: 报告内容，没有新文章时为None
+            path: 报告保存路径，没有新文章时为None
+            delta: 是否是增量报告
+            since: 增量报告对应的上一份报告时间，如"14:30"
+            analyzed: 发给模型的文章数
+            skipped: 已被之前的报告覆盖而跳过的文章数
+        """
+        self.content = content
+        self.path = path
+        self.delta = delta
+        self.since = since
+        self.analyzed = analyzed
+        self.skipped = skipped
+
+    def to_dict(self) -> dict:
+        """将结果转换为字典(不含报告内容)"""
+        return {
+            "delta": self.delta,
+            "since": self.since,
+            "analyzed": self.analyzed,
+            "skipped": self.skipped
+        }
+
+
+def summarize_report(text: str, max_tokens: int = DELTA_SUMMARY_TOKENS) -> str:
+    """
+    抽取报告的标题和每段第一句作为摘要，不调用模型
+
+    Args:
+        text: 报告内容
+        max_tokens: 摘要的token上限，超出后丢弃后面的内容
+
+    Returns:
+        str: 摘要
+    """
+    lines = []
+    used = 0
+    for line in text.splitlines():
+        line = line.strip()
+        if not line or line == "---":
+            continue
+        if not line.startswith("#"):
+            match = _FIRST_SENTENCE_RE.match(line)
+            line = (match.group(0) if match else line)[:_SUMMARY_LINE_CHARS]
+        tokens = estimate_tokens(line)
+        if used + tokens > max_tokens:
+            break
+        lines.append(line)
+        used += tokens
+    return "\n".join(lines)
+
+
+def format_since(created_at: datetime, now: datetime) -> str:
+    """上一份报告的时间，同一天时只显示时分"""
+    if created_at.date() == now.date():
+        return created_at.strftime("%H:%M")
+    return created_at.strftime("%m-%d %H:%M")
+
+
+class DeltaReporter:
+    """生成报告并记入报告清单，开启增量模式时只分析新文章"""
+
+    def __init__(
+        self,
+        analyzer,
+        category: str,
+        delta: bool = DELTA_REPORTS,
+        manifest: Optional[ReportManifest] = None,
+        summary_tokens: int = DELTA_SUMMARY_TOKENS,
+        max_age: float = DELTA_MAX_AGE,
+        clock: Callable[[], datetime] = datetime.now
+    ):
+        """
+        初始化报告生成器
+
+        Args:
+            analyzer: 分析器实例，增量模式下需要支持analyze_delta
+            category: 分类
+            delta: 是否开启增量模式，关闭时总是生成完整报告(仍会记入清单)
+            manifest: 报告清单，默认使用进程内共享的REPORT_MANIFEST_PATH清单
+            summary_tokens: 保存的报告摘要的token上限
+            max_age: 距上一份完整报告超过该时长(秒)时重新生成完整报告
+            clock: 当前时间
+        """
+        self.analyzer = analyzer
+        self.category = category
+        self.delta = delta
+        self.manifest = manifest or get_report_manifest()
+        self.summary_tokens = summary_tokens
+        self.max_age = max_age
+        self.clock = clock
+        self.logger = logger
+
+    def run(self, articles: List[Article]) -> Optional[DeltaResult]:
+        """
+        分析文章并保存报告
+
+        Args:
+            articles: 本次爬取的文章
+
+        Returns:
+            Optional[DeltaResult]: 结果，分析失败时返回None；没有新文章时结果的path为None
+        """
+        now = self.clock()
+        chain = self.manifest.records(self.category) if self.delta else []
+        if chain and (now - chain[0].created_at).total_seconds() > self.max_age:
+            self.logger.info(
+                "分类 '%s' 距上一份完整报告已超过 %.0f 小时，重新生成完整报告",
+                self.category, self.max_age / 3600
+            )
+            chain = []
+
+        if not chain:
+            content = self.analyzer.analyze(articles)
+            if not content:
+                return None
+            analyzed = self._analyzed(articles)
+            REPORT_ARTICLES.inc(len(analyzed), mode="full", result="analyzed")
+            result = DeltaResult(content, None, delta=False, analyzed=len(analyzed))
+            return self._save(result, analyzed, content)
+
+        covered = {article_id for record in chain for article_id in record.article_ids}
+        new_articles = [article for article in articles if article.get_id() not in covered]
+        skipped = len(articles) - len(new_articles)
+        previous = chain[-1]
+        since = format_since(previous.created_at, now)
+        REPORT_ARTICLES.inc(skipped, mode="delta", result="skipped")
+        self.logger.info(
+            "分类 '%s' 共 %s 篇文章，%s 篇已在之前的报告中分析过，%s 篇为 %s 以来的新文章",
+            self.category, len(articles), skipped, len(new_articles), since
+        )
+        if not new_articles:
+            return DeltaResult(None, None, delta=True, since=since, skipped=skipped)
+
+        content = self.analyzer.analyze_delta(new_articles, previous.summary, since)
+        if not content:
+            return None
+        analyzed = self._analyzed(new_articles)
+        REPORT_ARTICLES.inc(len(analyzed), mode="delta", result="analyzed")
+        header = (
+            f"# {self.category}：{since}以来的更新\n\n"
+            f"本次分析 {len(analyzed)} 篇新文章，上一份报告：{previous.report}\n\n"
+        )
+        result = DeltaResult(
+            header + content, None, delta=True, since=since, analyzed=len(analyzed), skipped=skipped
+        )
+        # 摘要以本次更新为先，再接上一份报告的摘要，使后续更新能看到整条链的要点
+        return self._save(result, analyzed, content + "\n\n" + previous.summary)
+
+    def _analyzed(self, articles: List[Article]) -> List[Article]:
+        """
+        实际分析成功的文章，只有这些记入清单；超出预算被丢弃或所在主题分析失败的文章留给下一份报告
+
+        分析器没有提供last_analyzed时视为全部分析成功
+        """
+        analyzed = getattr(self.analyzer, "last_analyzed", None)
+        return articles if analyzed is None else analyzed
+
+    def _save(self, result: DeltaResult, articles: List[Article], summary_source: str) -> DeltaResult:
+        """保存报告并记入清单"""
+        result.path = save_report(result.content, self.category)
+        self.manifest.add(ReportRecord(
+            report=result.path.name,
+            category=self.category,
+            created_at=self.clock(),
+            article_ids=[article.get_id() for article in articles],
+            summary=summarize_report(summary_source, self.summary_tokens),
+            delta=result.delta
+        ))
+        return result
@@ -0,0 +1,392 @@
+#!/usr/bin/env python
+"""
+大模型请求调度模块
+
+进程内所有分析请求经同一个调度器发出：
+- 并发上限，以及每分钟请求数(RPM)和每分钟token数(TPM)两个令牌桶
+- 按优先级放行，Web交互请求先于批量任务，同一优先级先到先得
+- 429/5xx/连接错误按指数退避重试，服务端给出Retry-After时以其为准，
+  429的Retry-After对所有请求生效
+- 相同的请求在执行中时，后来者直接等待并共享同一个结果
+"""
+
+import heapq
+import itertools
+import random
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+import openai
+
+from ..config.settings import (
+    LLM_MAX_CONCURRENCY,
+    LLM_REQUESTS_PER_MINUTE,
+    LLM_TOKENS_PER_MINUTE,
+    LLM_MAX_RETRIES,
+    LLM_BACKOFF_BASE,
+    LLM_BACKOFF_MAX
+)
+from ..utils.logger import logger
+from ..utils.metrics import LLM_QUEUE_WAIT, LLM_RETRIES, LLM_COALESCED
+
+# 优先级，数值越小越先放行
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BATCH = 10
+
+# 按状态码判断可重试的错误
+_RETRYABLE_STATUS = {408, 409, 429}
+
+# 可取消的排队每隔多久检查一次是否已取消(秒)
+_CANCEL_POLL_INTERVAL = 0.1
+
+
+class TokenBucket:
+    """令牌桶，按每分钟的速率匀速补充"""
+
+    def __init__(self, per_minute: float, capacity: Optional[float] = None):
+        """
+        初始化令牌桶
+
+        Args:
+            per_minute: 每分钟补充的令牌数，不大于0时不限制
+            capacity: 桶容量(允许的突发量)，默认等于per_minute
+        """
+        self.rate = per_minute / 60.0
+        self.capacity = capacity if capacity is not None else per_minute
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+
+    @property
+    def unlimited(self) -> bool:
+        """是否不限制"""
+        return self.rate <= 0
+
+    def _refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount: float, now: float) -> float:
+        """
+        距离桶内令牌足够还需等待的秒数
+
+        Args:
+            amount: 需要的令牌数，超过容量时按容量计算
+            now: 当前时间(time.monotonic)
+
+        Returns:
+            float: 等待秒数，0表示可以立即取用
+        """
+        if self.unlimited:
+            return 0.0
+        self._refill(now)
+        amount = min(amount, self.capacity)
+        return 0.0 if self.tokens >= amount else (amount - self.tokens) / self.rate
+
+    def take(self, amount: float):
+        """取用令牌，调用前应确认wait_time为0"""
+        if not self.unlimited:
+            self.tokens -= min(amount, self.capacity)
+
+    def give(self, amount: float):
+        """归还多预留的令牌"""
+        if not self.unlimited:
+            self.tokens = min(self.capacity, self.tokens + amount)
+
+
+class _InFlight:
+    """执行中的请求，供相同请求共享结果"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+def retry_after_seconds(error: BaseException) -> Optional[float]:
+    """
+    读取错误响应中的Retry-After(秒)
+
+    Args:
+        error: 调用接口时抛出的异常
+
+    Returns:
+        Optional[float]: 等待秒数，没有时返回None
+    """
+    response = getattr(error, "response", None)
+    if response is None:
+        return None
+    headers = response.headers
+    value = headers.get("retry-after-ms")
+    if value is not None:
+        try:
+            return float(value) / 1000.0
+        except ValueError:
+            pass
+    value = headers.get("retry-after")
+    if value is None:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        return None
+
+
+def is_retryable(error: BaseException) -> bool:
+    """是否是值得重试的错误(限流、服务端错误、超时和连接错误)"""
+    if isinstance(error, (openai.APITimeoutError, openai.APIConnectionError)):
+        return True
+    if isinstance(error, openai.APIStatusError):
+        return error.status_code in _RETRYABLE_STATUS or error.status_code >= 500
+    return False
+
+
+class LLMScheduler:
+    """大模型请求调度器"""
+
+    def __init__(
+        self,
+        max_concurrency: int = LLM_MAX_CONCURRENCY,
+        requests_per_minute: float = LLM_REQUESTS_PER_MINUTE,
+        tokens_per_minute: float = LLM_TOKENS_PER_MINUTE,
+        max_retries: int = LLM_MAX_RETRIES,
+        backoff_base: float = LLM_BACKOFF_BASE,
+        backoff_max: float = LLM_BACKOFF_MAX,
+        sleep: Callable[[float], None] = time.sleep
+    ):
+        """
+        初始化调度器
+
+        Args:
+            max_concurrency: 同时进行的请求数上限
+            requests_per_minute: 每分钟请求数上限，不大于0时不限制
+            tokens_per_minute: 每分钟token数上限，不大于0时不限制
+            max_retries: 可重试错误的最大重试次数
+            backoff_base: 首次重试的退避时长(秒)，之后每次翻倍
+            backoff_max: 退避时长上限(秒)
+            sleep: 重试前的休眠函数，测试时可替换
+        """
+        self.max_concurrency = max(max_concurrency, 1)
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.logger = logger
+        self._sleep = sleep
+
+        self._condition = threading.Condition()
+        self._waiting = []
+        self._sequence = itertools.count()
+        self._running = 0
+        self._paused_until = 0.0
+        self._in_flight: Dict[Any, _InFlight] = {}
+
+    @property
+    def running(self) -> int:
+        """正在进行的请求数"""
+        return self._running
+
+    @property
+    def waiting(self) -> int:
+        """排队等待的请求数"""
+        return len(self._waiting)
+
+    def submit(
+        self,
+        call: Callable[[], Any],
+        tokens: int = 0,
+        priority: int = PRIORITY_BATCH,
+        key: Any = None
+    ) -> Any:
+        """
+        在调度器的限制下执行一次请求，阻塞直到得到结果
+
+        Args:
+            call: 发出请求的函数
+            tokens: 为本次请求预留的token数(计入TPM)
+            priority: 优先级，数值越小越先放行
+            key: 请求的唯一标识，相同key的请求同时只执行一次，为None时不合并
+
+        Returns:
+            Any: call的返回值
+
+        Raises:
+            Exception: 不可重试的错误，或重试次数用尽后的最后一个错误
+        """
+        if key is None:
+            return self._run(call, tokens, priority)
+
+        with self._condition:
+            shared = self._in_flight.get(key)
+            leader = shared is None
+            if leader:
+                shared = self._in_flight[key] = _InFlight()
+
+        if not leader:
+            LLM_COALESCED.inc()
+            self.logger.debug("相同的请求正在执行，等待共享结果")
+            shared.done.wait()
+            if shared.error is not None:
+                raise shared.error
+            return shared.result
+
+        try:
+            shared.result = self._run(call, tokens, priority)
+            return shared.result
+        except BaseException as e:
+            shared.error = e
+            raise
+        finally:
+            with self._condition:
+                self._in_flight.pop(key, None)
+            shared.done.set()
+
+    def refund(self, tokens: int):
+        """
+        归还多预留的token，请求结束后按实际用量调用
+
+        Args:
+            tokens: 预留量与实际用量的差
+        """
+        if tokens <= 0:
+            return
+        with self._condition:
+            self.tokens.give(tokens)
+            self._condition.notify_all()
+
+    def acquire(
+        self,
+        tokens: int = 0,
+        priority: int = PRIORITY_BATCH,
+        cancelled: Optional[threading.Event] = None
+    ) -> bool:
+        """
+        在submit之外排队占用一个并发名额并计入RPM/TPM，用于对冲等额外请求，用完后调用release()
+
+        Args:
+            tokens: 预留的token数(计入TPM)
+            priority: 优先级，数值越小越先放行
+            cancelled: 排队期间被设置时放弃排队
+
+        Returns:
+            bool: 是否占用了名额，排队期间被取消时为False
+        """
+        return self._acquire(tokens, priority, cancelled)
+
+    def release(self):
+        """释放acquire占用的并发名额"""
+        self._release()
+
+    def charge(self, tokens: int = 0):
+        """
+        不占用并发名额，只把一次请求计入RPM/TPM，用于复用已有名额发出的请求(如故障转移)；
+        令牌不足时不等待，由后续请求补足等待时间
+
+        Args:
+            tokens: 预留的token数(计入TPM)
+        """
+        with self._condition:
+            self.requests.take(1)
+            self.tokens.take(tokens)
+
+    def _run(self, call: Callable[[], Any], tokens: int, priority: int) -> Any:
+        """按限制放行并在可重试的错误上重试"""
+        attempt = 0
+        while True:
+            self._acquire(tokens, priority)
+            try:
+                return call()
+            except Exception as e:
+                # 失败的请求没有按预留用掉token，归还后再重试，避免每次重试都重复扣减
+                self.refund(tokens)
+                if not is_retryable(e) or attempt >= self.max_retries:
+                    raise
+                delay = self._backoff(e, attempt)
+                attempt += 1
+                LLM_RETRIES.inc(reason=type(e).__name__)
+                self.logger.warning("大模型请求出错: %s，%.1f 秒后第 %s 次重试", e, delay, attempt)
+            finally:
+                self._release()
+            self._sleep(delay)
+
+    def _backoff(self, error: BaseException, attempt: int) -> float:
+        """计算重试前的等待时长，429的Retry-After同时暂停其他请求"""
+        retry_after = retry_after_seconds(error)
+        if retry_after is not None:
+            if isinstance(error, openai.RateLimitError):
+                with self._condition:
+                    self._paused_until = max(self._paused_until, time.monotonic() + retry_after)
+            return retry_after
+        # 带抖动的指数退避，避免多个请求同时重试
+        delay = min(self.backoff_max, self.backoff_base * (2 ** attempt))
+        return delay * random.uniform(0.5, 1.0)
+
+    def _acquire(self, tokens: int, priority: int, cancelled: Optional[threading.Event] = None) -> bool:
+        """排队直到轮到本请求且并发数和令牌桶都允许，cancelled被设置时放弃并返回False"""
+        start = time.monotonic()
+        with self._condition:
+            entry = (priority, next(self._sequence))
+            heapq.heappush(self._waiting, entry)
+            try:
+                while True:
+                    if cancelled is not None and cancelled.is_set():
+                        self._leave(entry)
+                        return False
+                    timeout = None
+                    if self._waiting[0] == entry and self._running < self.max_concurrency:
+                        now = time.monotonic()
+                        timeout = max(
+                            self._paused_until - now,
+                            self.requests.wait_time(1, now),
+                            self.tokens.wait_time(tokens, now)
+                        )
+                        if timeout <= 0:
+                            break
+                    if cancelled is not None:
+                        # 取消不会唤醒条件变量，定期检查
+                        timeout = _CANCEL_POLL_INTERVAL if timeout is None else min(timeout, _CANCEL_POLL_INTERVAL)
+                    self._condition.wait(timeout)
+            except BaseException:
+                self._leave(entry)
+                raise
+
+            heapq.heappop(self._waiting)
+            self.requests.take(1)
+            self.tokens.take(tokens)
+            self._running += 1
+            # 唤醒下一个排队的请求
+            self._condition.notify_all()
+        LLM_QUEUE_WAIT.observe(time.monotonic() - start)
+        return True
+
+    def _leave(self, entry):
+        """把排队项移出等待队列，调用时须持有条件变量"""
+        self._waiting.remove(entry)
+        heapq.heapify(self._waiting)
+        self._condition.notify_all()
+
+    def _release(self):
+        """请求结束，释放并发名额"""
+        with self._condition:
+            self._running -= 1
+            self._condition.notify_all()
+
+
+_scheduler: Optional[LLMScheduler] = None
+_scheduler_lock = threading.Lock()
+
+
+def get_scheduler() -> LLMScheduler:
+    """
+    获取进程内共享的调度器，所有分析器共用同一组并发和速率限制
+
+    Returns:
+        LLMScheduler: 共享调度器
+    """
+    global _scheduler
+    if _scheduler is None:
+        with _scheduler_lock:
+            if _scheduler is None:
+                _scheduler = LLMScheduler()
+    return _scheduler
@@ -0,0 +1,443 @@
+#!/usr/bin/env python
+"""
+多后端分析器实现
+
+在多个兼容OpenAI接口的服务之间路由分析请求：
+- 按配置的权重随机选择后端，连续失败的后端暂时移出轮换，冷却后放行一个探测请求；
+  后端在进程内共享，各分析器共用延迟样本和健康状态，分析器本身只决定优先级等请求参数
+- 请求耗时超过该后端最近成功请求耗时的p95时，向另一个后端发出对冲请求，先完成的结果胜出，
+  另一个被取消：各后端的请求总是使用流式输出，落败的请求在收到下一块时关闭连接，服务端随即停止生成
+- 请求出错时立即改发给下一个后端，全部失败时抛出最后一个错误，由调度器决定是否重试
+- 额外的请求同样受调度器限制：对冲请求排队占用一个并发名额并计入RPM/TPM，
+  故障转移请求复用原请求的名额，只计入RPM/TPM
+"""
+
+import os
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Type, Union
+from urllib.parse import urlparse
+
+import openai
+
+from ..analyzers.base_analyzer import BaseAnalyzer
+from ..analyzers.deepseek_analyzer import DeepSeekAnalyzer
+from ..analyzers.llm_scheduler import is_retryable
+from ..config.settings import (
+    ANALYZER,
+    DEEPSEEK_TIMEOUT,
+    load_llm_backends,
+    LLM_BACKEND_FAILURE_THRESHOLD,
+    LLM_BACKEND_EJECT_SECONDS,
+    LLM_BACKEND_MAX_EJECT_SECONDS,
+    LLM_HEDGE_ENABLED,
+    LLM_HEDGE_PERCENTILE,
+    LLM_HEDGE_MIN_SAMPLES,
+    LLM_HEDGE_DEFAULT_DELAY,
+    LLM_HEDGE_MIN_DELAY,
+    LLM_HEDGE_MAX,
+    LLM_LATENCY_WINDOW
+)
+from ..utils.fetch_guard import CircuitBreaker
+from ..utils.logger import logger
+from ..utils.metrics import LLM_BACKEND_REQUESTS, LLM_EXTRA_REQUESTS
+from ..utils.timing import percentile
+
+# 说明后端本身有问题(而不是请求有问题)的错误，计入后端失败
+_BACKEND_ERRORS = (openai.AuthenticationError, openai.PermissionDeniedError, openai.NotFoundError)
+
+
+class NoBackendAvailable(RuntimeError):
+    """所有后端都已移出轮换"""
+
+
+def is_backend_error(error: BaseException) -> bool:
+    """是否是应计入后端失败并改发给其他后端的错误"""
+    return is_retryable(error) or isinstance(error, _BACKEND_ERRORS)
+
+
+class LLMBackend:
+    """一个兼容OpenAI接口的服务"""
+
+    def __init__(
+        self,
+        name: str,
+        base_url: str,
+        model: str,
+        api_key: str,
+        weight: float = 1.0,
+        timeout: float = DEEPSEEK_TIMEOUT,
+        latency_window: int = LLM_LATENCY_WINDOW,
+        failure_threshold: int = LLM_BACKEND_FAILURE_THRESHOLD,
+        eject_seconds: float = LLM_BACKEND_EJECT_SECONDS,
+        max_eject_seconds: float = LLM_BACKEND_MAX_EJECT_SECONDS
+    ):
+        """
+        初始化后端
+
+        Args:
+            name: 后端名称，用于日志和指标
+            base_url: 服务地址
+            model: 模型名称
+            api_key: API密钥
+            weight: 路由权重，为0时不参与轮换
+            timeout: 请求超时时间(秒)
+            latency_window: 计算延迟分位数使用的最近样本数
+            failure_threshold: 连续失败多少次后移出轮换
+            eject_seconds: 移出轮换的时长(秒)
+            max_eject_seconds: 探测失败时移出时长加倍的上限(秒)
+        """
+        self.name = name
+        self.base_url = base_url
+        self.model = model
+        self.weight = max(float(weight), 0.0)
+        # 重试由故障转移和调度器负责
+        self.client = openai.OpenAI(api_key=api_key, base_url=base_url, timeout=timeout, max_retries=0)
+        self.breaker = CircuitBreaker(
+            urlparse(base_url).netloc or name, failure_threshold, eject_seconds, max_eject_seconds
+        )
+        self._latencies = deque(maxlen=max(latency_window, 1))
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> Optional["LLMBackend"]:
+        """
+        按LLM_BACKENDS中的一项创建后端
+
+        Args:
+            config: 含name/base_url/model/weight，以及api_key或api_key_env
+
+        Returns:
+            Optional[LLMBackend]: 后端，没有API密钥时返回None
+        """
+        api_key = config.get("api_key") or os.getenv(config.get("api_key_env", ""), "")
+        if not api_key:
+            return None
+        return cls(
+            name=config.get("name") or config["base_url"],
+            base_url=config["base_url"],
+            model=config["model"],
+            api_key=api_key,
+            weight=config.get("weight", 1.0)
+        )
+
+    @property
+    def state(self) -> str:
+        """健康状态(closed正常/open已移出/half_open探测中)"""
+        return self.breaker.state
+
+    def record_success(self, latency: float):
+        """记录一次成功请求的耗时"""
+        with self._lock:
+            self._latencies.append(latency)
+        self.breaker.record_success()
+
+    def record_failure(self):
+        """记录一次失败，连续失败达到阈值时移出轮换"""
+        self.breaker.record_failure()
+
+    def latencies(self) -> List[float]:
+        """最近成功请求的耗时(秒)"""
+        with self._lock:
+            return list(self._latencies)
+
+
+def create_backends(backends: Sequence[Union[LLMBackend, Dict[str, Any]]]) -> List[LLMBackend]:
+    """
+    按后端配置创建后端，已经创建的后端原样保留
+
+    Args:
+        backends: 后端或后端配置列表
+
+    Returns:
+        List[LLMBackend]: 后端列表，没有API密钥的后端被跳过
+    """
+    created = []
+    for backend in backends:
+        if isinstance(backend, dict):
+            name = backend.get("name") or backend.get("base_url")
+            backend = LLMBackend.from_config(backend)
+            if backend is None:
+                logger.warning("大模型后端 %s 没有API密钥，已跳过", name)
+                continue
+        created.append(backend)
+    return created
+
+
+_backends: Optional[List[LLMBackend]] = None
+_backends_lock = threading.Lock()
+
+
+def get_backends() -> List[LLMBackend]:
+    """
+    获取进程内共享的后端，按环境变量或配置项LLM_BACKENDS创建；
+    各分析器(如每个Web请求新建的分析器)共用后端的延迟样本和健康状态
+
+    Returns:
+        List[LLMBackend]: 共享后端列表
+
+    Raises:
+        ValueError: 环境变量LLM_BACKENDS格式错误
+    """
+    global _backends
+    if _backends is None:
+        with _backends_lock:
+            if _backends is None:
+                _backends = create_backends(load_llm_backends())
+    return _backends
+
+
+class MultiBackendAnalyzer(DeepSeekAnalyzer):
+    """按权重和健康状况在多个后端之间路由、对冲和故障转移的分析器"""
+
+    def __init__(
+        self,
+        backends: Optional[Sequence[Union[LLMBackend, Dict[str, Any]]]] = None,
+        hedge: bool = LLM_HEDGE_ENABLED,
+        hedge_percentile: float = LLM_HEDGE_PERCENTILE,
+        hedge_min_samples: int = LLM_HEDGE_MIN_SAMPLES,
+        hedge_default_delay: float = LLM_HEDGE_DEFAULT_DELAY,
+        hedge_min_delay: float = LLM_HEDGE_MIN_DELAY,
+        max_hedges: int = LLM_HEDGE_MAX,
+        **kwargs
+    ):
+        """
+        初始化多后端分析器
+
+        Args:
+            backends: 后端或后端配置列表(没有API密钥的后端被跳过)，默认使用进程内共享的后端(见get_backends)
+            hedge: 是否发出对冲请求
+            hedge_percentile: 对冲的延迟阈值取后端最近成功请求耗时的该百分位(0-100)
+            hedge_min_samples: 后端样本少于该数时合并所有后端的样本，仍不足时使用hedge_default_delay
+            hedge_default_delay: 样本不足时的延迟阈值(秒)
+            hedge_min_delay: 延迟阈值下限(秒)
+            max_hedges: 每个请求最多额外发出的对冲请求数
+            **kwargs: 传给DeepSeekAnalyzer的其他参数(stream、scheduler、priority等)
+
+        Raises:
+            ValueError: 未传入backends且环境变量LLM_BACKENDS格式错误
+        """
+        super().__init__(**kwargs)
+        self.name = "multi_backend_analyzer"
+        self.hedge = hedge
+        self.hedge_percentile = hedge_percentile
+        self.hedge_min_samples = hedge_min_samples
+        self.hedge_default_delay = hedge_default_delay
+        self.hedge_min_delay = hedge_min_delay
+        self.max_hedges = max(max_hedges, 0)
+
+        self.backends = create_backends(backends) if backends is not None else list(get_backends())
+        if not self.backends:
+            self.logger.error("没有可用的大模型后端，请检查LLM_BACKENDS和对应的API密钥")
+
+    def _create_client(self, api_key: Optional[str], base_url: Optional[str]) -> Optional[openai.OpenAI]:
+        """各后端自带客户端，不创建默认客户端"""
+        return None
+
+    @property
+    def ready(self) -> bool:
+        """是否可以发出请求"""
+        return bool(self.backends)
+
+    def request_identity(self) -> List[str]:
+        """标识请求目标(各后端的名称和模型)"""
+        return [f"{backend.name}:{backend.model}" for backend in self.backends]
+
+    def backend_states(self) -> Dict[str, str]:
+        """各后端的健康状态"""
+        return {backend.name: backend.state for backend in self.backends}
+
+    def hedge_delay(self, backend: LLMBackend) -> float:
+        """
+        向该后端发出请求后，等待多久仍未完成时发出对冲请求
+
+        Args:
+            backend: 后端
+
+        Returns:
+            float: 等待秒数
+        """
+        samples = backend.latencies()
+        if len(samples) < self.hedge_min_samples:
+            # 该后端样本不足(如刚启动或刚恢复)时参考所有后端的样本
+            samples = [latency for other in self.backends for latency in other.latencies()]
+        if len(samples) < self.hedge_min_samples:
+            return max(self.hedge_default_delay, self.hedge_min_delay)
+        return max(percentile(sorted(samples), self.hedge_percentile), self.hedge_min_delay)
+
+    def _candidates(self) -> Iterator[LLMBackend]:
+        """按权重随机排列各后端，逐个取出仍在轮换中的后端"""
+        # 加权随机排列：每个后端取 u^(1/权重) 为键，从大到小排列
+        order = sorted(
+            (backend for backend in self.backends if backend.weight > 0),
+            key=lambda backend: random.random() ** (1.0 / backend.weight),
+            reverse=True
+        )
+        # 惰性检查，半开状态的后端只有真正被选中时才占用探测名额
+        return (backend for backend in order if backend.breaker.allow())
+
+    def _request(self, messages: List[Dict[str, str]], reserved: int = 0) -> Optional[str]:
+        """
+        发出一次分析请求，必要时对冲或改发给其他后端
+
+        Args:
+            messages: 对话消息列表
+            reserved: 在调度器中预留的token数，按胜出请求的实际用量归还
+
+        Returns:
+            Optional[str]: 模型输出的文本
+
+        Raises:
+            NoBackendAvailable: 所有后端都已移出轮换
+            Exception: 所有尝试过的后端都失败时的最后一个错误
+        """
+        candidates = self._candidates()
+        cancelled = threading.Event()
+        running: Dict[Future, LLMBackend] = {}
+        hedges = 0
+        hedge_at = None
+        last_error: Optional[BaseException] = None
+        primary: Optional[Future] = None
+        primary_failed = False
+
+        def launch(reason: Optional[str] = None) -> bool:
+            nonlocal hedge_at, primary
+            backend = next(candidates, None)
+            if backend is None:
+                return False
+            if reason is not None:
+                LLM_EXTRA_REQUESTS.inc(reason=reason)
+                self.logger.info("向大模型后端 %s 发出%s请求", backend.name, "对冲" if reason == "hedge" else "故障转移")
+            future = self._spawn(backend, messages, cancelled, reason, reserved)
+            running[future] = backend
+            if primary is None:
+                primary = future
+            hedge_at = time.monotonic() + self.hedge_delay(backend)
+            return True
+
+        if not launch():
+            raise NoBackendAvailable("所有大模型后端都已暂时移出轮换")
+
+        try:
+            while running:
+                timeout = None
+                if self.hedge and hedges < self.max_hedges:
+                    timeout = max(hedge_at - time.monotonic(), 0.0)
+                done, _ = wait(list(running), timeout=timeout, return_when=FIRST_COMPLETED)
+
+                if not done:
+                    # 超过延迟阈值仍未完成，没有其他后端可用时不再尝试对冲
+                    hedges = hedges + 1 if launch("hedge") else self.max_hedges
+                    continue
+
+                for future in done:
+                    backend = running.pop(future)
+                    try:
+                        content = future.result()
+                    except Exception as e:
+                        last_error = e
+                        primary_failed = primary_failed or future is primary
+                        self.logger.warning("大模型后端 %s 出错: %s", backend.name, e)
+                        if not is_backend_error(e) and not running:
+                            raise
+                        if not running:
+                            launch("failover")
+                        continue
+                    if primary_failed and self.scheduler is not None and reserved:
+                        # 原请求的预留由调度器在整个请求失败时归还，请求最终成功时在这里归还
+                        self.scheduler.refund(reserved)
+                    return content
+        finally:
+            # 取消仍在进行的请求
+            cancelled.set()
+
+        raise last_error
+
+    def _spawn(
+        self,
+        backend: LLMBackend,
+        messages: List[Dict[str, str]],
+        cancelled: threading.Event,
+        reason: Optional[str] = None,
+        reserved: int = 0
+    ) -> Future:
+        """
+        在后台线程中向后端发出请求，返回可等待的Future(结果为模型输出的文本)
+
+        Args:
+            backend: 后端
+            messages: 对话消息列表
+            cancelled: 被设置时放弃排队，或在收到下一块时关闭连接
+            reason: 额外请求的原因(hedge/failover)，原请求为None
+            reserved: 每个请求预留的token数，成功时按实际用量归还
+        """
+        future: Future = Future()
+        future.set_running_or_notify_cancel()
+
+        def run():
+            # 原请求已由调度器放行；对冲请求另占一个并发名额，故障转移请求复用原请求的名额
+            acquired = False
+            if reason is not None and self.scheduler is not None:
+                if reason == "hedge":
+                    if not self.scheduler.acquire(reserved, self.priority, cancelled):
+                        LLM_BACKEND_REQUESTS.inc(backend=backend.name, outcome="cancelled")
+                        future.set_result(None)
+                        return
+                    acquired = True
+                else:
+                    self.scheduler.charge(reserved)
+
+            start = time.perf_counter()
+            try:
+                # 总是使用流式输出，落败时能在收到下一块时关闭连接，而不是等到生成完毕
+                content, usage = self._chat(backend.client, backend.model, messages, cancelled, stream=True)
+            except Exception as e:
+                # 被取消后连接关闭引起的错误不算后端失败
+                if cancelled.is_set():
+                    LLM_BACKEND_REQUESTS.inc(backend=backend.name, outcome="cancelled")
+                else:
+                    LLM_BACKEND_REQUESTS.inc(backend=backend.name, outcome="error")
+                    if is_backend_error(e):
+                        backend.record_failure()
+                if reason is not None and self.scheduler is not None:
+                    self.scheduler.refund(reserved)
+                future.set_exception(e)
+                return
+            finally:
+                if acquired:
+                    self.scheduler.release()
+
+            if content is None and cancelled.is_set():
+                LLM_BACKEND_REQUESTS.inc(backend=backend.name, outcome="cancelled")
+            else:
+                LLM_BACKEND_REQUESTS.inc(backend=backend.name, outcome="ok")
+                backend.record_success(time.perf_counter() - start)
+                self._refund(usage, reserved)
+            future.set_result(content)
+
+        threading.Thread(target=run, name=f"llm-{backend.name}", daemon=True).start()
+        return future
+
+
+# 分析器名称到分析器类的映射
+ANALYZER_CLASSES: Dict[str, Type[BaseAnalyzer]] = {
+    "deepseek": DeepSeekAnalyzer,
+    "multi": MultiBackendAnalyzer
+}
+
+
+def create_analyzer(name: Optional[str] = None, **kwargs) -> DeepSeekAnalyzer:
+    """
+    按名称创建分析器
+
+    Args:
+        name: 分析器名称(deepseek/multi)，默认按配置项ANALYZER选择
+        **kwargs: 传给分析器的参数
+
+    Returns:
+        DeepSeekAnalyzer: 分析器
+    """
+    return ANALYZER_CLASSES[name or ANALYZER](**kwargs)
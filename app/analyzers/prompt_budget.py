@@ -0,0 +1,143 @@
+#!/usr/bin/env python
+"""
+提示词预算规划模块
+
+输入预算 = 上下文窗口 - 输出上限 - 固定提示词 - 安全余量。
+每篇文章的标题、来源等元信息完整保留，正文按注水法分配预算：
+短文章保留全文，剩余预算在长文章之间平分，因此总是最长的文章先被截断；
+预算连最低保留量都放不下时，丢弃排在最后的文章
+"""
+
+from typing import Dict, List, Tuple
+
+from ..config.settings import (
+    DEEPSEEK_CONTEXT_WINDOW,
+    DEEPSEEK_MAX_TOKENS,
+    PROMPT_SAFETY_MARGIN,
+    PROMPT_MIN_ARTICLE_TOKENS
+)
+from ..utils.tokens import estimate_tokens, truncate_to_tokens
+
+
+def water_fill(sizes: List[int], budget: int) -> List[int]:
+    """
+    按注水法分配预算
+
+    Args:
+        sizes: 各项的需求量
+        budget: 总预算
+
+    Returns:
+        List[int]: 各项分到的量，总和不超过budget
+    """
+    allocations = [0] * len(sizes)
+    remaining = max(budget, 0)
+    left = len(sizes)
+    for index in sorted(range(len(sizes)), key=lambda i: sizes[i]):
+        share = remaining // left
+        allocations[index] = min(sizes[index], share)
+        remaining -= allocations[index]
+        left -= 1
+    return allocations
+
+
+class BudgetReport:
+    """一次预算规划的结果统计"""
+
+    def __init__(self, input_budget: int):
+        self.input_budget = input_budget
+        self.tokens_before = 0
+        self.tokens_after = 0
+        self.truncated = 0
+        self.dropped = 0
+
+    @property
+    def trimmed_tokens(self) -> int:
+        """被截掉的token数"""
+        return self.tokens_before - self.tokens_after
+
+    def to_dict(self) -> Dict[str, int]:
+        """转换为字典"""
+        return {
+            "input_budget": self.input_budget,
+            "tokens_before": self.tokens_before,
+            "tokens_after": self.tokens_after,
+            "trimmed_tokens": self.trimmed_tokens,
+            "truncated_articles": self.truncated,
+            "dropped_articles": self.dropped
+        }
+
+
+class PromptBudgetPlanner:
+    """提示词预算规划器"""
+
+    def __init__(
+        self,
+        context_window: int = DEEPSEEK_CONTEXT_WINDOW,
+        max_output_tokens: int = DEEPSEEK_MAX_TOKENS,
+        safety_margin: int = PROMPT_SAFETY_MARGIN,
+        min_article_tokens: int = PROMPT_MIN_ARTICLE_TOKENS
+    ):
+        """
+        初始化规划器
+
+        Args:
+            context_window: 模型上下文窗口(tokens)
+            max_output_tokens: 为输出预留的token数
+            safety_margin: 为估算误差预留的token数
+            min_article_tokens: 每篇文章正文至少保留的token数
+        """
+        self.context_window = context_window
+        self.max_output_tokens = max_output_tokens
+        self.safety_margin = safety_margin
+        self.min_article_tokens = min_article_tokens
+
+    def input_budget(self, fixed_text: str) -> int:
+        """
+        计算可用于文章内容的token数
+
+        Args:
+            fixed_text: 系统提示词、用户提示词前缀等固定内容
+
+        Returns:
+            int: 文章内容的token预算
+        """
+        return max(
+            self.context_window - self.max_output_tokens - self.safety_margin - estimate_tokens(fixed_text),
+            0
+        )
+
+    def fit(self, bodies: List[str], overheads: List[int], budget: int) -> Tuple[List[str], BudgetReport]:
+        """
+        把各篇文章的正文压缩到预算以内
+
+        Args:
+            bodies: 各篇文章的正文
+            overheads: 各篇文章除正文以外(标题、元信息、分隔符)的token数
+            budget: 文章内容的token预算
+
+        Returns:
+            Tuple[List[str], BudgetReport]: 保留的正文(可能少于输入，丢弃的是排在最后的文章)和统计结果
+        """
+        report = BudgetReport(budget)
+        sizes = [estimate_tokens(body) for body in bodies]
+        report.tokens_before = sum(sizes) + sum(overheads)
+
+        # 连每篇的最低保留量都放不下时，从后往前丢弃文章
+        keep = len(bodies)
+        while keep > 0 and (
+            sum(overheads[:keep]) + sum(min(size, self.min_article_tokens) for size in sizes[:keep]) > budget
+        ):
+            keep -= 1
+        report.dropped = len(bodies) - keep
+
+        allocations = water_fill(sizes[:keep], budget - sum(overheads[:keep]))
+        fitted = []
+        for body, size, allocation in zip(bodies, sizes, allocations):
+            if allocation < size:
+                body = truncate_to_tokens(body, allocation)
+                report.truncated += 1
+            fitted.append(body)
+
+        report.tokens_after = sum(estimate_tokens(body) for body in fitted) + sum(overheads[:keep])
+        return fitted, report
@@ -11,7 +11,120 @@ from ..config.settings import (
     DEEPSEEK_BASE_URL,
     DEEPSEEK_MAX_TOKENS,
     DEEPSEEK_TEMPERATURE,
-    DEEPSEEK_SYSTEM_PROMPT
+    DEEPSEEK_SYSTEM_PROMPT,
+    SINA_ROLL_API_URL,
+    SINA_ROLL_PAGE_SIZE,
+    SINA_ROLL_MAX_PAGES,
+    SINA_ROLL_PAGE_DELAY,
+    SINA_ROLL_FEEDS,
+    FRONTIER_FRESHNESS_HALF_LIFE,
+    FRONTIER_UNKNOWN_FRESHNESS,
+    FRONTIER_SEEN_PENALTY,
+    FRONTIER_OVERSAMPLE,
+    FRONTIER_MIN_CANDIDATES,
+    FRONTIER_SECTION_WEIGHTS,
+    PARSE_WORKERS,
+    PARSE_CHUNK_SIZE,
+    REQUEST_DELAY_SCALE,
+    DEEPSEEK_TIMEOUT,
+    STAGE_TIMING_ENABLED,
+    STAGE_TIMING_MAX_SAMPLES,
+    LOG_DIR,
+    LOG_ASYNC,
+    LOG_JSON,
+    LOG_MAX_BYTES,
+    LOG_BACKUP_COUNT,
+    LOG_ROTATE_WHEN,
+    SCHEDULER_INTERVAL,
+    SCHEDULER_INTERVALS,
+    SCHEDULER_JITTER,
+    SCHEDULER_CRAWL_LIMIT,
+    SCHEDULER_MIN_NEW_ARTICLES,
+    SCHEDULER_MAX_PENDING_AGE,
+    SCHEDULER_MAX_ANALYZE_ARTICLES,
+    WORK_QUEUE_PATH,
+    WORK_QUEUE_LEASE_SECONDS,
+    WORK_QUEUE_MAX_ATTEMPTS,
+    WORK_QUEUE_BATCH_SIZE,
+    WORK_QUEUE_POLL_INTERVAL,
+    DEEPSEEK_CONTEXT_WINDOW,
+    TOKENS_PER_CJK_CHAR,
+    TOKENS_PER_OTHER_CHAR,
+    PROMPT_SAFETY_MARGIN,
+    PROMPT_MIN_ARTICLE_TOKENS,
+    COMPRESSION_ENABLED,
+    COMPRESSION_RATIO,
+    COMPRESSION_MIN_TOKENS,
+    COMPRESSION_MIN_SENTENCES,
+    COMPRESSION_LEAD_BONUS,
+    COMPRESSION_BOILERPLATE_PATTERNS,
+    CLUSTERING_ENABLED,
+    CLUSTER_MIN_ARTICLES,
+    CLUSTER_TARGET_SIZE,
+    CLUSTER_MAX_CLUSTERS,
+    CLUSTER_MIN_SIZE,
+    CLUSTER_NGRAM_RANGE,
+    CLUSTER_MAX_FEATURES,
+    CLUSTER_TEXT_CHARS,
+    CLUSTER_WORKERS,
+    LLM_SCHEDULER_ENABLED,
+    LLM_MAX_CONCURRENCY,
+    LLM_REQUESTS_PER_MINUTE,
+    LLM_TOKENS_PER_MINUTE,
+    LLM_MAX_RETRIES,
+    LLM_BACKOFF_BASE,
+    LLM_BACKOFF_MAX,
+    STREAM_PREFETCH,
+    CHARSET_SCAN_BYTES,
+    CHARSET_HOST_CACHE_SIZE,
+    DOWNLOAD_URL_CLASSES,
+    DOWNLOAD_MAX_BYTES,
+    DOWNLOAD_ALLOWED_TYPES,
+    DOWNLOAD_STOP_MARKERS,
+    DOWNLOAD_CHUNK_SIZE,
+    EXTRACTOR_TEMPLATES_ENABLED,
+    EXTRACTOR_TEMPLATE_PATH,
+    EXTRACTOR_TEMPLATE_MAX_KEYS,
+    EXTRACTOR_TEMPLATE_SAVE_INTERVAL,
+    EXTRACTOR,
+    ARTICLE_STORE_PATH,
+    ARTICLE_STORE_BATCH_SIZE,
+    REEXTRACT_WORKERS,
+    REEXTRACT_CHUNK_SIZE,
+    REEXTRACT_MAX_PENDING,
+    REEXTRACT_PROGRESS_INTERVAL,
+    NEGATIVE_CACHE_ENABLED,
+    NEGATIVE_CACHE_PATH,
+    NEGATIVE_CACHE_TTL,
+    NEGATIVE_CACHE_MAX_ENTRIES,
+    NEGATIVE_CACHE_SAVE_INTERVAL,
+    CIRCUIT_BREAKER_ENABLED,
+    CIRCUIT_FAILURE_THRESHOLD,
+    CIRCUIT_RESET_TIMEOUT,
+    CIRCUIT_MAX_RESET_TIMEOUT,
+    REQUEST_CONNECT_TIMEOUT,
+    REQUEST_READ_TIMEOUT,
+    SCRAPE_DEADLINE,
+    SCRAPE_MAX_DEADLINE,
+    ANALYZER,
+    LLM_BACKENDS,
+    LLM_BACKEND_FAILURE_THRESHOLD,
+    LLM_BACKEND_EJECT_SECONDS,
+    LLM_BACKEND_MAX_EJECT_SECONDS,
+    LLM_HEDGE_ENABLED,
+    LLM_HEDGE_PERCENTILE,
+    LLM_HEDGE_MIN_SAMPLES,
+    LLM_HEDGE_DEFAULT_DELAY,
+    LLM_HEDGE_MIN_DELAY,
+    LLM_HEDGE_MAX,
+    LLM_LATENCY_WINDOW,
+    DELTA_REPORTS,
+    REPORT_MANIFEST_PATH,
+    DELTA_SUMMARY_TOKENS,
+    DELTA_MAX_AGE,
+    SEEN_URLS_MAX,
+    SINA_ARTICLE_PATHS,
+    load_llm_backends
 )
 
 __all__ = [
@@ -27,5 +140,118 @@ __all__ = [
     'DEEPSEEK_BASE_URL',
     'DEEPSEEK_MAX_TOKENS',
     'DEEPSEEK_TEMPERATURE',
-    'DEEPSEEK_SYSTEM_PROMPT'
+    'DEEPSEEK_SYSTEM_PROMPT',
+    'SINA_ROLL_API_URL',
+    'SINA_ROLL_PAGE_SIZE',
+    'SINA_ROLL_MAX_PAGES',
+    'SINA_ROLL_PAGE_DELAY',
+    'SINA_ROLL_FEEDS',
+    'FRONTIER_FRESHNESS_HALF_LIFE',
+    'FRONTIER_UNKNOWN_FRESHNESS',
+    'FRONTIER_SEEN_PENALTY',
+    'FRONTIER_OVERSAMPLE',
+    'FRONTIER_MIN_CANDIDATES',
+    'FRONTIER_SECTION_WEIGHTS',
+    'PARSE_WORKERS',
+    'PARSE_CHUNK_SIZE',
+    'REQUEST_DELAY_SCALE',
+    'DEEPSEEK_TIMEOUT',
+    'STAGE_TIMING_ENABLED',
+    'STAGE_TIMING_MAX_SAMPLES',
+    'LOG_DIR',
+    'LOG_ASYNC',
+    'LOG_JSON',
+    'LOG_MAX_BYTES',
+    'LOG_BACKUP_COUNT',
+    'LOG_ROTATE_WHEN',
+    'SCHEDULER_INTERVAL',
+    'SCHEDULER_INTERVALS',
+    'SCHEDULER_JITTER',
+    'SCHEDULER_CRAWL_LIMIT',
+    'SCHEDULER_MIN_NEW_ARTICLES',
+    'SCHEDULER_MAX_PENDING_AGE',
+    'SCHEDULER_MAX_ANALYZE_ARTICLES',
+    'WORK_QUEUE_PATH',
+    'WORK_QUEUE_LEASE_SECONDS',
+    'WORK_QUEUE_MAX_ATTEMPTS',
+    'WORK_QUEUE_BATCH_SIZE',
+    'WORK_QUEUE_POLL_INTERVAL',
+    'DEEPSEEK_CONTEXT_WINDOW',
+    'TOKENS_PER_CJK_CHAR',
+    'TOKENS_PER_OTHER_CHAR',
+    'PROMPT_SAFETY_MARGIN',
+    'PROMPT_MIN_ARTICLE_TOKENS',
+    'COMPRESSION_ENABLED',
+    'COMPRESSION_RATIO',
+    'COMPRESSION_MIN_TOKENS',
+    'COMPRESSION_MIN_SENTENCES',
+    'COMPRESSION_LEAD_BONUS',
+    'COMPRESSION_BOILERPLATE_PATTERNS',
+    'CLUSTERING_ENABLED',
+    'CLUSTER_MIN_ARTICLES',
+    'CLUSTER_TARGET_SIZE',
+    'CLUSTER_MAX_CLUSTERS',
+    'CLUSTER_MIN_SIZE',
+    'CLUSTER_NGRAM_RANGE',
+    'CLUSTER_MAX_FEATURES',
+    'CLUSTER_TEXT_CHARS',
+    'CLUSTER_WORKERS',
+    'LLM_SCHEDULER_ENABLED',
+    'LLM_MAX_CONCURRENCY',
+    'LLM_REQUESTS_PER_MINUTE',
+    'LLM_TOKENS_PER_MINUTE',
+    'LLM_MAX_RETRIES',
+    'LLM_BACKOFF_BASE',
+    'LLM_BACKOFF_MAX',
+    'STREAM_PREFETCH',
+    'CHARSET_SCAN_BYTES',
+    'CHARSET_HOST_CACHE_SIZE',
+    'DOWNLOAD_URL_CLASSES',
+    'DOWNLOAD_MAX_BYTES',
+    'DOWNLOAD_ALLOWED_TYPES',
+    'DOWNLOAD_STOP_MARKERS',
+    'DOWNLOAD_CHUNK_SIZE',
+    'EXTRACTOR_TEMPLATES_ENABLED',
+    'EXTRACTOR_TEMPLATE_PATH',
+    'EXTRACTOR_TEMPLATE_MAX_KEYS',
+    'EXTRACTOR_TEMPLATE_SAVE_INTERVAL',
+    'EXTRACTOR',
+    'ARTICLE_STORE_PATH',
+    'ARTICLE_STORE_BATCH_SIZE',
+    'REEXTRACT_WORKERS',
+    'REEXTRACT_CHUNK_SIZE',
+    'REEXTRACT_MAX_PENDING',
+    'REEXTRACT_PROGRESS_INTERVAL',
+    'NEGATIVE_CACHE_ENABLED',
+    'NEGATIVE_CACHE_PATH',
+    'NEGATIVE_CACHE_TTL',
+    'NEGATIVE_CACHE_MAX_ENTRIES',
+    'NEGATIVE_CACHE_SAVE_INTERVAL',
+    'CIRCUIT_BREAKER_ENABLED',
+    'CIRCUIT_FAILURE_THRESHOLD',
+    'CIRCUIT_RESET_TIMEOUT',
+    'CIRCUIT_MAX_RESET_TIMEOUT',
+    'REQUEST_CONNECT_TIMEOUT',
+    'REQUEST_READ_TIMEOUT',
+    'SCRAPE_DEADLINE',
+    'SCRAPE_MAX_DEADLINE',
+    'ANALYZER',
+    'LLM_BACKENDS',
+    'LLM_BACKEND_FAILURE_THRESHOLD',
+    'LLM_BACKEND_EJECT_SECONDS',
+    'LLM_BACKEND_MAX_EJECT_SECONDS',
+    'LLM_HEDGE_ENABLED',
+    'LLM_HEDGE_PERCENTILE',
+    'LLM_HEDGE_MIN_SAMPLES',
+    'LLM_HEDGE_DEFAULT_DELAY',
+    'LLM_HEDGE_MIN_DELAY',
+    'LLM_HEDGE_MAX',
+    'LLM_LATENCY_WINDOW',
+    'DELTA_REPORTS',
+    'REPORT_MANIFEST_PATH',
+    'DELTA_SUMMARY_TOKENS',
+    'DELTA_MAX_AGE',
+    'SEEN_URLS_MAX',
+    'SINA_ARTICLE_PATHS',
+    'load_llm_backends'
 ] 
\ No newline at end of file
@@ -3,6 +3,7 @@
 全局配置设置模块
 """
 
+import json
 import os
 from pathlib import Path
 from typing import Dict, List
@@ -12,14 +13,94 @@ DEEPSEEK_API_KEY = os.getenv("DEEPSEEK_API_KEY", "your api here")
 
 # 输出目录配置
 BASE_DIR = Path(__file__).parent.parent.parent
-OUTPUT_DIR = BASE_DIR / "news_reports"
-OUTPUT_DIR.mkdir(exist_ok=True, parents=True)
+OUTPUT_DIR = BASE_DIR / "news_reports"  # 首次保存报告时创建
 
 # 请求配置
-REQUEST_TIMEOUT = 30  # 请求超时时间(秒)
+REQUEST_CONNECT_TIMEOUT = 5  # 建立连接的超时时间(秒)
+REQUEST_READ_TIMEOUT = 30  # 读取响应的超时时间(秒，两次收到数据之间的最长间隔)
+REQUEST_TIMEOUT = (REQUEST_CONNECT_TIMEOUT, REQUEST_READ_TIMEOUT)  # 请求超时时间(连接, 读取)
 MAX_RETRIES = 3  # 最大重试次数
 REQUEST_DELAY = (2, 5)  # 请求延迟时间范围(秒)
 RETRY_DELAY = (5, 10)  # 重试延迟时间范围(秒)
+REQUEST_DELAY_SCALE = float(os.getenv("REQUEST_DELAY_SCALE", "1"))  # 延迟缩放系数，离线回放时设为0
+CHARSET_SCAN_BYTES = 4096  # 查找<meta charset>时扫描的页面开头字节数
+CHARSET_HOST_CACHE_SIZE = 1024  # 按域名记住编码的最多域名数
+
+# 下载限制配置(按URL类别，依次匹配正则，都不匹配时为default)
+DOWNLOAD_URL_CLASSES = [
+    ("api", r"^https?://feed\.mix\.sina\.com\.cn/api/"),
+    ("article", r"(/doc-i|/article_|/n_|/\d{4}-\d{2}-\d{2}/)")
+]
+DOWNLOAD_MAX_BYTES = {  # 各类别响应正文(解压后)的最大字节数，超过时放弃该页面
+    "api": 1 * 1024 * 1024,
+    "article": 3 * 1024 * 1024,
+    "default": 5 * 1024 * 1024
+}
+DOWNLOAD_ALLOWED_TYPES = [  # 允许下载的Content-Type，其他类型在读取正文前放弃；响应头缺失时放行
+    "text/html",
+    "application/xhtml+xml",
+    "application/json",
+    "text/json",
+    "application/javascript",
+    "text/javascript",
+    "application/x-javascript",
+    "text/plain"
+]
+DOWNLOAD_STOP_MARKERS = {}  # 各类别正文的结束标记(字节串)，读到后停止下载，如 {"article": b"<!-- publish_helper_end -->"}
+DOWNLOAD_CHUNK_SIZE = 64 * 1024  # 每次读取的字节数
+STREAM_PREFETCH = 4  # 流式爬取时后台最多提前爬好的文章数，消费者处理慢时爬取随之暂停
+
+# 交互式爬取截止时间配置(Web接口，时间用完时返回已爬好的文章)
+SCRAPE_DEADLINE = float(os.getenv("SCRAPE_DEADLINE", "30"))  # 默认截止时间(秒)，请求参数deadline可覆盖
+SCRAPE_MAX_DEADLINE = 300  # 请求参数deadline的上限(秒)
+
+# 失效URL负缓存配置(返回404/410的URL在有效期内不再请求)
+NEGATIVE_CACHE_ENABLED = os.getenv("NEGATIVE_CACHE", "1") == "1"  # 是否开启
+NEGATIVE_CACHE_PATH = Path(os.getenv("NEGATIVE_CACHE_PATH", "./negative_cache.json"))  # 缓存文件，多次运行之间保留
+NEGATIVE_CACHE_TTL = int(os.getenv("NEGATIVE_CACHE_TTL", str(7 * 24 * 3600)))  # 条目有效期(秒)
+NEGATIVE_CACHE_MAX_ENTRIES = 50000  # 最多保存的URL数
+NEGATIVE_CACHE_SAVE_INTERVAL = 50  # 每新增多少个条目写回一次文件，进程退出时也会写回
+
+# 域名熔断配置(连续失败的域名暂停请求，冷却后放行一个探测请求)
+CIRCUIT_BREAKER_ENABLED = os.getenv("CIRCUIT_BREAKER", "1") == "1"  # 是否开启
+CIRCUIT_FAILURE_THRESHOLD = 5  # 连续失败(403/429/5xx/连接错误)多少次后熔断
+CIRCUIT_RESET_TIMEOUT = 60  # 熔断后的冷却时间(秒)
+CIRCUIT_MAX_RESET_TIMEOUT = 600  # 探测失败时冷却时间加倍的上限(秒)
+
+# 提取器配置
+EXTRACTOR = os.getenv("EXTRACTOR", "sina")  # 使用的提取器: sina(按新浪页面的选择器) 或 density(按文本密度，不依赖选择器)
+
+# 提取模板缓存配置(按域名和路径模式记住成功的选择器，下次先试)
+EXTRACTOR_TEMPLATES_ENABLED = os.getenv("EXTRACTOR_TEMPLATES", "1") == "1"  # 是否开启
+EXTRACTOR_TEMPLATE_PATH = Path(os.getenv("EXTRACTOR_TEMPLATE_PATH", "./extractor_templates.json"))  # 统计文件，多次运行之间保留
+EXTRACTOR_TEMPLATE_MAX_KEYS = 2048  # 最多记住的模板(域名+路径模式)数
+EXTRACTOR_TEMPLATE_SAVE_INTERVAL = 200  # 每提取多少个字段写回一次文件，进程退出时也会写回
+
+# 解析进程池配置
+PARSE_WORKERS = 0  # 解析进程数，0表示在当前进程内解析
+PARSE_CHUNK_SIZE = 4  # 每次提交给解析进程的页面数
+
+# 文章存储配置
+ARTICLE_STORE_PATH = Path(os.getenv("ARTICLE_STORE_PATH", "./articles.db"))  # SQLite文章库文件
+ARTICLE_STORE_BATCH_SIZE = 500  # 攒满多少篇文章提交一次事务
+
+# 离线批量重新提取配置
+REEXTRACT_WORKERS = max((os.cpu_count() or 2) - 1, 1)  # 提取进程数
+REEXTRACT_CHUNK_SIZE = 16  # 每次提交给提取进程的页面数
+REEXTRACT_MAX_PENDING = 4  # 每个提取进程最多排队的块数，限制内存占用
+REEXTRACT_PROGRESS_INTERVAL = 10.0  # 输出进度日志的间隔(秒)
+
+# 分阶段计时配置
+STAGE_TIMING_ENABLED = os.getenv("STAGE_TIMING", "0") == "1"  # 是否开启分阶段计时
+STAGE_TIMING_MAX_SAMPLES = 10000  # 每个阶段保留的最大样本数
+
+# 日志配置
+LOG_DIR = Path(os.getenv("LOG_DIR", "./logs"))  # 日志目录
+LOG_ASYNC = os.getenv("LOG_ASYNC", "1") == "1"  # 是否由后台线程写日志
+LOG_JSON = os.getenv("LOG_JSON", "0") == "1"  # 是否输出JSON行格式的日志文件
+LOG_MAX_BYTES = 10 * 1024 * 1024  # 单个日志文件的最大字节数，超过后轮转
+LOG_BACKUP_COUNT = 5  # 保留的历史日志文件数
+LOG_ROTATE_WHEN = os.getenv("LOG_ROTATE_WHEN", "")  # 按时间轮转(如 midnight)，为空时按大小轮转
 
 # User-Agent列表
 USER_AGENTS = [
@@ -42,11 +123,139 @@ SINA_CATEGORIES: Dict[str, str] = {
     "健康": "https://health.sina.com.cn/"
 }
 
+# 文章URL前缀到分类的映射，用于分类页路径与文章路径不一致的频道(如国内新闻在/china/，文章在/c/)
+SINA_ARTICLE_PATHS: Dict[str, str] = {
+    "https://news.sina.com.cn/c/": "国内",
+    "https://news.sina.com.cn/w/": "国际"
+}
+
+# 新浪滚动新闻JSON接口配置
+SINA_ROLL_API_URL = "https://feed.mix.sina.com.cn/api/roll/get"
+SINA_ROLL_PAGE_SIZE = 50  # 每页条数(接口上限为50)
+SINA_ROLL_MAX_PAGES = 10  # 最多翻页数
+SINA_ROLL_PAGE_DELAY = (0.5, 1.5)  # 翻页请求延迟时间范围(秒)
+
+# 分类URL到滚动接口参数的映射，未配置的分类回退到HTML页面解析
+SINA_ROLL_FEEDS: Dict[str, Dict[str, int]] = {
+    "https://news.sina.com.cn/world/": {"pageid": 153, "lid": 2511},
+    "https://news.sina.com.cn/china/": {"pageid": 153, "lid": 2510},
+    "https://tech.sina.com.cn/": {"pageid": 153, "lid": 2515},
+    "https://finance.sina.com.cn/": {"pageid": 153, "lid": 2516},
+    "https://sports.sina.com.cn/": {"pageid": 153, "lid": 2512},
+    "https://ent.sina.com.cn/": {"pageid": 153, "lid": 2513}
+}
+
+# URL优先级队列配置
+FRONTIER_FRESHNESS_HALF_LIFE = 1.0  # 新鲜度半衰期(天)
+FRONTIER_UNKNOWN_FRESHNESS = 0.3  # URL中没有日期时的新鲜度
+FRONTIER_SEEN_PENALTY = 2.0  # 已爬取过的URL的降权分数
+FRONTIER_OVERSAMPLE = 3  # 候选URL数量为limit的倍数
+FRONTIER_MIN_CANDIDATES = 50  # 最少候选URL数量
+SEEN_URLS_MAX = 50000  # 爬虫记住的已尝试/已成功爬取的URL数，超出时淘汰最早的
+
+# URL片段到栏目权重的映射，可叠加
+FRONTIER_SECTION_WEIGHTS: Dict[str, float] = {
+    "/doc-i": 0.2,  # 标准文章页
+    "/zt_": -0.5,  # 专题页
+    "video.sina": -1.0,  # 视频页
+    "slide.": -1.0  # 图集页
+}
+
+# 定时调度(守护进程模式)配置
+SCHEDULER_INTERVAL = 60 * 60  # 默认爬取间隔(秒)
+SCHEDULER_INTERVALS: Dict[str, int] = {}  # 各分类的爬取间隔(秒)，如 {"财经": 30 * 60}，未配置的使用默认间隔
+SCHEDULER_JITTER = 0.1  # 间隔的随机抖动比例，避免多个分类同时请求
+SCHEDULER_CRAWL_LIMIT = 20  # 每次爬取时考察的文章数量
+SCHEDULER_MIN_NEW_ARTICLES = 5  # 累计多少篇新文章才触发分析
+SCHEDULER_MAX_PENDING_AGE = 6 * 60 * 60  # 新文章最长等待时间(秒)，超过后即使数量不足也触发分析
+SCHEDULER_MAX_ANALYZE_ARTICLES = 20  # 每份报告最多分析的文章数，只保留最新的
+
+# 增量报告配置
+DELTA_REPORTS = os.getenv("DELTA_REPORTS", "0") == "1"  # 是否只分析上一份报告之后的新文章，生成"HH:MM以来的更新"报告
+REPORT_MANIFEST_PATH = Path(os.getenv("REPORT_MANIFEST_PATH", str(OUTPUT_DIR / "report_manifest.json")))  # 记录每份报告覆盖的文章ID和摘要
+DELTA_SUMMARY_TOKENS = 1500  # 随新文章一起发给模型的上一份报告摘要的token上限
+DELTA_MAX_AGE = 24 * 60 * 60  # 距上一份完整报告超过该时长(秒)时重新生成完整报告
+
+# 分布式爬取(共享工作队列)配置
+WORK_QUEUE_PATH = Path(os.getenv("WORK_QUEUE_PATH", "./work_queue.db"))  # SQLite队列文件
+WORK_QUEUE_LEASE_SECONDS = 300  # 租约时长(秒)，到期未完成的任务会被重新领取
+WORK_QUEUE_MAX_ATTEMPTS = 3  # 每个任务的最大尝试次数
+WORK_QUEUE_BATCH_SIZE = 5  # 工作者每次领取的任务数
+WORK_QUEUE_POLL_INTERVAL = 2.0  # 队列为空时的轮询间隔(秒)
+
 # DeepSeek API配置
 DEEPSEEK_MODEL = "deepseek-chat"
 DEEPSEEK_BASE_URL = "https://api.deepseek.com/v1"
 DEEPSEEK_MAX_TOKENS = 8000
 DEEPSEEK_TEMPERATURE = 0.7
+DEEPSEEK_TIMEOUT = 120  # API请求超时时间(秒)
+DEEPSEEK_CONTEXT_WINDOW = 65536  # 模型上下文窗口(tokens)，输入与输出共用
+
+# 分析器选择: deepseek(单一服务) 或 multi(多个兼容OpenAI接口的服务，按权重和健康状况路由)
+ANALYZER = os.getenv("ANALYZER", "deepseek")
+
+# 多后端分析配置
+# 每项为 {"name": 名称, "base_url": 服务地址, "model": 模型, "api_key_env": 存放API密钥的环境变量名, "weight": 权重}，
+# 可用环境变量LLM_BACKENDS(JSON数组)覆盖，在创建多后端分析器时才解析(见load_llm_backends)，
+# 格式错误不影响不使用多后端分析器的入口
+LLM_BACKENDS: List[Dict] = [
+    {"name": "deepseek", "base_url": DEEPSEEK_BASE_URL, "model": DEEPSEEK_MODEL, "api_key_env": "DEEPSEEK_API_KEY", "weight": 1}
+]
+LLM_BACKEND_FAILURE_THRESHOLD = 3  # 连续失败多少次后暂时移出轮换
+LLM_BACKEND_EJECT_SECONDS = 30  # 移出轮换的时长(秒)，之后放行一个探测请求
+LLM_BACKEND_MAX_EJECT_SECONDS = 600  # 探测失败时移出时长加倍的上限(秒)
+LLM_HEDGE_ENABLED = os.getenv("LLM_HEDGE", "1") == "1"  # 请求超过延迟阈值时是否向另一个后端发出对冲请求
+LLM_HEDGE_PERCENTILE = 95  # 延迟阈值取该后端最近成功请求耗时的百分位(0-100)
+LLM_HEDGE_MIN_SAMPLES = 10  # 单个后端样本不足时合并所有后端的样本，仍不足时使用LLM_HEDGE_DEFAULT_DELAY
+LLM_HEDGE_DEFAULT_DELAY = 30.0  # 样本不足时的延迟阈值(秒)
+LLM_HEDGE_MIN_DELAY = 1.0  # 延迟阈值下限(秒)，避免过早对冲
+LLM_HEDGE_MAX = 1  # 每个请求最多额外发出的对冲请求数
+LLM_LATENCY_WINDOW = 200  # 计算分位数使用的最近样本数
+
+# 大模型请求调度配置(进程内所有分析请求共用)
+LLM_SCHEDULER_ENABLED = os.getenv("LLM_SCHEDULER", "1") == "1"  # 是否经调度器发出请求
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "4"))  # 同时进行的请求数上限
+LLM_REQUESTS_PER_MINUTE = float(os.getenv("LLM_RPM", "0"))  # 每分钟请求数上限，0表示不限制
+LLM_TOKENS_PER_MINUTE = float(os.getenv("LLM_TPM", "0"))  # 每分钟token数上限，0表示不限制
+LLM_MAX_RETRIES = 4  # 429/5xx/超时的最大重试次数
+LLM_BACKOFF_BASE = 1.0  # 首次重试的退避时长(秒)，之后每次翻倍
+LLM_BACKOFF_MAX = 30.0  # 退避时长上限(秒)
+
+# 提示词预算配置
+TOKENS_PER_CJK_CHAR = 0.6  # 每个中日韩字符(含全角标点)约合的token数
+TOKENS_PER_OTHER_CHAR = 0.3  # 每个其他字符(英文、数字、空白等)约合的token数
+PROMPT_SAFETY_MARGIN = 1024  # 为估算误差预留的token数
+PROMPT_MIN_ARTICLE_TOKENS = 300  # 每篇文章正文至少保留的token数，预算不足时丢弃排在后面的文章
+
+# 抽取式预压缩配置(调用模型前在本地挑选每篇文章的关键句)
+COMPRESSION_ENABLED = os.getenv("COMPRESSION", "1") == "1"  # 是否开启
+COMPRESSION_RATIO = float(os.getenv("COMPRESSION_RATIO", "0.5"))  # 每篇文章保留的token比例
+COMPRESSION_MIN_TOKENS = 400  # 正文少于该token数的文章不压缩
+COMPRESSION_MIN_SENTENCES = 3  # 每篇文章至少保留的句子数
+COMPRESSION_LEAD_BONUS = 0.2  # 导语(前两句)的得分加成
+COMPRESSION_BOILERPLATE_PATTERNS = [  # 命中即直接去掉的句子
+    "免责声明",
+    "责任编辑",
+    "相关阅读",
+    "延伸阅读",
+    "风险提示：",
+    "新浪财经APP",
+    "海量资讯、精准解读",
+    "扫描二维码",
+    "点击进入专题",
+    "文章内容仅供参考"
+]
+
+# 主题聚类配置(文章较多时按主题拆分成多个分析请求并发调用)
+CLUSTERING_ENABLED = os.getenv("CLUSTERING", "1") == "1"  # 是否开启
+CLUSTER_MIN_ARTICLES = int(os.getenv("CLUSTER_MIN_ARTICLES", "30"))  # 文章数达到该值才聚类
+CLUSTER_TARGET_SIZE = 12  # 每个主题的目标文章数，用于确定聚类数
+CLUSTER_MAX_CLUSTERS = 8  # 最多的主题数
+CLUSTER_MIN_SIZE = 3  # 文章数少于该值的主题并入最相近的主题
+CLUSTER_NGRAM_RANGE = (2, 3)  # 字符n-gram的长度范围
+CLUSTER_MAX_FEATURES = 20000  # 最多保留的特征数(按文档频率)
+CLUSTER_TEXT_CHARS = 1500  # 每篇文章参与聚类的正文字符数
+CLUSTER_WORKERS = 8  # 并发分析的请求数，不小于CLUSTER_MAX_CLUSTERS时所有主题同时调用
 
 # DeepSeek系统提示词
 DEEPSEEK_SYSTEM_PROMPT = """你是一位资深的新闻分析师，擅长对各类新闻进行深度解读和分析。你的任务是分析多篇新闻文章，提炼出关键信息，发现潜在趋势和规律，生成一份有价值的新闻分析报告。
@@ -65,3 +274,25 @@ DEEPSEEK_SYSTEM_PROMPT = """你是一位资深的新闻分析师，擅长对各
 
 请以Markdown格式输出，注意段落组织，适当使用标题、列表、引用等格式元素增强可读性。不要简单复述原文内容，而是进行深度分析和洞察。
 然后请你使用正确的引用格式，引用格式需要遵循apa引用格式"""
+
+
+def load_llm_backends() -> List[Dict]:
+    """
+    读取多后端配置：设置了环境变量LLM_BACKENDS时按JSON数组解析，否则使用LLM_BACKENDS
+
+    Returns:
+        List[Dict]: 后端配置列表
+
+    Raises:
+        ValueError: 环境变量LLM_BACKENDS不是由对象组成的JSON数组
+    """
+    raw = os.getenv("LLM_BACKENDS", "").strip()
+    if not raw:
+        return LLM_BACKENDS
+    try:
+        backends = json.loads(raw)
+    except ValueError as e:
+        raise ValueError(f"环境变量LLM_BACKENDS不是有效的JSON: {e}") from None
+    if not isinstance(backends, list) or not all(isinstance(backend, dict) for backend in backends):
+        raise ValueError("环境变量LLM_BACKENDS必须是JSON数组，每项为一个后端配置对象")
+    return backends or LLM_BACKENDS
@@ -0,0 +1,21 @@
+from typing import TYPE_CHECKING
+
+from ..utils.lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from ..distributed.base_queue import BaseWorkQueue, WorkItem
+    from ..distributed.sqlite_queue import SqliteWorkQueue
+    from ..distributed.coordinator import Coordinator
+    from ..distributed.worker import CrawlWorker
+
+_EXPORTS = {
+    'BaseWorkQueue': ('base_queue', 'BaseWorkQueue'),
+    'WorkItem': ('base_queue', 'WorkItem'),
+    'SqliteWorkQueue': ('sqlite_queue', 'SqliteWorkQueue'),
+    'Coordinator': ('coordinator', 'Coordinator'),
+    'CrawlWorker': ('worker', 'CrawlWorker')
+}
+
+__all__ = list(_EXPORTS)
+
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS, globals())
@@ -0,0 +1,136 @@
+#!/usr/bin/env python
+"""
+共享工作队列基类模块
+
+协调者把发现的文章URL放入队列，工作者以租约方式领取：
+租约到期仍未完成的任务会重新变为可领取(可见性超时)，
+超过最大尝试次数的任务标记为失败
+"""
+
+from abc import ABC, abstractmethod
+from typing import Dict, Iterator, List, Optional
+
+
+class WorkItem:
+    """队列中的一个爬取任务"""
+
+    def __init__(self, url: str, category: str, attempts: int = 0, lease_owner: Optional[str] = None):
+        """
+        初始化任务
+
+        Args:
+            url: 文章URL
+            category: 文章分类
+            attempts: 已被领取的次数(含本次)
+            lease_owner: 持有租约的工作者ID
+        """
+        self.url = url
+        self.category = category
+        self.attempts = attempts
+        self.lease_owner = lease_owner
+
+    def __repr__(self) -> str:
+        return f"WorkItem(url={self.url!r}, category={self.category!r}, attempts={self.attempts})"
+
+
+class BaseWorkQueue(ABC):
+    """
+    工作队列基类，定义队列接口
+    接入其他消息中间件时继承此类实现以下方法
+    """
+
+    @abstractmethod
+    def put(self, urls: List[str], category: str) -> int:
+        """
+        放入任务，队列中已有(包括已完成)的URL会被忽略
+
+        Args:
+            urls: 文章URL列表
+            category: 文章分类
+
+        Returns:
+            int: 实际新增的任务数
+        """
+        pass
+
+    @abstractmethod
+    def claim(self, worker_id: str, limit: int = 1, lease_seconds: Optional[float] = None) -> List[WorkItem]:
+        """
+        领取任务并获得租约
+
+        Args:
+            worker_id: 工作者ID
+            limit: 最多领取的任务数
+            lease_seconds: 租约时长(秒)，到期未完成的任务会被其他工作者重新领取
+
+        Returns:
+            List[WorkItem]: 领取到的任务，队列为空时返回空列表
+        """
+        pass
+
+    @abstractmethod
+    def extend(self, item: WorkItem, lease_seconds: Optional[float] = None) -> bool:
+        """
+        延长租约
+
+        Returns:
+            bool: 租约仍由该工作者持有并已延长时返回True
+        """
+        pass
+
+    @abstractmethod
+    def complete(self, item: WorkItem, result: dict):
+        """
+        标记任务完成并写回结果
+
+        Args:
+            item: 任务
+            result: 爬取结果，通常是Article.to_dict()
+        """
+        pass
+
+    @abstractmethod
+    def fail(self, item: WorkItem, error: str):
+        """
+        标记任务失败：未超过最大尝试次数时重新变为可领取，否则标记为失败
+
+        Args:
+            item: 任务
+            error: 错误信息
+        """
+        pass
+
+    @abstractmethod
+    def results(self, category: Optional[str] = None) -> Iterator[dict]:
+        """
+        遍历已完成任务的结果
+
+        Args:
+            category: 只返回该分类的结果，为None时返回全部
+        """
+        pass
+
+    @abstractmethod
+    def stats(self) -> Dict[str, int]:
+        """
+        获取各状态的任务数
+
+        Returns:
+            Dict[str, int]: pending/leased/done/failed 的任务数
+        """
+        pass
+
+    def is_drained(self) -> bool:
+        """没有待领取和领取中的任务时返回True"""
+        stats = self.stats()
+        return stats.get("pending", 0) == 0 and stats.get("leased", 0) == 0
+
+    def close(self):
+        """释放队列持有的资源"""
+        pass
+
+    def __enter__(self) -> "BaseWorkQueue":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
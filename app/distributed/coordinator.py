@@ -0,0 +1,106 @@
+#!/usr/bin/env python
+"""
+爬取协调者模块
+
+负责发现各分类的文章URL并放入共享队列，等待工作者处理完成后汇总结果
+"""
+
+import time
+from typing import Callable, Dict, List, Optional
+
+from ..config.settings import WORK_QUEUE_POLL_INTERVAL
+from ..distributed.base_queue import BaseWorkQueue
+from ..models.article import Article
+from ..utils.logger import logger
+
+
+class Coordinator:
+    """爬取协调者"""
+
+    def __init__(self, queue: BaseWorkQueue, scraper=None):
+        """
+        初始化协调者
+
+        Args:
+            queue: 工作队列
+            scraper: 用于发现URL的爬虫实例，默认创建SinaScraper
+        """
+        self.queue = queue
+        self.logger = logger
+
+        if scraper is None:
+            from ..scrapers.sina_scraper import SinaScraper
+            scraper = SinaScraper()
+        self.scraper = scraper
+
+    def discover(self, categories: List[str], limit: int = 10) -> Dict[str, int]:
+        """
+        发现各分类的文章URL并放入队列
+
+        Args:
+            categories: 分类列表
+            limit: 每个分类最多放入的URL数
+
+        Returns:
+            Dict[str, int]: 各分类新增的任务数
+        """
+        supported = self.scraper.get_categories()
+        added = {}
+        for category in categories:
+            if category not in supported:
+                self.logger.error("不支持的分类: %s", category)
+                continue
+            urls = self.scraper.get_article_urls(supported[category], limit=limit)
+            added[category] = self.queue.put(urls, category)
+            self.logger.info("分类 '%s' 发现 %s 个URL，新增任务 %s 个", category, len(urls), added[category])
+        return added
+
+    def wait(
+        self,
+        timeout: Optional[float] = None,
+        poll_interval: float = WORK_QUEUE_POLL_INTERVAL,
+        on_progress: Optional[Callable[[Dict[str, int]], None]] = None
+    ) -> bool:
+        """
+        等待队列中的任务全部完成或失败
+
+        Args:
+            timeout: 最长等待时间(秒)，为None时一直等待
+            poll_interval: 轮询间隔(秒)
+            on_progress: 每次轮询时以队列统计调用的回调
+
+        Returns:
+            bool: 队列已处理完时返回True，超时返回False
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            stats = self.queue.stats()
+            if on_progress is not None:
+                on_progress(stats)
+            if stats["pending"] == 0 and stats["leased"] == 0:
+                return True
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            time.sleep(poll_interval)
+
+    def collect(self, category: Optional[str] = None) -> List[Article]:
+        """
+        汇总已完成任务的文章
+
+        Args:
+            category: 只汇总该分类，为None时汇总全部
+
+        Returns:
+            List[Article]: 文章列表
+        """
+        return [Article.from_dict(data) for data in self.queue.results(category)]
+
+    def close(self):
+        """释放爬虫持有的资源"""
+        self.scraper.close()
+
+    def __enter__(self) -> "Coordinator":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
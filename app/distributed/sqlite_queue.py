@@ -0,0 +1,219 @@
+#!/usr/bin/env python
+"""
+基于SQLite的工作队列实现
+
+不依赖外部服务，同一主机上的多个进程通过同一个数据库文件协作；
+领取任务在 BEGIN IMMEDIATE 事务中完成，保证同一任务同一时间只有一个租约。
+SQLite的文件锁在网络文件系统上不可靠，跨主机部署时应实现其他BaseWorkQueue后端
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Union
+
+from ..config.settings import WORK_QUEUE_LEASE_SECONDS, WORK_QUEUE_MAX_ATTEMPTS
+from ..distributed.base_queue import BaseWorkQueue, WorkItem
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    url TEXT PRIMARY KEY,
+    category TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    lease_owner TEXT,
+    lease_expires REAL,
+    enqueued_at REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_tasks_status ON tasks (status, enqueued_at);
+CREATE TABLE IF NOT EXISTS results (
+    url TEXT PRIMARY KEY,
+    category TEXT NOT NULL,
+    worker TEXT,
+    data TEXT NOT NULL,
+    finished_at REAL NOT NULL
+);
+"""
+
+
+class SqliteWorkQueue(BaseWorkQueue):
+    """SQLite工作队列"""
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        lease_seconds: float = WORK_QUEUE_LEASE_SECONDS,
+        max_attempts: int = WORK_QUEUE_MAX_ATTEMPTS,
+        busy_timeout: float = 30.0
+    ):
+        """
+        初始化队列，数据库文件不存在时自动创建
+
+        Args:
+            path: 数据库文件路径
+            lease_seconds: 默认租约时长(秒)
+            max_attempts: 每个任务的最大尝试次数
+            busy_timeout: 等待其他进程释放写锁的最长时间(秒)
+        """
+        self.path = Path(path)
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.path.parent.mkdir(exist_ok=True, parents=True)
+
+        # 自动提交模式，需要原子性的操作显式开启事务
+        self._conn = sqlite3.connect(
+            str(self.path), timeout=busy_timeout, isolation_level=None, check_same_thread=False
+        )
+        self._conn.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(_SCHEMA)
+
+    def put(self, urls: List[str], category: str) -> int:
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                before = self._conn.total_changes
+                self._conn.executemany(
+                    "INSERT OR IGNORE INTO tasks (url, category, enqueued_at, updated_at) VALUES (?, ?, ?, ?)",
+                    [(url, category, now, now) for url in urls]
+                )
+                added = self._conn.total_changes - before
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return added
+
+    def claim(self, worker_id: str, limit: int = 1, lease_seconds: Optional[float] = None) -> List[WorkItem]:
+        now = time.time()
+        expires = now + (lease_seconds or self.lease_seconds)
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                # 租约反复过期(如工作者处理该任务时崩溃)且已达到最大尝试次数的任务不再分发
+                self._conn.execute(
+                    """
+                    UPDATE tasks SET status = 'failed', lease_owner = NULL, lease_expires = NULL,
+                        updated_at = ?, error = '租约过期次数过多'
+                    WHERE status = 'leased' AND lease_expires < ? AND attempts >= ?
+                    """,
+                    (now, now, self.max_attempts)
+                )
+                rows = self._conn.execute(
+                    """
+                    SELECT url, category, attempts FROM tasks
+                    WHERE status = 'pending' OR (status = 'leased' AND lease_expires < ?)
+                    ORDER BY enqueued_at
+                    LIMIT ?
+                    """,
+                    (now, limit)
+                ).fetchall()
+                self._conn.executemany(
+                    """
+                    UPDATE tasks SET status = 'leased', attempts = attempts + 1,
+                        lease_owner = ?, lease_expires = ?, updated_at = ?
+                    WHERE url = ?
+                    """,
+                    [(worker_id, expires, now, row["url"]) for row in rows]
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return [WorkItem(row["url"], row["category"], row["attempts"] + 1, worker_id) for row in rows]
+
+    def extend(self, item: WorkItem, lease_seconds: Optional[float] = None) -> bool:
+        now = time.time()
+        with self._lock:
+            cursor = self._conn.execute(
+                """
+                UPDATE tasks SET lease_expires = ?, updated_at = ?
+                WHERE url = ? AND status = 'leased' AND lease_owner = ?
+                """,
+                (now + (lease_seconds or self.lease_seconds), now, item.url, item.lease_owner)
+            )
+        return cursor.rowcount == 1
+
+    def complete(self, item: WorkItem, result: dict):
+        now = time.time()
+        data = json.dumps(result, ensure_ascii=False)
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                # 租约过期后可能有两个工作者完成同一任务，结果按URL覆盖，操作是幂等的
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO results (url, category, worker, data, finished_at) VALUES (?, ?, ?, ?, ?)",
+                    (item.url, item.category, item.lease_owner, data, now)
+                )
+                self._conn.execute(
+                    """
+                    UPDATE tasks SET status = 'done', lease_owner = NULL, lease_expires = NULL,
+                        updated_at = ?, error = NULL
+                    WHERE url = ?
+                    """,
+                    (now, item.url)
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def fail(self, item: WorkItem, error: str):
+        now = time.time()
+        with self._lock:
+            # 租约已被其他工作者接手时不修改任务状态
+            self._conn.execute(
+                """
+                UPDATE tasks SET
+                    status = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END,
+                    lease_owner = NULL, lease_expires = NULL, updated_at = ?, error = ?
+                WHERE url = ? AND status = 'leased' AND lease_owner = ?
+                """,
+                (self.max_attempts, now, error[:1000], item.url, item.lease_owner)
+            )
+
+    def results(self, category: Optional[str] = None) -> Iterator[dict]:
+        with self._lock:
+            if category is None:
+                rows = self._conn.execute("SELECT data FROM results ORDER BY finished_at").fetchall()
+            else:
+                rows = self._conn.execute(
+                    "SELECT data FROM results WHERE category = ? ORDER BY finished_at", (category,)
+                ).fetchall()
+        for row in rows:
+            yield json.loads(row["data"])
+
+    def stats(self) -> Dict[str, int]:
+        now = time.time()
+        with self._lock:
+            rows = self._conn.execute(
+                """
+                SELECT CASE WHEN status = 'leased' AND lease_expires < ? THEN 'pending' ELSE status END AS state,
+                    COUNT(*) AS count
+                FROM tasks GROUP BY state
+                """,
+                (now,)
+            ).fetchall()
+        stats = {"pending": 0, "leased": 0, "done": 0, "failed": 0}
+        stats.update({row["state"]: row["count"] for row in rows})
+        return stats
+
+    def failures(self) -> List[Dict[str, str]]:
+        """获取最终失败的任务及错误信息"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT url, category, attempts, error FROM tasks WHERE status = 'failed' ORDER BY updated_at"
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
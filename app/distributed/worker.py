@@ -0,0 +1,182 @@
+#!/usr/bin/env python
+"""
+爬取工作者模块
+
+从共享队列领取文章URL，用SinaScraper下载和提取后把结果写回队列
+"""
+
+import os
+import socket
+import threading
+import uuid
+from typing import Dict, Optional
+
+from ..config.settings import (
+    PARSE_WORKERS,
+    WORK_QUEUE_BATCH_SIZE,
+    WORK_QUEUE_LEASE_SECONDS,
+    WORK_QUEUE_POLL_INTERVAL
+)
+from ..distributed.base_queue import BaseWorkQueue, WorkItem
+from ..utils.logger import logger
+
+# 每个租约周期内续约的次数，一次续约失败(如数据库短暂锁定)时后面还有机会
+_HEARTBEATS_PER_LEASE = 3
+
+
+def default_worker_id() -> str:
+    """生成形如 主机名-进程号-随机串 的工作者ID"""
+    return f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:6]}"
+
+
+class CrawlWorker:
+    """爬取工作者"""
+
+    def __init__(
+        self,
+        queue: BaseWorkQueue,
+        worker_id: Optional[str] = None,
+        batch_size: int = WORK_QUEUE_BATCH_SIZE,
+        lease_seconds: float = WORK_QUEUE_LEASE_SECONDS,
+        poll_interval: float = WORK_QUEUE_POLL_INTERVAL,
+        parse_workers: int = PARSE_WORKERS,
+        scraper=None
+    ):
+        """
+        初始化工作者
+
+        Args:
+            queue: 工作队列
+            worker_id: 工作者ID，默认自动生成
+            batch_size: 每次领取的任务数
+            lease_seconds: 租约时长(秒)，处理一批任务期间每隔其1/3续约一次
+            poll_interval: 队列为空时的轮询间隔(秒)
+            parse_workers: 解析进程数
+            scraper: 爬虫实例，默认创建SinaScraper
+        """
+        self.queue = queue
+        self.worker_id = worker_id or default_worker_id()
+        self.batch_size = batch_size
+        self.lease_seconds = lease_seconds
+        self.poll_interval = poll_interval
+        self.logger = logger
+        self._stop_event = threading.Event()
+
+        if scraper is None:
+            from ..scrapers.sina_scraper import SinaScraper
+            scraper = SinaScraper(parse_workers=parse_workers)
+        self.scraper = scraper
+
+        self.processed = 0
+        self.succeeded = 0
+
+    def stop(self):
+        """请求停止，当前批次完成后退出"""
+        self._stop_event.set()
+
+    def run(self, exit_when_empty: bool = False, max_items: Optional[int] = None) -> int:
+        """
+        循环领取并处理任务
+
+        Args:
+            exit_when_empty: 队列中没有待领取和领取中的任务时退出
+            max_items: 最多处理的任务数，为None时不限制
+
+        Returns:
+            int: 成功处理的任务数
+        """
+        self.logger.info("工作者 %s 已启动", self.worker_id)
+        while not self._stop_event.is_set():
+            if max_items is not None and self.processed >= max_items:
+                break
+            limit = self.batch_size if max_items is None else min(self.batch_size, max_items - self.processed)
+            if not self.run_batch(limit):
+                if exit_when_empty and self.queue.is_drained():
+                    break
+                self._stop_event.wait(self.poll_interval)
+
+        self.logger.info("工作者 %s 已停止，处理 %s 个任务，成功 %s 个", self.worker_id, self.processed, self.succeeded)
+        return self.succeeded
+
+    def run_batch(self, limit: Optional[int] = None) -> int:
+        """
+        领取并处理一批任务
+
+        Args:
+            limit: 领取的任务数，默认为batch_size
+
+        Returns:
+            int: 领取到的任务数
+        """
+        items = self.queue.claim(self.worker_id, limit or self.batch_size, self.lease_seconds)
+        if not items:
+            return 0
+
+        # 处理期间由心跳线程为尚未完成的任务续约，避免批次耗时超过租约后被其他工作者重复领取
+        outstanding = {item.url: item for item in items}
+        outstanding_lock = threading.Lock()
+        done = threading.Event()
+        heartbeat = threading.Thread(
+            target=self._heartbeat, args=(outstanding, outstanding_lock, done), name="lease-heartbeat", daemon=True
+        )
+        heartbeat.start()
+
+        try:
+            # 同一批任务可能属于不同分类，按分类交给爬虫批量处理(启用解析进程池时可并行解析)
+            by_category = {}
+            for item in items:
+                by_category.setdefault(item.category, []).append(item)
+
+            for category, group in by_category.items():
+                pending = {item.url: item for item in group}
+                try:
+                    articles = self.scraper.scrape_articles(list(pending), category)
+                except Exception as e:
+                    self.logger.error("工作者 %s 处理任务出错: %s", self.worker_id, e)
+                    articles = []
+
+                for article in articles:
+                    item = pending.pop(article.url, None)
+                    if item is None:
+                        continue
+                    with outstanding_lock:
+                        outstanding.pop(item.url, None)
+                    self.queue.complete(item, article.to_dict())
+                    self.succeeded += 1
+
+                for item in pending.values():
+                    with outstanding_lock:
+                        outstanding.pop(item.url, None)
+                    self.queue.fail(item, "无法获取或提取文章")
+        finally:
+            done.set()
+            heartbeat.join()
+
+        self.processed += len(items)
+        return len(items)
+
+    def _heartbeat(self, outstanding: Dict[str, WorkItem], lock: threading.Lock, done: threading.Event):
+        """每隔租约时长的1/3为尚未完成的任务续约，直到done被设置"""
+        interval = self.lease_seconds / _HEARTBEATS_PER_LEASE
+        while not done.wait(interval):
+            with lock:
+                items = list(outstanding.values())
+            for item in items:
+                try:
+                    if not self.queue.extend(item, self.lease_seconds):
+                        # 租约已过期并被其他工作者领取，结果仍会写回，队列按URL覆盖
+                        self.logger.warning("工作者 %s 续约失败，任务已被其他工作者领取: %s", self.worker_id, item.url)
+                        with lock:
+                            outstanding.pop(item.url, None)
+                except Exception as e:
+                    self.logger.warning("工作者 %s 续约出错: %s", self.worker_id, e)
+
+    def close(self):
+        """释放爬虫持有的资源"""
+        self.scraper.close()
+
+    def __enter__(self) -> "CrawlWorker":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
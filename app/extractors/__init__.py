@@ -1,4 +1,19 @@
-from ..extractors.base_extractor import BaseExtractor
-from ..extractors.sina_extractor import SinaExtractor
+from typing import TYPE_CHECKING
 
-__all__ = ['BaseExtractor', 'SinaExtractor'] 
\ No newline at end of file
+from ..utils.lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from ..extractors.base_extractor import BaseExtractor
+    from ..extractors.density_extractor import DensityExtractor
+    from ..extractors.sina_extractor import SinaExtractor
+
+# 提取器依赖bs4，子模块在首次访问时才导入
+_EXPORTS = {
+    'BaseExtractor': ('base_extractor', 'BaseExtractor'),
+    'DensityExtractor': ('density_extractor', 'DensityExtractor'),
+    'SinaExtractor': ('sina_extractor', 'SinaExtractor')
+}
+
+__all__ = list(_EXPORTS)
+
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS, globals())
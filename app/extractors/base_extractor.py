@@ -9,7 +9,12 @@ from typing import Optional
 
 from bs4 import BeautifulSoup
 
+from ..models.article import Article
 from ..utils.logger import logger
+from ..utils.timing import timed
+
+# 正文少于该字符数时视为提取失败
+MIN_CONTENT_LENGTH = 50
 
 
 class BaseExtractor(ABC):
@@ -29,12 +34,13 @@ class BaseExtractor(ABC):
         self.logger = logger
         
     @abstractmethod
-    def extract_title(self, soup: BeautifulSoup) -> str:
+    def extract_title(self, soup: BeautifulSoup, url: str = "") -> str:
         """
         提取文章标题
         
         Args:
             soup: BeautifulSoup对象
+            url: 页面URL，提取器可据此按站点调整提取策略
             
         Returns:
             str: 文章标题
@@ -42,12 +48,13 @@ class BaseExtractor(ABC):
         pass
         
     @abstractmethod
-    def extract_content(self, soup: BeautifulSoup) -> str:
+    def extract_content(self, soup: BeautifulSoup, url: str = "") -> str:
         """
         提取文章内容
         
         Args:
             soup: BeautifulSoup对象
+            url: 页面URL，提取器可据此按站点调整提取策略
             
         Returns:
             str: 文章内容
@@ -78,4 +85,55 @@ class BaseExtractor(ABC):
         Returns:
             Optional[str]: 作者，如果无法提取则返回None
         """
-        pass 
\ No newline at end of file
+        pass
+        
+    def extract_article(
+        self, 
+        soup: BeautifulSoup, 
+        url: str, 
+        category: str, 
+        source: str
+    ) -> Optional[Article]:
+        """
+        从页面中提取完整的文章对象
+        
+        Args:
+            soup: BeautifulSoup对象
+            url: 文章URL
+            category: 文章分类
+            source: 文章来源
+            
+        Returns:
+            Optional[Article]: 文章对象，标题或内容提取失败则返回None
+        """
+        # 提取标题
+        with timed("extract.title"):
+            title = self.extract_title(soup, url)
+        if not title:
+            self.logger.warning("无法提取标题: %s", url)
+            return None
+            
+        # 提取内容
+        with timed("extract.content"):
+            content = self.extract_content(soup, url)
+        if not content or len(content.strip()) < MIN_CONTENT_LENGTH:  # 内容太短可能是提取失败
+            self.logger.warning("无法提取内容或内容太短: %s", url)
+            return None
+            
+        # 提取发布时间
+        with timed("extract.publish_time"):
+            published_time = self.extract_publish_time(soup)
+            
+        # 提取作者
+        with timed("extract.author"):
+            author = self.extract_author(soup)
+            
+        return Article(
+            title=title,
+            url=url,
+            content=content,
+            source=source,
+            category=category,
+            published_time=published_time,
+            author=author
+        )
\ No newline at end of file
@@ -0,0 +1,302 @@
+#!/usr/bin/env python
+"""
+基于文本密度的通用提取器
+
+不依赖站点选择器：对DOM做一次后序遍历，自底向上累计每个元素的文本长度和链接文本长度，
+段落(<p>等)的非链接文本计入父元素得分、一半计入祖父元素，
+再按链接密度和class/id打折，得分最高的元素即为正文容器。
+每个节点只访问一次，耗时与页面大小成线性关系
+"""
+
+import re
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+from bs4 import BeautifulSoup, CData, NavigableString, Tag
+
+from ..extractors.base_extractor import BaseExtractor
+
+# 不参与计算的元素
+_SKIP_TAGS = {"script", "style", "noscript", "iframe", "svg", "canvas", "template", "head", "select", "textarea", "button"}
+
+# 段落元素，其文本计入父元素和祖父元素的得分
+_PARAGRAPH_TAGS = {"p", "pre", "blockquote", "li"}
+
+# 直接包含文本的块元素(用<br>分段的页面)，自身文本计入自身得分
+_BLOCK_TAGS = {"div", "article", "section", "main", "td"}
+
+# 计入文本长度的字符串类型(不含注释、脚本等)
+_TEXT_TYPES = (NavigableString, CData)
+
+# 段落至少的字符数，更短的视为按钮、标签等
+_MIN_PARAGRAPH = 10
+
+# 正文容器至少的得分
+_MIN_SCORE = 50
+
+# class/id命中时的得分系数
+_POSITIVE_RE = re.compile(r"article|content|body|text|main|entry|post|artibody", re.IGNORECASE)
+_NEGATIVE_RE = re.compile(
+    r"comment|footer|footnote|header|nav|menu|sidebar|side|recommend|related|share|social|"
+    r"ad-|ads|advert|banner|popup|hot|rank|copyright|breadcrumb",
+    re.IGNORECASE
+)
+
+# 正文段落中的噪音(编辑署名、脚本等)
+_NOISE_RE = re.compile(r'(责编|编辑|记者|原标题|来源|标签|关键词|点此查看|var|function|document|if\s*\(|for\s*\()')
+
+_TITLE_SUFFIX_RE = re.compile(r'\s*[-_|]\s*[^-_|]*(新浪|sina|网易|网|中国|栏目|专题)[^-_|]*$', re.IGNORECASE)
+
+_DATE_PATTERNS = [
+    re.compile(r'(\d{4})[-年/](\d{1,2})[-月/](\d{1,2})[日号]?\s*(\d{1,2}):(\d{1,2})'),  # 2023年05月21日 12:34
+    re.compile(r'(\d{4})[-年/](\d{1,2})[-月/](\d{1,2})[日号]?')  # 2023年05月21日
+]
+
+_AUTHOR_PATTERNS = [
+    re.compile(r'作者[：:]\s*([^\s]+)'),
+    re.compile(r'记者[：:]?\s*([^\s，,]+)'),
+    re.compile(r'来源[：:]\s*([^\s]+)')
+]
+
+# 在标题之后查找时间和作者时检查的字符串数
+_META_SCAN_STRINGS = 60
+
+
+def _class_weight(tag: Tag) -> float:
+    """按class和id给正文容器的得分打折或加成"""
+    names = " ".join(tag.get("class") or []) + " " + (tag.get("id") or "")
+    if not names.strip():
+        return 1.0
+    weight = 1.0
+    if _POSITIVE_RE.search(names):
+        weight *= 1.25
+    if _NEGATIVE_RE.search(names):
+        weight *= 0.5
+    return weight
+
+
+def score_blocks(root: Tag) -> List[Tuple[Tag, float]]:
+    """
+    一次后序遍历计算各元素作为正文容器的得分
+
+    Args:
+        root: 遍历的根元素，通常为<body>
+
+    Returns:
+        List[Tuple[Tag, float]]: 得分大于0的元素及其得分，按后序排列
+    """
+    candidates = []
+    # 栈中每项: [元素, 子节点迭代器, 文本长度, 链接文本长度, 段落得分, 自身直接包含的文本长度]
+    stack = [[root, iter(root.contents), 0, 0, 0.0, 0]]
+    while stack:
+        frame = stack[-1]
+        child = next(frame[1], None)
+        if child is not None:
+            if isinstance(child, Tag):
+                if child.name not in _SKIP_TAGS:
+                    stack.append([child, iter(child.contents), 0, 0, 0.0, 0])
+            elif type(child) in _TEXT_TYPES:
+                length = len(child.strip())
+                frame[2] += length
+                frame[5] += length
+            continue
+
+        # 所有子节点已处理，结算当前元素并累加到父元素
+        stack.pop()
+        tag, _, text, link, score, own = frame
+        if tag.name == "a":
+            link = text
+        if tag.name in _BLOCK_TAGS and own >= _MIN_PARAGRAPH:
+            score += own
+        if stack:
+            parent = stack[-1]
+            parent[2] += text
+            parent[3] += link
+            if tag.name in _PARAGRAPH_TAGS and text - link >= _MIN_PARAGRAPH:
+                parent[4] += text - link
+                if len(stack) > 1:
+                    stack[-2][4] += (text - link) / 2
+        if score > 0 and text > 0:
+            candidates.append((tag, score * (1.0 - link / text) * _class_weight(tag)))
+    return candidates
+
+
+def _paragraphs(node: Tag) -> List[str]:
+    """取出正文容器中的段落，去掉太短和噪音段落"""
+    paragraphs = []
+    for p in node.find_all("p"):
+        text = p.get_text().strip()
+        if len(text) > 3 and not _NOISE_RE.search(text):
+            paragraphs.append(text)
+    if paragraphs:
+        return paragraphs
+
+    # 没有段落标签时按换行切分
+    for line in node.get_text("\n").split("\n"):
+        line = line.strip()
+        if len(line) >= _MIN_PARAGRAPH and not _NOISE_RE.search(line):
+            paragraphs.append(line)
+    return paragraphs
+
+
+def extract_main_text(soup: BeautifulSoup) -> str:
+    """
+    按文本密度提取页面正文
+
+    Args:
+        soup: BeautifulSoup对象
+
+    Returns:
+        str: 以空行分隔的正文段落，找不到正文容器时为空字符串
+    """
+    root = soup.body or soup
+    candidates = score_blocks(root)
+    if not candidates:
+        return ""
+    node, score = max(candidates, key=lambda item: item[1])
+    if score < _MIN_SCORE:
+        return ""
+    return "\n\n".join(_paragraphs(node))
+
+
+def parse_datetime(text: str) -> Optional[datetime]:
+    """
+    从文本中解析第一个日期时间
+
+    Args:
+        text: 文本
+
+    Returns:
+        Optional[datetime]: 日期时间，没有或不合法则返回None
+    """
+    for pattern in _DATE_PATTERNS:
+        match = pattern.search(text)
+        if match:
+            try:
+                return datetime(*map(int, match.groups()))
+            except ValueError:
+                continue
+    return None
+
+
+class DensityExtractor(BaseExtractor):
+    """
+    基于文本密度的通用提取器
+    适用于没有专门选择器的站点和改版后选择器失效的页面
+    """
+
+    def __init__(self):
+        """初始化文本密度提取器"""
+        super().__init__(name="density_extractor")
+
+    @staticmethod
+    def _headline(soup: BeautifulSoup) -> Optional[Tag]:
+        """页面中的文章标题元素：与<title>开头一致的<h1>，没有时为第一个足够长的<h1>"""
+        page_title = soup.title.get_text().strip() if soup.title else ""
+        first = None
+        for h1 in soup.find_all("h1", limit=5):
+            text = h1.get_text().strip()
+            if len(text) <= 5:
+                continue
+            if page_title.startswith(text):
+                return h1
+            first = first or h1
+        return first
+
+    def _strings_after_headline(self, soup: BeautifulSoup) -> List[str]:
+        """标题之后的若干个字符串，发布时间和作者通常在这里"""
+        headline = self._headline(soup)
+        if headline is None:
+            return []
+        return [s.strip() for s in headline.find_all_next(string=True, limit=_META_SCAN_STRINGS) if s.strip()]
+
+    def extract_title(self, soup: BeautifulSoup, url: str = "") -> str:
+        """
+        提取文章标题
+
+        Args:
+            soup: BeautifulSoup对象
+            url: 页面URL(未使用)
+
+        Returns:
+            str: 文章标题
+        """
+        meta = soup.find("meta", attrs={"property": "og:title"})
+        if meta and meta.get("content", "").strip():
+            return meta["content"].strip()
+
+        headline = self._headline(soup)
+        if headline is not None:
+            return headline.get_text().strip()
+
+        title = soup.title.get_text().strip() if soup.title else ""
+        return _TITLE_SUFFIX_RE.sub("", title)
+
+    def extract_content(self, soup: BeautifulSoup, url: str = "") -> str:
+        """
+        提取文章内容
+
+        Args:
+            soup: BeautifulSoup对象
+            url: 页面URL(未使用)
+
+        Returns:
+            str: 文章内容
+        """
+        return extract_main_text(soup)
+
+    def extract_publish_time(self, soup: BeautifulSoup) -> Optional[datetime]:
+        """
+        提取发布时间
+
+        Args:
+            soup: BeautifulSoup对象
+
+        Returns:
+            Optional[datetime]: 发布时间，如果无法提取则返回None
+        """
+        for attrs in (
+            {"property": "article:published_time"},
+            {"name": "publishdate"},
+            {"name": "publish_date"},
+            {"itemprop": "datePublished"}
+        ):
+            meta = soup.find("meta", attrs=attrs)
+            if meta and meta.get("content"):
+                published = parse_datetime(meta["content"])
+                if published:
+                    return published
+
+        time_elem = soup.find("time")
+        if time_elem is not None:
+            published = parse_datetime(time_elem.get("datetime") or time_elem.get_text())
+            if published:
+                return published
+
+        for text in self._strings_after_headline(soup):
+            published = parse_datetime(text)
+            if published:
+                return published
+        return None
+
+    def extract_author(self, soup: BeautifulSoup) -> Optional[str]:
+        """
+        提取作者
+
+        Args:
+            soup: BeautifulSoup对象
+
+        Returns:
+            Optional[str]: 作者，如果无法提取则返回None
+        """
+        for attrs in ({"name": "author"}, {"property": "article:author"}):
+            meta = soup.find("meta", attrs=attrs)
+            if meta and meta.get("content", "").strip():
+                return meta["content"].strip()
+
+        for text in self._strings_after_headline(soup):
+            for pattern in _AUTHOR_PATTERNS:
+                match = pattern.search(text)
+                if match:
+                    return match.group(1).strip()
+        return None
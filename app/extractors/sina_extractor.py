@@ -5,54 +5,116 @@
 
 import re
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 
 from bs4 import BeautifulSoup
 
+from ..config.settings import EXTRACTOR_TEMPLATES_ENABLED
 from ..extractors.base_extractor import BaseExtractor
+from ..extractors.density_extractor import extract_main_text
+from ..extractors.template_cache import TemplateCache, get_template_cache, template_key
+
+# 正文段落中的噪音(编辑署名、脚本等)
+_NOISE_RE = re.compile(r'(责编|编辑|记者|原标题|来源|标签|关键词|点此查看|var|function|document|if\s*\(|for\s*\()')
 
 
 class SinaExtractor(BaseExtractor):
     """新浪新闻内容提取器"""
     
-    def __init__(self):
-        """初始化新浪提取器"""
+    # 可能的标题选择器，按经验排序
+    TITLE_SELECTORS = [
+        "h1.main-title",
+        "h1.title",
+        ".main-title",
+        "h1.entry-title",
+        "h1#artibodyTitle",
+        ".article-header h1",
+        ".title_wrapper h1",
+        ".content h1",
+        "h1.data-title",
+        "#artibody h1",
+        ".article h1",
+        ".article-box h1",
+        "h1"
+    ]
+    
+    # 可能的内容选择器，按经验排序
+    CONTENT_SELECTORS = [
+        "#artibody",
+        ".article-content",
+        ".article-body",
+        ".article",
+        "#article_content",
+        ".artical-content",
+        ".content",
+        ".main-content",
+        ".article-box", 
+        "#art_content",
+        ".art_content",
+        ".article_content",
+        ".moduleParagraph",
+        ".article-body-content"
+    ]
+    
+    def __init__(self, templates: Optional[TemplateCache] = None, learn_templates: bool = EXTRACTOR_TEMPLATES_ENABLED):
+        """
+        初始化新浪提取器
+        
+        Args:
+            templates: 提取模板缓存，默认使用进程内共享的缓存
+            learn_templates: 是否按域名和路径模式记住成功的选择器并优先尝试
+        """
         super().__init__(name="sina_extractor")
+        self.templates = (templates or get_template_cache()) if learn_templates else None
+        
+    def _select_first(self, soup: BeautifulSoup, url: str, field: str, selectors: List[str], pick) -> str:
+        """
+        依次尝试选择器，返回第一个有效结果；开启模板缓存时先试该类页面上次成功的选择器
         
-    def extract_title(self, soup: BeautifulSoup) -> str:
+        Args:
+            soup: BeautifulSoup对象
+            url: 页面URL
+            field: 字段名
+            selectors: 完整的选择器列表
+            pick: 从匹配的元素中取出文本的函数，无效时返回空字符串
+            
+        Returns:
+            str: 提取到的文本，所有选择器都失败时为空字符串
+        """
+        key = template_key(url) if self.templates is not None and url else ""
+        if key:
+            selectors = self.templates.order(key, field, selectors)
+            
+        for selector in selectors:
+            for elem in soup.select(selector):
+                text = pick(elem)
+                if text:
+                    if key:
+                        self.templates.record(key, field, selector, selectors[0])
+                    return text
+                    
+        if key:
+            self.templates.record(key, field, None, selectors[0])
+        return ""
+        
+    def extract_title(self, soup: BeautifulSoup, url: str = "") -> str:
         """
         提取文章标题
         
         Args:
             soup: BeautifulSoup对象
+            url: 页面URL，用于按页面模板调整选择器顺序
             
         Returns:
             str: 文章标题
         """
-        # 尝试多种可能的标题选择器
-        selectors = [
-            "h1.main-title",
-            "h1.title",
-            ".main-title",
-            "h1.entry-title",
-            "h1#artibodyTitle",
-            ".article-header h1",
-            ".title_wrapper h1",
-            ".content h1",
-            "h1.data-title",
-            "#artibody h1",
-            ".article h1",
-            ".article-box h1",
-            "h1"
-        ]
-        
-        for selector in selectors:
-            title_elems = soup.select(selector)
-            if title_elems:
-                for title_elem in title_elems:
-                    title_text = title_elem.get_text().strip()
-                    if title_text and len(title_text) > 5:  # 避免空或太短的标题
-                        return title_text
+        def pick(elem) -> str:
+            title_text = elem.get_text().strip()
+            return title_text if len(title_text) > 5 else ""  # 避免空或太短的标题
+            
+        title = self._select_first(soup, url, "title", self.TITLE_SELECTORS, pick)
+        if title:
+            return title
                     
         # 回退到页面标题
         title = soup.title.get_text().strip() if soup.title else ""
@@ -60,68 +122,48 @@ class SinaExtractor(BaseExtractor):
         title = re.sub(r'[-_].*?(新浪|sina|网易|网|中国|栏目|专题).*?$', '', title, flags=re.IGNORECASE)
         return title
         
-    def extract_content(self, soup: BeautifulSoup) -> str:
+    @staticmethod
+    def _content_text(content_elem) -> str:
+        """从内容元素中取出正文，无效时返回空字符串"""
+        # 尝试查找段落
+        paragraphs = content_elem.select("p")
+        if paragraphs:
+            # 过滤掉太短的段落和可能是广告的段落
+            filtered_paragraphs = []
+            for p in paragraphs:
+                text = p.get_text().strip()
+                if text and len(text) > 3 and not _NOISE_RE.search(text):
+                    filtered_paragraphs.append(text)
+            
+            if filtered_paragraphs:
+                return "\n\n".join(filtered_paragraphs)
+        
+        # 如果没有段落标签或过滤后没有段落，尝试直接获取文本
+        text = content_elem.get_text().strip()
+        if len(text) > 100:  # 确保有足够长度
+            # 过滤掉网页中可能的噪音
+            text = re.sub(r'责任编辑.*?$', '', text)
+            text = re.sub(r'(\n\s*){3,}', '\n\n', text)  # 多个空行替换为两个换行
+            return text
+        return ""
+        
+    def extract_content(self, soup: BeautifulSoup, url: str = "") -> str:
         """
         提取文章内容
         
         Args:
             soup: BeautifulSoup对象
+            url: 页面URL，用于按页面模板调整选择器顺序
             
         Returns:
             str: 文章内容
         """
-        # 尝试多种可能的内容选择器
-        selectors = [
-            "#artibody",
-            ".article-content",
-            ".article-body",
-            ".article",
-            "#article_content",
-            ".artical-content",
-            ".content",
-            ".main-content",
-            ".article-box", 
-            "#art_content",
-            ".art_content",
-            ".article_content",
-            ".moduleParagraph",
-            ".article-body-content"
-        ]
-        
-        for selector in selectors:
-            content_elems = soup.select(selector)
-            for content_elem in content_elems:
-                # 尝试查找段落
-                paragraphs = content_elem.select("p")
-                if paragraphs:
-                    # 过滤掉太短的段落和可能是广告的段落
-                    filtered_paragraphs = []
-                    for p in paragraphs:
-                        text = p.get_text().strip()
-                        if text and len(text) > 3 and not re.search(r'(责编|编辑|记者|原标题|来源|标签|关键词|点此查看|var|function|document|if\s*\(|for\s*\()', text):
-                            filtered_paragraphs.append(text)
+        content = self._select_first(soup, url, "content", self.CONTENT_SELECTORS, self._content_text)
+        if content:
+            return content
                     
-                    if filtered_paragraphs:
-                        content = "\n\n".join(filtered_paragraphs)
-                        return content
-                
-                # 如果没有段落标签或过滤后没有段落，尝试直接获取文本
-                text = content_elem.get_text().strip()
-                if text and len(text) > 100:  # 确保有足够长度
-                    # 过滤掉网页中可能的噪音
-                    text = re.sub(r'责任编辑.*?$', '', text)
-                    text = re.sub(r'(\n\s*){3,}', '\n\n', text)  # 多个空行替换为两个换行
-                    return text
-                    
-        # 最后尝试，直接获取页面主要文本
-        main_text = ""
-        for tag in soup.find_all(['p', 'div']):
-            text = tag.get_text().strip()
-            if len(text) > 100 and not re.search(r'(责编|编辑|记者|原标题|来源|标签|关键词|点此查看|var|function|document|if\s*\(|for\s*\()', text):
-                main_text = text
-                break
-        
-        return main_text
+        # 最后尝试，按文本密度找出正文容器(一次遍历，与页面大小成线性关系)
+        return extract_main_text(soup)
         
     def extract_publish_time(self, soup: BeautifulSoup) -> Optional[datetime]:
         """
@@ -0,0 +1,217 @@
+#!/usr/bin/env python
+"""
+提取模板缓存模块
+
+同一站点同一类页面几乎总是命中同一个选择器(如新闻频道的#artibody)，
+按"域名+路径模式"记录每个字段上次成功的选择器，下次先试它，
+失败时再按完整的选择器列表依次尝试，多数页面只需一两次DOM查询。
+统计写回JSON文件，多次运行之间保留；多个进程各自累计增量，写回时持有文件锁与文件中的统计合并
+"""
+
+import json
+import multiprocessing.util
+import os
+import re
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Optional
+from urllib.parse import urlparse
+
+from ..config.settings import (
+    EXTRACTOR_TEMPLATE_PATH,
+    EXTRACTOR_TEMPLATE_MAX_KEYS,
+    EXTRACTOR_TEMPLATE_SAVE_INTERVAL
+)
+from ..utils.file import update_json_file
+from ..utils.logger import logger
+from ..utils.metrics import record_cache
+
+_DIGITS_RE = re.compile(r"\d+")
+
+# 路径模式最多保留的目录层数
+_PATH_DEPTH = 3
+
+# {模板键: {字段: {选择器: 得分}}}
+Stats = Dict[str, Dict[str, Dict[str, int]]]
+
+
+def template_key(url: str) -> str:
+    """
+    计算页面所属的模板键：域名加上把数字归一化后的目录和文件扩展名
+
+    如 https://news.sina.com.cn/c/2025-05-08/doc-inevabcd1234.shtml
+    得到 news.sina.com.cn/c/#-#-#/*.shtml
+
+    Args:
+        url: 页面URL
+
+    Returns:
+        str: 模板键，URL无法解析时为空字符串
+    """
+    parsed = urlparse(url)
+    host = (parsed.hostname or "").lower()
+    if not host:
+        return ""
+    segments = [s for s in parsed.path.split("/") if s]
+    filename = segments.pop() if segments and not parsed.path.endswith("/") else ""
+    directories = [_DIGITS_RE.sub("#", s) for s in segments[:_PATH_DEPTH]]
+    extension = os.path.splitext(filename)[1].lower()
+    return "/".join([host] + directories + (["*" + extension] if filename else []))
+
+
+class TemplateCache:
+    """
+    按模板键记录各字段选择器的命中得分
+    选择器成功一次加1分；排在首位的选择器失败时得分减半，页面改版后很快让位
+    """
+
+    def __init__(
+        self,
+        path: Optional[Path] = EXTRACTOR_TEMPLATE_PATH,
+        max_keys: int = EXTRACTOR_TEMPLATE_MAX_KEYS,
+        save_interval: int = EXTRACTOR_TEMPLATE_SAVE_INTERVAL
+    ):
+        """
+        初始化模板缓存
+
+        Args:
+            path: 统计文件路径，为None时只在内存中记录
+            max_keys: 最多记住的模板键数，超过时淘汰最久未使用的
+            save_interval: 每记录多少次写回一次文件，不大于0时只在进程退出时写回
+        """
+        self.path = Path(path) if path else None
+        self.max_keys = max_keys
+        self.save_interval = save_interval
+        self.logger = logger
+        self._stats: "OrderedDict[str, Dict[str, Dict[str, int]]]" = OrderedDict()
+        self._delta: Stats = {}
+        self._records = 0
+        self._lock = threading.Lock()
+        if self.path is not None:
+            self._stats.update(self._read())
+
+    def _read(self) -> Stats:
+        """读取统计文件，不存在或损坏时返回空统计"""
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            self.logger.warning("读取提取模板统计失败 %s: %s", self.path, e)
+            return {}
+        return data if isinstance(data, dict) else {}
+
+    def preferred(self, key: str, field: str) -> Optional[str]:
+        """模板键下该字段得分最高的选择器"""
+        with self._lock:
+            scores = self._stats.get(key, {}).get(field)
+            if not scores:
+                return None
+            self._stats.move_to_end(key)
+            selector, score = max(scores.items(), key=lambda item: item[1])
+        return selector if score > 0 else None
+
+    def order(self, key: str, field: str, selectors: List[str]) -> List[str]:
+        """
+        把学到的选择器排到最前，其余保持原有顺序
+
+        Args:
+            key: 模板键
+            field: 字段名，如title、content
+            selectors: 完整的选择器列表
+
+        Returns:
+            List[str]: 调整顺序后的选择器列表
+        """
+        selector = self.preferred(key, field) if key else None
+        if selector is None or selector not in selectors:
+            return selectors
+        return [selector] + [s for s in selectors if s != selector]
+
+    def record(self, key: str, field: str, selector: Optional[str], first: Optional[str] = None):
+        """
+        记录一次提取结果
+
+        Args:
+            key: 模板键
+            field: 字段名
+            selector: 成功的选择器，所有选择器都失败时为None
+            first: 本次最先尝试的选择器
+        """
+        if not key:
+            return
+        record_cache("extractor_template", selector is not None and selector == first)
+        changes = {}
+        if selector is not None:
+            changes[selector] = 1
+        with self._lock:
+            scores = self._stats.setdefault(key, {}).setdefault(field, {})
+            self._stats.move_to_end(key)
+            if first is not None and first != selector and scores.get(first, 0) > 0:
+                changes[first] = -((scores[first] + 1) // 2)
+            for name, change in changes.items():
+                scores[name] = scores.get(name, 0) + change
+                delta = self._delta.setdefault(key, {}).setdefault(field, {})
+                delta[name] = delta.get(name, 0) + change
+            while len(self._stats) > self.max_keys:
+                self._stats.popitem(last=False)
+            self._records += 1
+            due = self.save_interval > 0 and self._records >= self.save_interval
+            if due:
+                # 在锁内清零，同时达到间隔的多个线程只有一个写回
+                self._records = 0
+        if due:
+            self.save()
+
+    def save(self):
+        """把本进程累计的增量与文件中的统计合并后原子写回"""
+        if self.path is None:
+            return
+        with self._lock:
+            delta, self._delta = self._delta, {}
+            self._records = 0
+        if not delta:
+            return
+
+        def merge() -> Stats:
+            stats = self._read()
+            for key, fields in delta.items():
+                for field, changes in fields.items():
+                    scores = stats.setdefault(key, {}).setdefault(field, {})
+                    for selector, change in changes.items():
+                        scores[selector] = max(scores.get(selector, 0) + change, 0)
+            if len(stats) > self.max_keys:
+                stats = dict(list(stats.items())[-self.max_keys:])
+            return stats
+
+        try:
+            # 工作进程退出时同时写回，读取、合并、替换须在文件锁内完成，否则会丢失其他进程的增量
+            update_json_file(self.path, merge, ensure_ascii=False, sort_keys=True)
+        except OSError as e:
+            self.logger.warning("写回提取模板统计失败 %s: %s", self.path, e)
+
+
+_cache: Optional[TemplateCache] = None
+_cache_pid = 0
+_cache_lock = threading.Lock()
+
+
+def get_template_cache() -> TemplateCache:
+    """
+    获取进程内共享的模板缓存，进程退出时(含解析进程池的工作进程)写回文件
+
+    Returns:
+        TemplateCache: 共享模板缓存
+    """
+    global _cache, _cache_pid
+    # fork出的工作进程重新读取文件，不沿用父进程未写回的增量
+    if _cache is None or _cache_pid != os.getpid():
+        with _cache_lock:
+            if _cache is None or _cache_pid != os.getpid():
+                _cache = TemplateCache()
+                _cache_pid = os.getpid()
+                # 工作进程退出时不执行atexit，multiprocessing的终结器在主进程和工作进程中都会执行
+                multiprocessing.util.Finalize(None, _cache.save, exitpriority=10)
+    return _cache
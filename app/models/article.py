@@ -47,4 +47,18 @@ class Article:
             "category": self.category,
             "published_time": self.published_time.isoformat() if self.published_time else None,
             "author": self.author
-        } 
\ No newline at end of file
+        }
+        
+    @classmethod
+    def from_dict(cls, data: dict) -> "Article":
+        """从字典恢复文章对象，与to_dict互逆"""
+        published_time = data.get("published_time")
+        return cls(
+            title=data["title"],
+            url=data["url"],
+            content=data["content"],
+            source=data["source"],
+            category=data["category"],
+            published_time=datetime.fromisoformat(published_time) if published_time else None,
+            author=data.get("author")
+        )
\ No newline at end of file
@@ -0,0 +1,15 @@
+from typing import TYPE_CHECKING
+
+from ..utils.lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from ..scheduler.news_scheduler import CategoryJob, NewsScheduler
+
+_EXPORTS = {
+    'CategoryJob': ('news_scheduler', 'CategoryJob'),
+    'NewsScheduler': ('news_scheduler', 'NewsScheduler')
+}
+
+__all__ = list(_EXPORTS)
+
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS, globals())
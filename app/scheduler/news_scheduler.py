@@ -0,0 +1,305 @@
+#!/usr/bin/env python
+"""
+定时调度模块
+
+常驻进程按分类定时增量爬取，只有累计到足够多的新文章才调用大模型分析；
+HTTP连接池、解析进程池和大模型客户端在多次运行之间复用
+"""
+
+import heapq
+import random
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+from ..config.settings import (
+    SINA_CATEGORIES,
+    PARSE_WORKERS,
+    SCHEDULER_INTERVAL,
+    SCHEDULER_INTERVALS,
+    SCHEDULER_JITTER,
+    SCHEDULER_CRAWL_LIMIT,
+    SCHEDULER_MIN_NEW_ARTICLES,
+    SCHEDULER_MAX_PENDING_AGE,
+    SCHEDULER_MAX_ANALYZE_ARTICLES,
+    DELTA_REPORTS
+)
+from ..analyzers.delta import DeltaReporter
+from ..models.article import Article
+from ..utils.logger import logger
+from ..utils.metrics import SCHEDULER_RUNS
+from ..utils.timing import timed
+
+
+class CategoryJob:
+    """单个分类的调度状态"""
+
+    def __init__(self, category: str, interval: float):
+        """
+        初始化调度状态
+
+        Args:
+            category: 分类名称
+            interval: 爬取间隔(秒)
+        """
+        self.category = category
+        self.interval = interval
+        # 不含抖动的计划时间，用于保持固定节奏
+        self.due = 0.0
+        # 加上抖动后的实际运行时间
+        self.next_run = 0.0
+        # 等待分析的新文章及最早一篇的到达时间
+        self.pending: List[Article] = []
+        self.pending_since: Optional[float] = None
+        self.runs = 0
+        self.missed = 0
+        self.reports = 0
+
+    def schedule_first(self, now: float, jitter: float):
+        """安排首次运行，在一个抖动窗口内错开各分类的启动时间"""
+        self.due = now
+        self.next_run = now + random.uniform(0, jitter * self.interval)
+
+    def schedule_next(self, now: float, jitter: float) -> int:
+        """
+        安排下次运行
+
+        按固定节奏推进计划时间；如果本次运行超时导致错过了若干次，
+        直接跳到当前时间之后的下一个节拍，错过的运行不会补跑
+
+        Args:
+            now: 当前时间
+            jitter: 抖动比例
+
+        Returns:
+            int: 跳过的运行次数
+        """
+        self.due += self.interval
+        missed = 0
+        if self.due <= now:
+            missed = int((now - self.due) // self.interval) + 1
+            self.due += missed * self.interval
+        self.missed += missed
+        offset = random.uniform(-jitter, jitter) * self.interval
+        self.next_run = max(now, self.due + offset)
+        return missed
+
+    def add_articles(self, articles: List[Article], now: float, max_pending: int):
+        """加入新文章，只保留最新的max_pending篇"""
+        if not articles:
+            return
+        if self.pending_since is None:
+            self.pending_since = now
+        self.pending.extend(articles)
+        if len(self.pending) > max_pending:
+            del self.pending[:len(self.pending) - max_pending]
+
+    def should_analyze(self, now: float, min_new: int, max_age: float) -> bool:
+        """新文章足够多，或者最早的新文章已经等待太久时触发分析"""
+        if not self.pending:
+            return False
+        if len(self.pending) >= min_new:
+            return True
+        return self.pending_since is not None and now - self.pending_since >= max_age
+
+    def clear_pending(self):
+        """分析完成后清空待分析文章"""
+        self.pending = []
+        self.pending_since = None
+
+
+class NewsScheduler:
+    """
+    新闻定时调度器
+
+    所有分类在同一个线程中依次运行，同一时间只有一个任务，任务之间不会重叠；
+    stop()可以从信号处理函数或其他线程调用
+    """
+
+    def __init__(
+        self,
+        categories: Optional[List[str]] = None,
+        intervals: Optional[Dict[str, float]] = None,
+        default_interval: float = SCHEDULER_INTERVAL,
+        jitter: float = SCHEDULER_JITTER,
+        crawl_limit: int = SCHEDULER_CRAWL_LIMIT,
+        min_new_articles: int = SCHEDULER_MIN_NEW_ARTICLES,
+        max_pending_age: float = SCHEDULER_MAX_PENDING_AGE,
+        max_analyze_articles: int = SCHEDULER_MAX_ANALYZE_ARTICLES,
+        parse_workers: int = PARSE_WORKERS,
+        analyze: bool = True,
+        delta: bool = DELTA_REPORTS,
+        scraper=None,
+        analyzer=None,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        初始化调度器
+
+        Args:
+            categories: 要调度的分类，默认全部
+            intervals: 各分类的爬取间隔(秒)，默认使用SCHEDULER_INTERVALS
+            default_interval: 未单独配置的分类使用的间隔(秒)
+            jitter: 间隔的随机抖动比例
+            crawl_limit: 每次爬取时考察的文章数量
+            min_new_articles: 累计多少篇新文章才触发分析
+            max_pending_age: 新文章最长等待时间(秒)
+            max_analyze_articles: 每份报告最多分析的文章数
+            parse_workers: 解析进程数
+            analyze: 是否调用大模型分析，为False时只爬取
+            delta: 是否生成增量报告，以上一份报告的摘要为背景只分析之前的报告没有覆盖的文章
+            scraper: 爬虫实例，默认创建SinaScraper
+            analyzer: 分析器实例，默认按配置项ANALYZER创建
+            clock: 单调时钟
+        """
+        self.logger = logger
+        self.jitter = jitter
+        self.crawl_limit = crawl_limit
+        self.min_new_articles = min_new_articles
+        self.max_pending_age = max_pending_age
+        self.max_analyze_articles = max_analyze_articles
+        self.clock = clock
+        self._stop_event = threading.Event()
+
+        if scraper is None:
+            from ..scrapers.sina_scraper import SinaScraper
+            scraper = SinaScraper(parse_workers=parse_workers)
+        self.scraper = scraper
+
+        if analyzer is None and analyze:
+            from ..analyzers.multi_backend_analyzer import create_analyzer
+            analyzer = create_analyzer()
+        self.analyzer = analyzer if analyze else None
+        self.delta = delta
+
+        intervals = SCHEDULER_INTERVALS if intervals is None else intervals
+        supported = self.scraper.get_categories()
+        self.jobs: List[CategoryJob] = []
+        self.reporters: Dict[str, DeltaReporter] = {}
+        for category in categories or list(SINA_CATEGORIES.keys()):
+            if category not in supported:
+                raise ValueError(f"不支持的分类: {category}")
+            self.jobs.append(CategoryJob(category, float(intervals.get(category, default_interval))))
+            if self.analyzer is not None:
+                self.reporters[category] = DeltaReporter(self.analyzer, category, delta=delta)
+
+    def stop(self):
+        """请求停止，当前任务完成后退出"""
+        self._stop_event.set()
+
+    @property
+    def stopped(self) -> bool:
+        """是否已请求停止"""
+        return self._stop_event.is_set()
+
+    def run_forever(self):
+        """运行调度循环，直到调用stop()"""
+        now = self.clock()
+        queue = []
+        for index, job in enumerate(self.jobs):
+            job.schedule_first(now, self.jitter)
+            heapq.heappush(queue, (job.next_run, index, job))
+            self.logger.info("分类 '%s' 每 %.0f 秒爬取一次", job.category, job.interval)
+
+        while queue and not self.stopped:
+            next_run, index, job = queue[0]
+            delay = next_run - self.clock()
+            if delay > 0:
+                # 可被stop()打断的等待
+                self._stop_event.wait(delay)
+                continue
+
+            heapq.heappop(queue)
+            self.run_job(job)
+
+            missed = job.schedule_next(self.clock(), self.jitter)
+            if missed:
+                SCHEDULER_RUNS.inc(missed, category=job.category, result="missed")
+                self.logger.warning("分类 '%s' 上次运行超时，跳过 %s 次计划运行", job.category, missed)
+            heapq.heappush(queue, (job.next_run, index, job))
+
+        self.logger.info("调度器已停止")
+
+    def run_once(self):
+        """每个分类立即运行一次，用于测试或手动触发"""
+        for job in self.jobs:
+            if self.stopped:
+                break
+            self.run_job(job)
+
+    def run_job(self, job: CategoryJob):
+        """
+        运行一次分类任务：增量爬取，必要时分析并保存报告
+
+        Args:
+            job: 分类调度状态
+        """
+        job.runs += 1
+        try:
+            with timed("scheduler.crawl"):
+                articles = self.crawl_new(job.category)
+        except Exception as e:
+            SCHEDULER_RUNS.inc(category=job.category, result="failed")
+            self.logger.error("分类 '%s' 爬取出错: %s", job.category, e)
+            return
+
+        SCHEDULER_RUNS.inc(category=job.category, result="crawled")
+        now = self.clock()
+        job.add_articles(articles, now, self.max_analyze_articles)
+        self.logger.info(
+            "分类 '%s' 新增 %s 篇文章，待分析 %s 篇",
+            job.category, len(articles), len(job.pending)
+        )
+
+        if self.analyzer is None or not job.should_analyze(now, self.min_new_articles, self.max_pending_age):
+            return
+
+        try:
+            with timed("scheduler.analyze"):
+                result = self.reporters[job.category].run(job.pending)
+        except Exception as e:
+            result = None
+            self.logger.error("分类 '%s' 分析出错: %s", job.category, e)
+
+        if result is None:
+            # 保留待分析文章，下次运行时重试
+            SCHEDULER_RUNS.inc(category=job.category, result="analyze_failed")
+            return
+
+        job.clear_pending()
+        if result.path is None:
+            # 重启后爬到的文章可能已在之前的报告中分析过
+            self.logger.info("分类 '%s' 的待分析文章都已在之前的报告中分析过", job.category)
+            return
+
+        SCHEDULER_RUNS.inc(category=job.category, result="reported")
+        job.reports += 1
+        self.logger.info("分类 '%s' 的增量报告已保存到: %s", job.category, result.path)
+
+    def crawl_new(self, category: str) -> List[Article]:
+        """
+        增量爬取：只下载之前没有成功爬取过的文章，失败或超时的URL下次运行时重试
+
+        Args:
+            category: 分类名称
+
+        Returns:
+            List[Article]: 新文章列表
+        """
+        category_url = self.scraper.get_categories()[category]
+        urls = self.scraper.get_article_urls(category_url, limit=self.crawl_limit)
+        new_urls = [url for url in urls if url not in self.scraper.scraped_urls]
+        self.logger.info("分类 '%s' 发现 %s 个URL，其中 %s 个未爬取过", category, len(urls), len(new_urls))
+        if not new_urls:
+            return []
+        return self.scraper.scrape_articles(new_urls, category)
+
+    def close(self):
+        """释放爬虫持有的资源"""
+        self.scraper.close()
+
+    def __enter__(self) -> "NewsScheduler":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
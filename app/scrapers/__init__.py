@@ -1,4 +1,28 @@
-from ..scrapers.base_scraper import BaseScraper
-from ..scrapers.sina_scraper import SinaScraper
+from typing import TYPE_CHECKING
 
-__all__ = ['BaseScraper', 'SinaScraper'] 
\ No newline at end of file
+from ..utils.lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from ..scrapers.base_scraper import BaseScraper, CrawlStats
+    from ..scrapers.discovery import BaseDiscovery, SinaRollDiscovery, HtmlDiscovery
+    from ..scrapers.frontier import UrlFrontier
+    from ..scrapers.pipeline import ParsePool
+    from ..scrapers.reextract import Reextractor
+    from ..scrapers.sina_scraper import SinaScraper
+
+# 爬虫依赖requests和bs4，子模块在首次访问时才导入
+_EXPORTS = {
+    'BaseScraper': ('base_scraper', 'BaseScraper'),
+    'CrawlStats': ('base_scraper', 'CrawlStats'),
+    'BaseDiscovery': ('discovery', 'BaseDiscovery'),
+    'SinaRollDiscovery': ('discovery', 'SinaRollDiscovery'),
+    'HtmlDiscovery': ('discovery', 'HtmlDiscovery'),
+    'UrlFrontier': ('frontier', 'UrlFrontier'),
+    'ParsePool': ('pipeline', 'ParsePool'),
+    'Reextractor': ('reextract', 'Reextractor'),
+    'SinaScraper': ('sina_scraper', 'SinaScraper')
+}
+
+__all__ = list(_EXPORTS)
+
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS, globals())
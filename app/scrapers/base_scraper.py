@@ -4,10 +4,49 @@
 """
 
 from abc import ABC, abstractmethod
-from typing import List, Dict, Optional
+from typing import AsyncIterator, Dict, Iterator, List, Optional
 
+from ..config.settings import STREAM_PREFETCH
 from ..models.article import Article
+from ..utils.deadline import Deadline
 from ..utils.logger import logger
+from ..utils.streaming import aprefetch, prefetch
+from ..utils.timing import timed
+
+
+class CrawlStats:
+    """一次分类爬取的结果统计，截止时间到达时说明结果缺了多少"""
+    
+    def __init__(self, requested: int = 0):
+        """
+        初始化统计
+        
+        Args:
+            requested: 请求爬取的文章数
+        """
+        self.requested = requested
+        self.found = 0
+        self.fetched = 0
+        self.failed = 0
+        self.timed_out = 0
+        self.deadline_exceeded = False
+        
+    @property
+    def partial(self) -> bool:
+        """是否因截止时间到达而只返回了部分结果"""
+        return self.deadline_exceeded and self.fetched < self.requested
+        
+    def to_dict(self) -> Dict[str, object]:
+        """转换为字典，用于接口响应"""
+        return {
+            "requested": self.requested,
+            "found": self.found,
+            "fetched": self.fetched,
+            "failed": self.failed,
+            "timed_out": self.timed_out,
+            "deadline_exceeded": self.deadline_exceeded,
+            "partial": self.partial
+        }
 
 
 class BaseScraper(ABC):
@@ -37,13 +76,14 @@ class BaseScraper(ABC):
         pass
         
     @abstractmethod
-    def get_article_urls(self, category_url: str, limit: int = 10) -> List[str]:
+    def get_article_urls(self, category_url: str, limit: int = 10, deadline: Optional[Deadline] = None) -> List[str]:
         """
         获取分类页面中的文章URL列表
         
         Args:
             category_url: 分类页面URL
             limit: 最多获取多少篇文章
+            deadline: 截止时间，到达时返回已经找到的URL
             
         Returns:
             List[str]: 文章URL列表
@@ -51,62 +91,186 @@ class BaseScraper(ABC):
         pass
         
     @abstractmethod
-    def scrape_article(self, url: str, category: str) -> Optional[Article]:
+    def scrape_article(self, url: str, category: str, deadline: Optional[Deadline] = None) -> Optional[Article]:
         """
         爬取单篇文章内容
         
         Args:
             url: 文章URL
             category: 文章分类
+            deadline: 截止时间，到达时放弃并返回None
             
         Returns:
             Optional[Article]: 文章对象，失败则返回None
         """
         pass
         
-    def scrape_category(self, category: str, limit: int = 10) -> List[Article]:
+    def scrape_category(
+        self,
+        category: str,
+        limit: int = 10,
+        deadline: Optional[Deadline] = None,
+        stats: Optional[CrawlStats] = None
+    ) -> List[Article]:
         """
-        爬取某个分类下的所有文章
+        爬取某个分类下的所有文章，等全部完成后一次返回
         
         Args:
             category: 分类名称
             limit: 最多爬取多少篇文章
+            deadline: 截止时间，到达时放弃未完成的文章，返回已经爬好的
+            stats: 传入时记录请求、爬到、失败和超时的文章数
             
         Returns:
             List[Article]: 文章对象列表
         """
-        self.logger.info(f"爬取分类 '{category}'")
-        articles = []
+        return list(self.iter_category(category, limit=limit, prefetch_size=0, deadline=deadline, stats=stats))
+        
+    def iter_category(
+        self,
+        category: str,
+        limit: int = 10,
+        prefetch_size: int = STREAM_PREFETCH,
+        deadline: Optional[Deadline] = None,
+        stats: Optional[CrawlStats] = None
+    ) -> Iterator[Article]:
+        """
+        流式爬取某个分类下的文章，每提取完一篇就返回一篇
+        
+        Args:
+            category: 分类名称
+            limit: 最多爬取多少篇文章
+            prefetch_size: 后台线程最多提前爬好的文章数，消费者处理慢时爬取随之暂停；
+                为0时不使用后台线程，每次取下一篇时才爬取
+            deadline: 截止时间，到达时放弃未完成的文章并结束
+            stats: 传入时记录请求、爬到、失败和超时的文章数，迭代结束后有效
+            
+        Returns:
+            Iterator[Article]: 文章对象
+        """
+        return prefetch(
+            self._iter_category(category, limit, deadline, stats), prefetch_size, name=f"{self.name}-stream"
+        )
+        
+    def aiter_category(
+        self,
+        category: str,
+        limit: int = 10,
+        prefetch_size: int = STREAM_PREFETCH,
+        deadline: Optional[Deadline] = None,
+        stats: Optional[CrawlStats] = None
+    ) -> AsyncIterator[Article]:
+        """
+        异步流式爬取某个分类下的文章，爬取在后台线程中进行，不阻塞事件循环
+        
+        Args:
+            category: 分类名称
+            limit: 最多爬取多少篇文章
+            prefetch_size: 最多提前爬好的文章数(至少为1)
+            deadline: 截止时间，到达时放弃未完成的文章并结束
+            stats: 传入时记录请求、爬到、失败和超时的文章数，迭代结束后有效
+            
+        Returns:
+            AsyncIterator[Article]: 文章对象
+        """
+        return aprefetch(
+            self._iter_category(category, limit, deadline, stats), prefetch_size, name=f"{self.name}-astream"
+        )
+        
+    def _iter_category(
+        self,
+        category: str,
+        limit: int,
+        deadline: Optional[Deadline] = None,
+        stats: Optional[CrawlStats] = None
+    ) -> Iterator[Article]:
+        """获取分类下的文章URL并逐篇爬取，出错时记录日志并结束"""
+        self.logger.info("爬取分类 '%s'", category)
+        if stats is None:
+            stats = CrawlStats()
+        stats.requested = limit
         
         try:
             # 获取分类URL
             categories = self.get_categories()
             if category not in categories:
-                self.logger.error(f"不支持的分类: {category}")
-                self.logger.info(f"支持的分类: {', '.join(categories.keys())}")
-                return []
+                self.logger.error("不支持的分类: %s", category)
+                self.logger.info("支持的分类: %s", ', '.join(categories.keys()))
+                return
                 
             category_url = categories[category]
             
             # 获取文章URL列表
-            article_urls = self.get_article_urls(category_url, limit=limit)
-            self.logger.info(f"在分类 '{category}' 中找到 {len(article_urls)} 篇文章")
+            article_urls = self.get_article_urls(category_url, limit=limit, deadline=deadline)
+            stats.found = len(article_urls)
+            self.logger.info("在分类 '%s' 中找到 %s 篇文章", category, len(article_urls))
             
             if not article_urls:
-                self.logger.warning(f"未找到任何文章URL")
-                return []
+                self.logger.warning("未找到任何文章URL")
+                return
                 
             # 爬取每篇文章
-            for article_url in article_urls:
-                try:
-                    article = self.scrape_article(article_url, category)
-                    if article:
-                        articles.append(article)
-                        self.logger.info(f"成功爬取文章: {article.title[:20]}...")
-                except Exception as e:
-                    self.logger.error(f"爬取文章出错 {article_url}: {e}")
+            yield from self.iter_articles(article_urls, category, deadline=deadline, stats=stats)
                     
         except Exception as e:
-            self.logger.error(f"爬取分类出错 '{category}': {e}")
+            self.logger.error("爬取分类出错 '%s': %s", category, e)
+        finally:
+            if deadline is not None and deadline.expired:
+                stats.deadline_exceeded = True
+                self.logger.warning(
+                    "分类 '%s' 爬取超过截止时间(%s秒)，返回 %s/%s 篇文章，%s 篇未完成",
+                    category, deadline.seconds, stats.fetched, stats.requested, stats.timed_out
+                )
+        
+    def scrape_articles(self, article_urls: List[str], category: str) -> List[Article]:
+        """
+        爬取一批文章，等全部完成后一次返回
+        
+        Args:
+            article_urls: 文章URL列表
+            category: 文章分类
             
-        return articles 
\ No newline at end of file
+        Returns:
+            List[Article]: 成功爬取的文章对象列表
+        """
+        return list(self.iter_articles(article_urls, category))
+        
+    def iter_articles(
+        self,
+        article_urls: List[str],
+        category: str,
+        deadline: Optional[Deadline] = None,
+        stats: Optional[CrawlStats] = None
+    ) -> Iterator[Article]:
+        """
+        逐篇爬取一批文章，默认依次调用scrape_article，子类可覆盖以并行处理
+        
+        Args:
+            article_urls: 文章URL列表
+            category: 文章分类
+            deadline: 截止时间，到达后剩余的文章不再爬取
+            stats: 传入时累计爬到、失败和超时的文章数
+            
+        Returns:
+            Iterator[Article]: 成功爬取的文章对象
+        """
+        if stats is None:
+            stats = CrawlStats()
+        for index, article_url in enumerate(article_urls):
+            if deadline is not None and deadline.expired:
+                stats.timed_out += len(article_urls) - index
+                return
+            try:
+                with timed("scrape_article"):
+                    article = self.scrape_article(article_url, category, deadline=deadline)
+            except Exception as e:
+                self.logger.error("爬取文章出错 %s: %s", article_url, e)
+                article = None
+            if article:
+                stats.fetched += 1
+                self.logger.info("成功爬取文章: %s...", article.title[:20])
+                yield article
+            elif deadline is not None and deadline.expired:
+                stats.timed_out += 1
+            else:
+                stats.failed += 1 
\ No newline at end of file
@@ -0,0 +1,243 @@
+#!/usr/bin/env python
+"""
+文章URL发现策略模块
+"""
+
+import re
+from abc import ABC, abstractmethod
+from typing import List, Dict, Optional
+
+from ..config.settings import (
+    MAX_RETRIES,
+    SINA_ROLL_API_URL,
+    SINA_ROLL_PAGE_SIZE,
+    SINA_ROLL_MAX_PAGES,
+    SINA_ROLL_PAGE_DELAY,
+    SINA_ROLL_FEEDS
+)
+from ..utils.deadline import Deadline
+from ..utils.http import make_request, get_soup
+from ..utils.logger import logger
+
+
+# 新浪文章页URL特征
+ARTICLE_URL_PATTERN = re.compile(r'(/doc-i|/article_|/n_|\?id=|/\d{4}-\d{2}-\d{2}/)')
+
+
+def is_sina_article_url(url: str) -> bool:
+    """
+    判断URL是否像新浪的文章内容页
+
+    Args:
+        url: 待判断的URL
+
+    Returns:
+        bool: 是否为文章页URL
+    """
+    return ('sina.com.cn' in url or 'sinaimg.cn' in url) and bool(ARTICLE_URL_PATTERN.search(url))
+
+
+class BaseDiscovery(ABC):
+    """
+    URL发现策略基类
+    每种策略负责从某个分类中找出候选文章URL
+    """
+
+    def __init__(self, name: str = "base_discovery"):
+        """
+        初始化发现策略
+
+        Args:
+            name: 策略名称
+        """
+        self.name = name
+        self.logger = logger
+
+    @abstractmethod
+    def discover(self, category_url: str, limit: int = 10, deadline: Optional[Deadline] = None) -> List[str]:
+        """
+        发现分类下的文章URL
+
+        Args:
+            category_url: 分类页面URL
+            limit: 最多返回多少个URL
+            deadline: 截止时间，到达时返回已经找到的URL
+
+        Returns:
+            List[str]: 去重后的文章URL列表，策略不适用时返回空列表
+        """
+        pass
+
+
+class SinaRollDiscovery(BaseDiscovery):
+    """基于新浪滚动新闻JSON接口的URL发现策略，按页游标翻页"""
+
+    def __init__(
+        self,
+        feeds: Optional[Dict[str, Dict[str, int]]] = None,
+        page_size: int = SINA_ROLL_PAGE_SIZE,
+        max_pages: int = SINA_ROLL_MAX_PAGES
+    ):
+        """
+        初始化滚动接口发现策略
+
+        Args:
+            feeds: 分类URL到接口参数(pageid/lid)的映射
+            page_size: 每页条数
+            max_pages: 最多翻页数
+        """
+        super().__init__(name="sina_roll")
+        self.feeds = feeds if feeds is not None else SINA_ROLL_FEEDS
+        self.page_size = page_size
+        self.max_pages = max_pages
+
+    def fetch_page(self, feed: Dict[str, int], page: int, deadline: Optional[Deadline] = None) -> Optional[List[dict]]:
+        """
+        获取滚动接口的一页数据
+
+        Args:
+            feed: 接口参数(pageid/lid)
+            page: 页码，从1开始
+            deadline: 截止时间
+
+        Returns:
+            Optional[List[dict]]: 该页的新闻条目，请求或解析失败则返回None
+        """
+        params = dict(feed)
+        params.update({"num": self.page_size, "page": page})
+
+        response = make_request(
+            SINA_ROLL_API_URL,
+            params=params,
+            max_retries=MAX_RETRIES,
+            delay_range=SINA_ROLL_PAGE_DELAY,
+            deadline=deadline
+        )
+        if not response:
+            return None
+
+        try:
+            result = response.json().get("result", {})
+        except ValueError as e:
+            self.logger.error("滚动接口返回的不是有效JSON: %s", e)
+            return None
+
+        status = result.get("status", {})
+        if status.get("code", 0) != 0:
+            self.logger.warning("滚动接口返回错误: %s", status.get('msg'))
+            return None
+
+        return result.get("data") or []
+
+    def discover(self, category_url: str, limit: int = 10, deadline: Optional[Deadline] = None) -> List[str]:
+        """
+        通过滚动接口翻页发现文章URL
+
+        Args:
+            category_url: 分类页面URL
+            limit: 最多返回多少个URL
+            deadline: 截止时间，到达时不再翻页
+
+        Returns:
+            List[str]: 文章URL列表
+        """
+        feed = self.feeds.get(category_url)
+        if not feed:
+            self.logger.debug("分类未配置滚动接口: %s", category_url)
+            return []
+
+        urls = []
+        seen = set()
+
+        for page in range(1, self.max_pages + 1):
+            items = self.fetch_page(feed, page, deadline)
+            if not items:
+                break
+
+            new_count = 0
+            for item in items:
+                url = (item.get("url") or "").strip()
+                if not url or url in seen or not is_sina_article_url(url):
+                    continue
+                seen.add(url)
+                urls.append(url)
+                new_count += 1
+                if len(urls) >= limit:
+                    break
+
+            self.logger.debug("滚动接口第%s页得到 %s 个新URL", page, new_count)
+
+            # 条目不足一页或整页都是重复条目，说明已经翻到底了
+            if len(urls) >= limit or len(items) < self.page_size or new_count == 0:
+                break
+
+        self.logger.info("滚动接口找到 %s 篇文章: %s", len(urls), category_url)
+        return urls
+
+
+class HtmlDiscovery(BaseDiscovery):
+    """基于分类首页HTML的URL发现策略，作为JSON接口不可用时的回退"""
+
+    # 常见的新闻列表选择器
+    LIST_SELECTORS = [
+        ".news-item", ".news-card", ".list-a", ".list-mod",
+        ".feed-card", ".main-list", ".article-list", ".news-list",
+        ".seo_data_list", ".news-2"
+    ]
+
+    def __init__(self):
+        """初始化HTML发现策略"""
+        super().__init__(name="html")
+
+    @staticmethod
+    def _normalize_url(url: str, category_url: str) -> Optional[str]:
+        """处理相对URL，非HTTP链接返回None"""
+        if url.startswith('/'):
+            base_domain = '/'.join(category_url.split('/')[:3])  # 如 https://news.sina.com.cn
+            return base_domain + url
+        if not url.startswith('http'):
+            return None
+        return url
+
+    def discover(self, category_url: str, limit: int = 10, deadline: Optional[Deadline] = None) -> List[str]:
+        """
+        解析分类首页中的链接发现文章URL
+
+        Args:
+            category_url: 分类页面URL
+            limit: 最多返回多少个URL
+            deadline: 截止时间
+
+        Returns:
+            List[str]: 文章URL列表
+        """
+        soup = get_soup(category_url, max_retries=MAX_RETRIES, deadline=deadline)
+        if not soup:
+            self.logger.error("无法获取分类页面: %s", category_url)
+            return []
+
+        urls = []
+
+        # 查找新闻链接，筛选出新浪域名下的内容页URL
+        for link in soup.find_all('a', href=True):
+            url = self._normalize_url(link.get('href', '').strip(), category_url)
+            if url and is_sina_article_url(url) and url not in urls:
+                urls.append(url)
+                if len(urls) >= limit:
+                    return urls
+
+        # 如果没找到足够的链接，尝试一些常见的新闻列表选择器
+        for selector in self.LIST_SELECTORS:
+            for item in soup.select(selector):
+                for link in item.select("a"):
+                    url = link.get('href', '').strip()
+                    if not url:
+                        continue
+                    url = self._normalize_url(url, category_url)
+                    if url and url not in urls:
+                        urls.append(url)
+                        if len(urls) >= limit:
+                            return urls
+
+        self.logger.info("HTML页面找到 %s 篇文章: %s", len(urls), category_url)
+        return urls
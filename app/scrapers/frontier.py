@@ -0,0 +1,218 @@
+#!/usr/bin/env python
+"""
+URL优先级队列(Frontier)模块
+"""
+
+import heapq
+import itertools
+import re
+import threading
+from collections import OrderedDict
+from datetime import date
+from typing import Dict, Iterable, List, Optional, Set, Union
+
+from ..config.settings import (
+    FRONTIER_FRESHNESS_HALF_LIFE,
+    FRONTIER_UNKNOWN_FRESHNESS,
+    FRONTIER_SEEN_PENALTY,
+    FRONTIER_SECTION_WEIGHTS,
+    SEEN_URLS_MAX
+)
+
+
+# URL路径中的日期，如 /2025-05-08/ 或 /20250508/
+URL_DATE_PATTERN = re.compile(r'/(20\d{2})-?(\d{2})-?(\d{2})/')
+
+
+def extract_url_date(url: str) -> Optional[date]:
+    """
+    提取URL路径中嵌入的日期
+
+    Args:
+        url: 文章URL
+
+    Returns:
+        Optional[date]: URL中的日期，没有或不合法则返回None
+    """
+    match = URL_DATE_PATTERN.search(url)
+    if not match:
+        return None
+    try:
+        return date(*map(int, match.groups()))
+    except ValueError:
+        return None
+
+
+class RecentUrlSet:
+    """
+    只保留最近加入的max_size个URL的集合，超出时淘汰最早加入的，
+    供常驻进程记录已爬取的URL而不无限增长
+    """
+
+    def __init__(self, max_size: int = SEEN_URLS_MAX):
+        """
+        初始化集合
+
+        Args:
+            max_size: 最多保留的URL数
+        """
+        self.max_size = max(max_size, 1)
+        self._urls: "OrderedDict[str, None]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __contains__(self, url: str) -> bool:
+        return url in self._urls
+
+    def __len__(self) -> int:
+        return len(self._urls)
+
+    def add(self, url: str):
+        """加入URL，已存在时视为最近加入"""
+        with self._lock:
+            self._urls[url] = None
+            self._urls.move_to_end(url)
+            while len(self._urls) > self.max_size:
+                self._urls.popitem(last=False)
+
+    def discard(self, url: str):
+        """移除URL"""
+        with self._lock:
+            self._urls.pop(url, None)
+
+
+class UrlFrontier:
+    """
+    基于堆的URL优先级队列
+    按新鲜度、栏目权重和是否已爬取过为URL打分，分数高的先出队；
+    入队时去重，push/pop均为O(log n)
+    """
+
+    _REMOVED = object()
+
+    def __init__(
+        self,
+        seen: Optional[Union[Set[str], RecentUrlSet]] = None,
+        section_weights: Optional[Dict[str, float]] = None,
+        today: Optional[date] = None
+    ):
+        """
+        初始化Frontier
+
+        Args:
+            seen: 已经爬取过的URL集合，这些URL会被降权
+            section_weights: URL片段到权重的映射
+            today: 计算新鲜度的基准日期，默认为今天
+        """
+        self.seen = seen if seen is not None else set()
+        self.section_weights = section_weights if section_weights is not None else FRONTIER_SECTION_WEIGHTS
+        self.today = today or date.today()
+        self._heap = []
+        self._entries = {}
+        self._counter = itertools.count()
+
+    def score(self, url: str, boost: float = 0.0) -> float:
+        """
+        计算URL的优先级分数
+
+        Args:
+            url: 文章URL
+            boost: 额外加分(如来自更可靠的发现策略)
+
+        Returns:
+            float: 分数，越高越优先
+        """
+        url_date = extract_url_date(url)
+        if url_date is None:
+            freshness = FRONTIER_UNKNOWN_FRESHNESS
+        else:
+            age_days = max((self.today - url_date).days, 0)
+            freshness = 0.5 ** (age_days / FRONTIER_FRESHNESS_HALF_LIFE)
+
+        section = sum(weight for fragment, weight in self.section_weights.items() if fragment in url)
+        penalty = FRONTIER_SEEN_PENALTY if url in self.seen else 0.0
+
+        return freshness + section + boost - penalty
+
+    def push(self, url: str, boost: float = 0.0) -> bool:
+        """
+        将URL加入队列，重复的URL只保留分数最高的一次
+
+        Args:
+            url: 文章URL
+            boost: 额外加分
+
+        Returns:
+            bool: 是否新加入或提升了优先级
+        """
+        score = self.score(url, boost)
+        existing = self._entries.get(url)
+        if existing is not None:
+            if -existing[0] >= score:
+                return False
+            # 惰性删除旧条目，出队时跳过
+            existing[-1] = self._REMOVED
+
+        entry = [-score, next(self._counter), url]
+        self._entries[url] = entry
+        heapq.heappush(self._heap, entry)
+        return True
+
+    def extend(self, urls: Iterable[str], boost: float = 0.0) -> int:
+        """
+        批量加入URL
+
+        Args:
+            urls: URL列表
+            boost: 额外加分
+
+        Returns:
+            int: 新加入的URL数量
+        """
+        return sum(1 for url in urls if self.push(url, boost))
+
+    def pop(self) -> Optional[str]:
+        """
+        取出分数最高的URL
+
+        Returns:
+            Optional[str]: URL，队列为空则返回None
+        """
+        while self._heap:
+            _, _, url = heapq.heappop(self._heap)
+            if url is not self._REMOVED:
+                del self._entries[url]
+                return url
+        return None
+
+    def pop_best(self, n: int) -> List[str]:
+        """
+        取出分数最高的n个URL
+
+        Args:
+            n: 数量
+
+        Returns:
+            List[str]: 按分数从高到低排列的URL列表
+        """
+        urls = []
+        while len(urls) < n:
+            url = self.pop()
+            if url is None:
+                break
+            urls.append(url)
+        return urls
+
+    def mark_seen(self, url: str):
+        """
+        标记URL已爬取，之后再加入时会被降权
+
+        Args:
+            url: 文章URL
+        """
+        self.seen.add(url)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, url: str) -> bool:
+        return url in self._entries
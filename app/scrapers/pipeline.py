@@ -0,0 +1,221 @@
+#!/usr/bin/env python
+"""
+多进程解析与提取流水线模块
+"""
+
+import time
+from concurrent.futures import ProcessPoolExecutor, Future, TimeoutError as FutureTimeoutError
+from typing import Iterable, Iterator, List, Optional, Tuple, Type
+
+from bs4 import BeautifulSoup
+
+from ..config.settings import PARSE_WORKERS, PARSE_CHUNK_SIZE
+from ..extractors.base_extractor import BaseExtractor
+from ..extractors.sina_extractor import SinaExtractor
+from ..models.article import Article
+from ..utils.charset import decode_html
+from ..utils.deadline import Deadline
+from ..utils.logger import logger, attach_worker_queue, start_worker_log_forwarding
+from ..utils.timing import is_timing_enabled, registry as timing_registry
+
+
+# (URL, 原始响应字节, 分类)
+Page = Tuple[str, bytes, str]
+
+# 提交给工作进程的页面：(URL, 原始响应字节, 分类, Content-Type响应头)
+_Job = Tuple[str, bytes, str, Optional[str]]
+
+# 工作进程内的状态，由_init_worker在每个进程启动时初始化一次
+_worker_extractor: Optional[BaseExtractor] = None
+_worker_parser = "html5lib"
+_worker_source = ""
+
+
+def _init_worker(extractor_class: Type[BaseExtractor], parser: str, source: str, log_queue):
+    """工作进程初始化：创建提取器，使导入和初始化开销每个进程只付一次"""
+    global _worker_extractor, _worker_parser, _worker_source
+    attach_worker_queue(log_queue)
+    _worker_extractor = extractor_class()
+    _worker_parser = parser
+    _worker_source = source
+
+
+def _extract_chunk(pages: List[_Job]) -> Tuple[List[Optional[dict]], List[Tuple[str, float, int]]]:
+    """
+    在工作进程中解析并提取一批页面
+
+    Args:
+        pages: 页面列表，带有下载时的Content-Type响应头
+
+    Returns:
+        Tuple: 与输入一一对应的文章字典(提取失败的位置为None)，
+            以及(阶段, 耗时, 字节数)形式的计时记录，由主进程汇总
+    """
+    results = []
+    timings = []
+    for url, content, category, content_type in pages:
+        try:
+            start = time.perf_counter()
+            # 与顺序爬取一样优先按响应头中的charset解码，没有时再按<meta charset>和域名记住的编码
+            soup = BeautifulSoup(decode_html(content, content_type, url), _worker_parser)
+            parsed = time.perf_counter()
+            article = _worker_extractor.extract_article(soup, url, category, _worker_source)
+            timings.append(("parse", parsed - start, len(content)))
+            timings.append(("extract", time.perf_counter() - parsed, 0))
+            results.append(article.to_dict() if article else None)
+        except Exception as e:
+            logger.error("解析文章出错 %s: %s", url, e)
+            results.append(None)
+    return results, timings
+
+
+class ParsePool:
+    """
+    基于ProcessPoolExecutor的解析提取阶段
+    页面按块提交以摊薄进程间通信开销，工作进程在多次调用之间复用
+    """
+
+    def __init__(
+        self,
+        workers: int = PARSE_WORKERS,
+        chunk_size: int = PARSE_CHUNK_SIZE,
+        extractor_class: Type[BaseExtractor] = SinaExtractor,
+        parser: str = "html5lib",
+        source: str = "新浪新闻"
+    ):
+        """
+        初始化解析进程池
+
+        Args:
+            workers: 工作进程数
+            chunk_size: 每次提交给工作进程的页面数
+            extractor_class: 工作进程中使用的提取器类
+            parser: BeautifulSoup解析器
+            source: 文章来源
+        """
+        self.workers = max(workers, 1)
+        self.chunk_size = max(chunk_size, 1)
+        self.extractor_class = extractor_class
+        self.parser = parser
+        self.source = source
+        self.logger = logger
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._buffer: List[_Job] = []
+        # (已提交的块, 块中的页面数)
+        self._pending: List[Tuple[Future, int]] = []
+        # 因截止时间到达而放弃的页面数，累计
+        self.dropped = 0
+        self._log_listener = None
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        """懒创建进程池"""
+        if self._executor is None:
+            self.logger.debug("启动解析进程池，进程数: %s", self.workers)
+            log_queue, self._log_listener = start_worker_log_forwarding()
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                initializer=_init_worker,
+                initargs=(self.extractor_class, self.parser, self.source, log_queue)
+            )
+        return self._executor
+
+    def submit(self, url: str, content: bytes, category: str, content_type: Optional[str] = None):
+        """
+        提交一个待解析页面，攒满一块后才真正发送给工作进程
+
+        Args:
+            url: 文章URL
+            content: 原始响应字节
+            category: 文章分类
+            content_type: Content-Type响应头，用于确定页面编码
+        """
+        self._buffer.append((url, content, category, content_type))
+        if len(self._buffer) >= self.chunk_size:
+            self.flush()
+
+    def flush(self):
+        """把缓冲区中不足一块的页面也发送给工作进程"""
+        if self._buffer:
+            self._pending.append((self._get_executor().submit(_extract_chunk, self._buffer), len(self._buffer)))
+            self._buffer = []
+
+    def results(self, deadline: Optional[Deadline] = None) -> Iterator[Article]:
+        """
+        等待所有已提交的页面处理完成，按提交顺序逐个返回文章
+
+        Args:
+            deadline: 截止时间，到达时取消还没处理完的块，其中的页面计入dropped
+
+        Returns:
+            Iterator[Article]: 提取成功的文章
+        """
+        self.flush()
+        pending, self._pending = self._pending, []
+        for index, (future, size) in enumerate(pending):
+            if deadline is not None:
+                try:
+                    future.result(timeout=deadline.remaining())
+                except FutureTimeoutError:
+                    dropped = sum(rest_size for _, rest_size in pending[index:])
+                    for rest, _ in pending[index:]:
+                        rest.cancel()
+                    self.dropped += dropped
+                    self.logger.warning("超过截止时间，放弃 %s 个未解析完的页面", dropped)
+                    return
+                except Exception:
+                    # 出错的块交给_unpack记录
+                    pass
+            yield from self._unpack(future)
+
+    def completed(self) -> Iterator[Article]:
+        """
+        不等待，按提交顺序返回已经处理完的块中的文章
+
+        Returns:
+            Iterator[Article]: 提取成功的文章
+        """
+        while self._pending and self._pending[0][0].done():
+            yield from self._unpack(self._pending.pop(0)[0])
+
+    def _unpack(self, future: Future) -> Iterator[Article]:
+        """取出一块的结果并记录工作进程中的阶段耗时"""
+        try:
+            payloads, timings = future.result()
+        except Exception as e:
+            self.logger.error("解析进程出错: %s", e)
+            return
+        if is_timing_enabled():
+            for stage, seconds, nbytes in timings:
+                timing_registry.record(stage, seconds, nbytes)
+        for payload in payloads:
+            if payload:
+                yield Article.from_dict(payload)
+
+    def map(self, pages: Iterable[Page]) -> List[Article]:
+        """
+        解析一批页面
+
+        Args:
+            pages: 页面列表
+
+        Returns:
+            List[Article]: 提取成功的文章列表
+        """
+        for url, content, category in pages:
+            self.submit(url, content, category)
+        return list(self.results())
+
+    def shutdown(self):
+        """关闭进程池"""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+        if self._log_listener is not None:
+            self._log_listener.stop()
+            self._log_listener = None
+
+    def __enter__(self) -> "ParsePool":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.shutdown()
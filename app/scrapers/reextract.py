@@ -0,0 +1,448 @@
+#!/usr/bin/env python
+"""
+离线批量重新提取模块
+
+改进提取器后，对已经下载过的原始页面重新提取，不必重新爬取。
+原始页面可以来自目录、tar归档(流式读取)或zip归档(含基准测试录制的夹具归档)，
+页面按块交给进程池提取，同时在途的块数有上限，结果按提交顺序逐篇写出，
+内存占用与页面总数无关
+"""
+
+import json
+import os
+import re
+import tarfile
+import time
+import zipfile
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from pathlib import Path
+from typing import Deque, Dict, Iterable, Iterator, List, Optional, Tuple, Type, Union
+from urllib.parse import urlparse
+
+from bs4 import BeautifulSoup
+
+from ..config.settings import (
+    SINA_CATEGORIES,
+    SINA_ARTICLE_PATHS,
+    REEXTRACT_WORKERS,
+    REEXTRACT_CHUNK_SIZE,
+    REEXTRACT_MAX_PENDING,
+    REEXTRACT_PROGRESS_INTERVAL
+)
+from ..extractors.base_extractor import BaseExtractor, MIN_CONTENT_LENGTH
+from ..extractors.sina_extractor import SinaExtractor
+from ..models.article import Article
+from ..scrapers.pipeline import Page
+from ..utils.charset import decode_html
+from ..utils.logger import logger, attach_worker_queue, start_worker_log_forwarding
+
+# 统计成功率的字段
+FIELDS = ("title", "content", "published_time", "author")
+
+# 视为原始页面的文件扩展名
+HTML_SUFFIXES = {".html", ".htm", ".shtml", ".xhtml"}
+
+# 从页面开头读取原始URL时扫描的字节数
+_URL_SCAN_BYTES = 64 * 1024
+_CANONICAL_RE = re.compile(
+    rb"<link[^>]+rel=[\"']?canonical[\"']?[^>]+href=[\"']([^\"']+)|"
+    rb"<meta[^>]+property=[\"']og:url[\"'][^>]+content=[\"']([^\"']+)",
+    re.IGNORECASE
+)
+
+# 分类未知时使用的分类名
+UNKNOWN_CATEGORY = "未知"
+
+
+def guess_category(
+    url: str,
+    categories: Optional[Dict[str, str]] = None,
+    article_paths: Optional[Dict[str, str]] = None
+) -> Optional[str]:
+    """
+    推断文章所属分类：先按文章URL前缀和分类页URL中最长的路径前缀匹配，再按唯一匹配的域名
+
+    Args:
+        url: 文章URL
+        categories: 分类名称到分类URL的映射，默认使用SINA_CATEGORIES
+        article_paths: 文章URL前缀到分类名称的映射，默认使用SINA_ARTICLE_PATHS
+
+    Returns:
+        Optional[str]: 分类名称，无法确定时返回None
+    """
+    categories = categories if categories is not None else SINA_CATEGORIES
+    article_paths = article_paths if article_paths is not None else SINA_ARTICLE_PATHS
+    parsed = urlparse(url)
+    host = (parsed.hostname or "").lower()
+    best, best_length = None, -1
+    host_matches = []
+    prefixes = list(categories.items()) + [(name, prefix_url) for prefix_url, name in article_paths.items()]
+    for name, prefix_url in prefixes:
+        prefix_parsed = urlparse(prefix_url)
+        if (prefix_parsed.hostname or "").lower() != host:
+            continue
+        if name not in host_matches:
+            host_matches.append(name)
+        prefix = prefix_parsed.path.rstrip("/")
+        if prefix and parsed.path.startswith(prefix + "/") and len(prefix) > best_length:
+            best, best_length = name, len(prefix)
+    if best is not None:
+        return best
+    return host_matches[0] if len(host_matches) == 1 else None
+
+
+def page_url(content: bytes, fallback: str) -> str:
+    """
+    读取页面中canonical链接或og:url记录的原始URL
+
+    Args:
+        content: 原始页面字节
+        fallback: 页面中没有记录时使用的URL
+
+    Returns:
+        str: 原始URL
+    """
+    match = _CANONICAL_RE.search(content, 0, _URL_SCAN_BYTES)
+    if not match:
+        return fallback
+    return (match.group(1) or match.group(2)).decode("utf-8", "ignore").strip() or fallback
+
+
+def _page(content: bytes, fallback_url: str, category: Optional[str]) -> Page:
+    """组装页面，URL和分类缺失时从页面内容和URL推断"""
+    url = page_url(content, fallback_url)
+    return url, content, category or guess_category(url) or UNKNOWN_CATEGORY
+
+
+def iter_directory(root: Path, category: Optional[str] = None) -> Iterator[Page]:
+    """
+    按路径顺序逐个读取目录(含子目录)中的原始页面
+
+    Args:
+        root: 目录
+        category: 页面分类，为None时按URL推断
+
+    Returns:
+        Iterator[Page]: 页面
+    """
+    for directory, subdirectories, filenames in os.walk(root):
+        subdirectories.sort()
+        for filename in sorted(filenames):
+            path = Path(directory) / filename
+            if path.suffix.lower() not in HTML_SUFFIXES:
+                continue
+            yield _page(path.read_bytes(), path.resolve().as_uri(), category)
+
+
+def iter_tar(path: Path, category: Optional[str] = None) -> Iterator[Page]:
+    """
+    流式读取tar归档(可压缩)中的原始页面，不需要先读取归档目录
+
+    Args:
+        path: tar归档路径
+        category: 页面分类，为None时按URL推断
+
+    Returns:
+        Iterator[Page]: 页面
+    """
+    with tarfile.open(path, "r|*") as tf:
+        for member in tf:
+            if not member.isfile() or Path(member.name).suffix.lower() not in HTML_SUFFIXES:
+                continue
+            f = tf.extractfile(member)
+            if f is not None:
+                yield _page(f.read(), f"file:///{member.name.lstrip('/')}", category)
+
+
+def iter_zip(path: Path, category: Optional[str] = None) -> Iterator[Page]:
+    """
+    读取zip归档中的原始页面
+
+    夹具归档(含index.json，见benchmarks/fixtures.py)只读取状态码为200的HTML响应，
+    URL取自索引；其他zip按文件扩展名读取。正文逐个读取，只有归档目录常驻内存
+
+    Args:
+        path: zip归档路径
+        category: 页面分类，为None时按URL推断
+
+    Returns:
+        Iterator[Page]: 页面
+    """
+    with zipfile.ZipFile(path) as zf:
+        if "index.json" in zf.namelist():
+            index = json.loads(zf.read("index.json").decode("utf-8"))
+            for url, entry in index.items():
+                content_type = next((v for k, v in entry["headers"].items() if k.lower() == "content-type"), "")
+                if entry["status"] != 200 or (content_type and "html" not in content_type.lower()):
+                    continue
+                yield url, zf.read(entry["body"]), category or guess_category(url) or UNKNOWN_CATEGORY
+            return
+
+        for info in zf.infolist():
+            if info.is_dir() or Path(info.filename).suffix.lower() not in HTML_SUFFIXES:
+                continue
+            yield _page(zf.read(info), f"file:///{info.filename.lstrip('/')}", category)
+
+
+def iter_raw_pages(source: Union[str, Path], category: Optional[str] = None) -> Iterator[Page]:
+    """
+    按来源类型读取原始页面
+
+    Args:
+        source: 目录、tar归档(.tar/.tar.gz/.tgz等)或zip归档
+        category: 页面分类，为None时按URL推断
+
+    Returns:
+        Iterator[Page]: 页面
+
+    Raises:
+        ValueError: 来源不存在或不是支持的格式
+    """
+    source = Path(source)
+    if source.is_dir():
+        return iter_directory(source, category)
+    if zipfile.is_zipfile(source):
+        return iter_zip(source, category)
+    if source.is_file() and tarfile.is_tarfile(source):
+        return iter_tar(source, category)
+    raise ValueError(f"不支持的原始页面来源: {source}")
+
+
+class JsonlWriter:
+    """逐行写出文章的JSON Lines文件"""
+
+    def __init__(self, path: Union[str, Path]):
+        """
+        初始化写出器，文件已存在时覆盖
+
+        Args:
+            path: 输出文件路径
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(exist_ok=True, parents=True)
+        self._file = open(self.path, "w", encoding="utf-8")
+
+    def put(self, article: Article):
+        """写出一篇文章"""
+        self._file.write(json.dumps(article.to_dict(), ensure_ascii=False) + "\n")
+
+    def close(self):
+        """关闭文件"""
+        self._file.close()
+
+    def __enter__(self) -> "JsonlWriter":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+class ReextractReport:
+    """一次批量重新提取的统计结果"""
+
+    def __init__(self):
+        self.pages = 0
+        self.articles = 0
+        self.errors = 0
+        self.bytes = 0
+        self.fields = {field: 0 for field in FIELDS}
+        self.elapsed = 0.0
+
+    @property
+    def pages_per_second(self) -> float:
+        """每秒处理的页面数"""
+        return self.pages / self.elapsed if self.elapsed > 0 else 0.0
+
+    def field_rates(self) -> Dict[str, float]:
+        """各字段的提取成功率"""
+        return {field: round(count / self.pages, 4) if self.pages else 0.0 for field, count in self.fields.items()}
+
+    def to_dict(self) -> dict:
+        """转换为字典"""
+        return {
+            "pages": self.pages,
+            "articles": self.articles,
+            "errors": self.errors,
+            "bytes": self.bytes,
+            "elapsed_s": round(self.elapsed, 3),
+            "pages_per_s": round(self.pages_per_second, 1),
+            "field_success": self.field_rates()
+        }
+
+
+# 工作进程内的状态，由_init_worker在每个进程启动时初始化一次
+_worker_extractor: Optional[BaseExtractor] = None
+_worker_parser = "html5lib"
+_worker_source = ""
+
+
+def _init_worker(extractor_class: Type[BaseExtractor], parser: str, source: str, log_queue=None):
+    """工作进程初始化：创建提取器"""
+    global _worker_extractor, _worker_parser, _worker_source
+    if log_queue is not None:
+        attach_worker_queue(log_queue)
+    _worker_extractor = extractor_class()
+    _worker_parser = parser
+    _worker_source = source
+
+
+def _reextract_chunk(pages: List[Page]) -> List[Tuple[Dict[str, bool], Optional[dict]]]:
+    """
+    在工作进程中提取一批页面的全部字段
+
+    与extract_article不同，标题提取失败时仍会提取其他字段，以便统计每个字段的成功率
+
+    Args:
+        pages: 页面列表
+
+    Returns:
+        List: 与输入一一对应的(各字段是否提取成功, 文章字典)，标题或正文失败时文章字典为None
+    """
+    results = []
+    for url, content, category in pages:
+        try:
+            soup = BeautifulSoup(decode_html(content, url=url), _worker_parser)
+            title = _worker_extractor.extract_title(soup, url)
+            text = _worker_extractor.extract_content(soup, url)
+            published_time = _worker_extractor.extract_publish_time(soup)
+            author = _worker_extractor.extract_author(soup)
+        except Exception as e:
+            logger.error("重新提取出错 %s: %s", url, e)
+            results.append(({}, None))
+            continue
+
+        fields = {
+            "title": bool(title),
+            "content": bool(text) and len(text.strip()) >= MIN_CONTENT_LENGTH,
+            "published_time": published_time is not None,
+            "author": bool(author)
+        }
+        article = None
+        if fields["title"] and fields["content"]:
+            article = Article(
+                title=title,
+                url=url,
+                content=text,
+                source=_worker_source,
+                category=category,
+                published_time=published_time,
+                author=author
+            ).to_dict()
+        results.append((fields, article))
+    return results
+
+
+class Reextractor:
+    """批量重新提取器"""
+
+    def __init__(
+        self,
+        workers: int = REEXTRACT_WORKERS,
+        chunk_size: int = REEXTRACT_CHUNK_SIZE,
+        max_pending: int = REEXTRACT_MAX_PENDING,
+        extractor_class: Type[BaseExtractor] = SinaExtractor,
+        parser: str = "html5lib",
+        source: str = "新浪新闻",
+        progress_interval: float = REEXTRACT_PROGRESS_INTERVAL
+    ):
+        """
+        初始化重新提取器
+
+        Args:
+            workers: 提取进程数，为0时在当前进程内提取
+            chunk_size: 每次提交给工作进程的页面数
+            max_pending: 每个工作进程最多排队的块数，限制读取领先提取的程度
+            extractor_class: 提取器类
+            parser: BeautifulSoup解析器
+            source: 文章来源
+            progress_interval: 输出进度日志的间隔(秒)
+        """
+        self.workers = max(workers, 0)
+        self.chunk_size = max(chunk_size, 1)
+        self.max_pending = max(max_pending, 1) * max(self.workers, 1)
+        self.extractor_class = extractor_class
+        self.parser = parser
+        self.source = source
+        self.progress_interval = progress_interval
+        self.logger = logger
+        self._last_progress = 0.0
+
+    def run(self, pages: Iterable[Page], sink) -> ReextractReport:
+        """
+        提取所有页面并把成功的文章写入sink
+
+        Args:
+            pages: 页面迭代器，逐个读取
+            sink: 带put(article)方法的输出，如JsonlWriter或ArticleStore
+
+        Returns:
+            ReextractReport: 统计结果
+        """
+        report = ReextractReport()
+        start = time.perf_counter()
+        self._last_progress = start
+
+        if self.workers == 0:
+            _init_worker(self.extractor_class, self.parser, self.source)
+            for chunk in self._chunks(pages, report):
+                self._consume(_reextract_chunk(chunk), sink, report, start)
+            report.elapsed = time.perf_counter() - start
+            return report
+
+        log_queue, log_listener = start_worker_log_forwarding()
+        executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            initializer=_init_worker,
+            initargs=(self.extractor_class, self.parser, self.source, log_queue)
+        )
+        pending: Deque[Future] = deque()
+        try:
+            for chunk in self._chunks(pages, report):
+                pending.append(executor.submit(_reextract_chunk, chunk))
+                # 在途的块达到上限时等待最早的块，读取不会无限领先于提取
+                while len(pending) >= self.max_pending:
+                    self._consume(pending.popleft().result(), sink, report, start)
+            while pending:
+                self._consume(pending.popleft().result(), sink, report, start)
+        finally:
+            # 中途出错或被中断时不再执行排队中的块
+            for future in pending:
+                future.cancel()
+            executor.shutdown()
+            log_listener.stop()
+
+        report.elapsed = time.perf_counter() - start
+        return report
+
+    def _chunks(self, pages: Iterable[Page], report: ReextractReport) -> Iterator[List[Page]]:
+        """把页面按chunk_size分块"""
+        chunk = []
+        for page in pages:
+            report.bytes += len(page[1])
+            chunk.append(page)
+            if len(chunk) >= self.chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+    def _consume(self, results: List[Tuple[Dict[str, bool], Optional[dict]]], sink, report: ReextractReport, start: float):
+        """汇总一块的结果并写出文章"""
+        for fields, payload in results:
+            report.pages += 1
+            if not fields:
+                report.errors += 1
+            for field, ok in fields.items():
+                report.fields[field] += 1 if ok else 0
+            if payload:
+                sink.put(Article.from_dict(payload))
+                report.articles += 1
+
+        now = time.perf_counter()
+        if now - self._last_progress >= self.progress_interval:
+            self._last_progress = now
+            self.logger.info(
+                "已处理 %s 个页面，提取出 %s 篇文章，%.1f 页/秒",
+                report.pages, report.articles, report.pages / (now - start)
+            )
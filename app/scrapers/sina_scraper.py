@@ -3,25 +3,65 @@
 新浪新闻爬虫实现
 """
 
-import re
-import random
-import time
-from typing import List, Dict, Optional
+from typing import Dict, Iterator, List, Optional, Type
 
-from ..config.settings import SINA_CATEGORIES, MAX_RETRIES
+from ..config.settings import (
+    SINA_CATEGORIES,
+    MAX_RETRIES,
+    FRONTIER_OVERSAMPLE,
+    FRONTIER_MIN_CANDIDATES,
+    PARSE_WORKERS,
+    EXTRACTOR
+)
+from ..extractors.base_extractor import BaseExtractor
+from ..extractors.density_extractor import DensityExtractor
 from ..extractors.sina_extractor import SinaExtractor
 from ..models.article import Article
-from ..scrapers.base_scraper import BaseScraper
-from ..utils.http import get_soup
+from ..scrapers.base_scraper import BaseScraper, CrawlStats
+from ..scrapers.discovery import BaseDiscovery, SinaRollDiscovery, HtmlDiscovery
+from ..scrapers.frontier import RecentUrlSet, UrlFrontier
+from ..scrapers.pipeline import ParsePool
+from ..utils.charset import decode_html
+from ..utils.deadline import Deadline
+from ..utils.http import get_soup, make_request
+
+# 提取器名称到提取器类的映射
+EXTRACTOR_CLASSES: Dict[str, Type[BaseExtractor]] = {
+    "sina": SinaExtractor,
+    "density": DensityExtractor
+}
 
 
 class SinaScraper(BaseScraper):
     """新浪新闻爬虫实现"""
     
-    def __init__(self):
-        """初始化新浪爬虫"""
+    def __init__(
+        self, 
+        discoveries: Optional[List[BaseDiscovery]] = None,
+        parse_workers: int = PARSE_WORKERS,
+        extractor_class: Optional[Type[BaseExtractor]] = None
+    ):
+        """
+        初始化新浪爬虫
+        
+        Args:
+            discoveries: URL发现策略列表，按顺序尝试，默认先JSON滚动接口再HTML页面
+            parse_workers: 解析进程数，为0时在当前进程内解析
+            extractor_class: 提取器类，默认按配置项EXTRACTOR选择
+        """
         super().__init__(name="sina_scraper")
-        self.extractor = SinaExtractor()
+        extractor_class = extractor_class or EXTRACTOR_CLASSES[EXTRACTOR]
+        self.extractor = extractor_class()
+        self.discoveries = discoveries if discoveries is not None else [
+            SinaRollDiscovery(),
+            HtmlDiscovery()
+        ]
+        # 尝试过的URL(含失败的)，后续发现时会被降权
+        self.seen_urls = RecentUrlSet()
+        # 成功提取出文章的URL，增量爬取时跳过，失败或超时的URL下次仍会重试
+        self.scraped_urls = RecentUrlSet()
+        # 解析进程池，懒启动，在多次爬取之间复用
+        self.parse_pool = ParsePool(workers=parse_workers, extractor_class=extractor_class) if parse_workers > 0 else None
         
     def get_categories(self) -> Dict[str, str]:
         """
@@ -32,92 +72,46 @@ class SinaScraper(BaseScraper):
         """
         return SINA_CATEGORIES
         
-    def get_article_urls(self, category_url: str, limit: int = 10) -> List[str]:
+    def get_article_urls(self, category_url: str, limit: int = 10, deadline: Optional[Deadline] = None) -> List[str]:
         """
         获取分类页面中的文章URL列表
-        
+
+        按顺序尝试各个发现策略(默认先JSON滚动接口，再HTML页面)收集候选URL，
+        放入优先级队列后按新鲜度取出最好的limit个；全部失败时才使用备用URL
+
         Args:
             category_url: 分类页面URL
             limit: 最多获取多少篇文章
+            deadline: 截止时间，到达时不再尝试后续的发现策略
             
         Returns:
-            List[str]: 文章URL列表
+            List[str]: 按优先级排列的文章URL列表
         """
-        self.logger.info(f"获取文章URL: {category_url}")
-        urls = []
-        
-        # 获取分类页面的HTML
-        soup = get_soup(category_url, max_retries=MAX_RETRIES)
-        if not soup:
-            self.logger.error(f"无法获取分类页面: {category_url}")
-            # 备用策略：直接使用预定义的新浪新闻URL模式
-            return self._get_backup_urls(category_url, limit)
-            
-        # 所有链接
-        all_links = []
+        self.logger.info("获取文章URL: %s", category_url)
+        frontier = UrlFrontier(seen=self.seen_urls)
+        candidate_limit = max(limit * FRONTIER_OVERSAMPLE, FRONTIER_MIN_CANDIDATES)
         
-        # 查找新闻链接，筛选出新浪域名下的内容页URL
-        for link in soup.find_all('a', href=True):
-            url = link.get('href', '').strip()
-            
-            # 处理相对URL
-            if url.startswith('/'):
-                base_domain = '/'.join(category_url.split('/')[:3])  # 如 https://news.sina.com.cn
-                url = base_domain + url
-            elif not url.startswith('http'):
+        for discovery in self.discoveries:
+            if deadline is not None and deadline.expired:
+                self.logger.warning("超过截止时间，停止发现URL: %s", category_url)
+                break
+            try:
+                found = discovery.discover(category_url, limit=candidate_limit, deadline=deadline)
+            except Exception as e:
+                self.logger.error("URL发现策略 %s 出错: %s", discovery.name, e)
                 continue
-            
-            # 筛选符合条件的URL
-            if (('sina.com.cn' in url or 'sinaimg.cn' in url) and 
-                any(x in url for x in ['/doc-i', '/article_', '/2025-', '/n_', '?id='])):
-                all_links.append(url)
-        
-        # 如果找到了链接，从中提取不重复的
-        for url in all_links:
-            if url not in urls:
-                urls.append(url)
-                if len(urls) >= limit:
-                    break
-        
-        # 如果没找到足够的链接，尝试一些常见的新闻列表选择器
-        if len(urls) < limit:
-            selectors = [
-                ".news-item", ".news-card", ".list-a", ".list-mod", 
-                ".feed-card", ".main-list", ".article-list", ".news-list",
-                ".seo_data_list", ".news-2"
-            ]
-            
-            for selector in selectors:
-                items = soup.select(selector)
-                for item in items:
-                    links = item.select("a")
-                    for link in links:
-                        url = link.get('href', '').strip()
-                        if not url:
-                            continue
-                            
-                        # 处理相对URL
-                        if url.startswith('/'):
-                            base_domain = '/'.join(category_url.split('/')[:3])
-                            url = base_domain + url
-                        elif not url.startswith('http'):
-                            continue
-                            
-                        if url not in urls:
-                            urls.append(url)
-                            if len(urls) >= limit:
-                                break
-                    if len(urls) >= limit:
-                        break
-                if len(urls) >= limit:
-                    break
+                
+            frontier.extend(found)
+            if len(frontier) >= candidate_limit:
+                break
         
         # 如果我们有一些URL但不够limit，至少返回找到的
-        if not urls:
+        if not frontier:
             return self._get_backup_urls(category_url, limit)
             
-        self.logger.info(f"找到 {len(urls)} 篇文章")
-        return urls[:limit]  # 确保不超过限制
+        urls = frontier.pop_best(limit)
+        self.logger.info("从 %s 个候选中选出 %s 篇文章", len(urls) + len(frontier), len(urls))
+        return urls
     
     def _get_backup_urls(self, category_url: str, limit: int) -> List[str]:
         """
@@ -130,7 +124,7 @@ class SinaScraper(BaseScraper):
         Returns:
             List[str]: 文章URL列表
         """
-        self.logger.warning(f"使用备用URL策略: {category_url}")
+        self.logger.warning("使用备用URL策略: %s", category_url)
         urls = []
         
         # 根据分类URL选择不同的备用URL
@@ -165,53 +159,116 @@ class SinaScraper(BaseScraper):
         
         return urls[:limit]
         
-    def scrape_article(self, url: str, category: str) -> Optional[Article]:
+    def scrape_article(self, url: str, category: str, deadline: Optional[Deadline] = None) -> Optional[Article]:
         """
         爬取单篇文章内容
         
         Args:
             url: 文章URL
             category: 文章分类
+            deadline: 截止时间，到达时放弃并返回None
             
         Returns:
             Optional[Article]: 文章对象，失败则返回None
         """
-        self.logger.info(f"爬取文章: {url}")
+        self.logger.info("爬取文章: %s", url)
+        self.seen_urls.add(url)
         
         # 获取文章页面的HTML
-        soup = get_soup(url, max_retries=MAX_RETRIES)
+        soup = get_soup(url, max_retries=MAX_RETRIES, deadline=deadline)
         if not soup:
-            self.logger.error(f"无法获取文章页面: {url}")
+            self.logger.error("无法获取文章页面: %s", url)
             return None
             
-        # 提取标题
-        title = self.extractor.extract_title(soup)
-        if not title:
-            self.logger.warning(f"无法提取标题: {url}")
-            return None
+        article = self.extractor.extract_article(soup, url, category, source="新浪新闻")
+        if article:
+            article.raw_html = str(soup)
+            self.scraped_urls.add(url)
+        
+        return article
+        
+    def iter_articles(
+        self,
+        article_urls: List[str],
+        category: str,
+        deadline: Optional[Deadline] = None,
+        stats: Optional[CrawlStats] = None
+    ) -> Iterator[Article]:
+        """
+        逐篇爬取一批文章，启用解析进程池时下载在当前进程完成，
+        解析和提取交给工作进程，与后续下载重叠进行，每下载一篇就取回已解析完的文章
+        
+        Args:
+            article_urls: 文章URL列表
+            category: 文章分类
+            deadline: 截止时间，到达后不再下载，也不再等待未解析完的页面
+            stats: 传入时累计爬到、失败和超时的文章数
             
-        # 提取内容
-        content = self.extractor.extract_content(soup)
-        if not content or len(content.strip()) < 50:  # 内容太短可能是提取失败
-            self.logger.warning(f"无法提取内容或内容太短: {url}")
-            return None
+        Returns:
+            Iterator[Article]: 成功爬取的文章对象
+        """
+        if not self.parse_pool:
+            yield from super().iter_articles(article_urls, category, deadline=deadline, stats=stats)
+            return
+            
+        if stats is None:
+            stats = CrawlStats()
+        submitted = 0
+        fetched = 0
+        dropped = self.parse_pool.dropped
+        # 工作进程只传回精简的文章字典，原始HTML由当前进程按下载到的响应补上，不再经进程间传递
+        responses = {}
+        for index, url in enumerate(article_urls):
+            if deadline is not None and deadline.expired:
+                stats.timed_out += len(article_urls) - index
+                break
+            self.logger.info("下载文章: %s", url)
+            self.seen_urls.add(url)
+            response = make_request(url, max_retries=MAX_RETRIES, deadline=deadline)
+            if not response:
+                self.logger.error("无法获取文章页面: %s", url)
+                if deadline is not None and deadline.expired:
+                    stats.timed_out += 1
+                else:
+                    stats.failed += 1
+                continue
+            content_type = response.headers.get("Content-Type")
+            self.parse_pool.submit(url, response.content, category, content_type)
+            responses[url] = (response.content, content_type)
+            submitted += 1
+            if deadline is not None:
+                # 有截止时间时不攒块，页面下载完立即开始解析，时间到时已下载的页面多半已经解析完
+                self.parse_pool.flush()
+            for article in self.parse_pool.completed():
+                fetched += 1
+                stats.fetched += 1
+                self.scraped_urls.add(article.url)
+                self._attach_raw_html(article, responses)
+                self.logger.info("成功爬取文章: %s...", article.title[:20])
+                yield article
+            
+        for article in self.parse_pool.results(deadline):
+            fetched += 1
+            stats.fetched += 1
+            self.scraped_urls.add(article.url)
+            self._attach_raw_html(article, responses)
+            self.logger.info("成功爬取文章: %s...", article.title[:20])
+            yield article
             
-        # 提取发布时间
-        published_time = self.extractor.extract_publish_time(soup)
-        
-        # 提取作者
-        author = self.extractor.extract_author(soup)
-        
-        # 创建文章对象
-        article = Article(
-            title=title,
-            url=url,
-            content=content,
-            source="新浪新闻",
-            category=category,
-            published_time=published_time,
-            author=author,
-            raw_html=str(soup) if soup else None
-        )
-        
-        return article 
\ No newline at end of file
+        dropped = self.parse_pool.dropped - dropped
+        stats.timed_out += dropped
+        stats.failed += submitted - fetched - dropped
+        
+    def _attach_raw_html(self, article: Article, responses: Dict[str, tuple]):
+        """按下载到的响应补上解析进程池返回的文章缺少的原始HTML"""
+        response = responses.pop(article.url, None)
+        if response is None:
+            return
+        content, content_type = response
+        markup = decode_html(content, content_type, article.url)
+        article.raw_html = markup if isinstance(markup, str) else content.decode("utf-8", errors="replace")
+        
+    def close(self):
+        """释放爬虫持有的资源(解析进程池)"""
+        if self.parse_pool:
+            self.parse_pool.shutdown()
@@ -0,0 +1,18 @@
+from typing import TYPE_CHECKING
+
+from ..utils.lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from ..storage.article_store import ArticleStore
+    from ..storage.report_manifest import ReportManifest, ReportRecord, get_report_manifest
+
+_EXPORTS = {
+    'ArticleStore': ('article_store', 'ArticleStore'),
+    'ReportManifest': ('report_manifest', 'ReportManifest'),
+    'ReportRecord': ('report_manifest', 'ReportRecord'),
+    'get_report_manifest': ('report_manifest', 'get_report_manifest')
+}
+
+__all__ = list(_EXPORTS)
+
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS, globals())
@@ -0,0 +1,159 @@
+#!/usr/bin/env python
+"""
+基于SQLite的文章存储
+
+按URL去重保存提取出的文章，重复写入同一URL时覆盖旧结果(重新提取后以新结果为准)。
+写入先进入缓冲区，攒满一批后在一个事务中提交，批量导入时不必每篇文章同步一次磁盘
+"""
+
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Iterator, List, Optional, Union
+
+from ..config.settings import ARTICLE_STORE_BATCH_SIZE
+from ..models.article import Article
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS articles (
+    url TEXT PRIMARY KEY,
+    id TEXT NOT NULL,
+    title TEXT NOT NULL,
+    content TEXT NOT NULL,
+    source TEXT NOT NULL,
+    category TEXT NOT NULL,
+    published_time TEXT,
+    author TEXT,
+    stored_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_articles_category ON articles (category, published_time);
+"""
+
+_COLUMNS = ("url", "id", "title", "content", "source", "category", "published_time", "author")
+
+
+class ArticleStore:
+    """SQLite文章存储"""
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        batch_size: int = ARTICLE_STORE_BATCH_SIZE,
+        busy_timeout: float = 30.0
+    ):
+        """
+        初始化文章存储，数据库文件不存在时自动创建
+
+        Args:
+            path: 数据库文件路径
+            batch_size: 缓冲多少篇文章后提交一次
+            busy_timeout: 等待其他进程释放写锁的最长时间(秒)
+        """
+        self.path = Path(path)
+        self.batch_size = max(batch_size, 1)
+        self.path.parent.mkdir(exist_ok=True, parents=True)
+
+        self._conn = sqlite3.connect(
+            str(self.path), timeout=busy_timeout, isolation_level=None, check_same_thread=False
+        )
+        self._conn.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        self._buffer: List[tuple] = []
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(_SCHEMA)
+
+    def put(self, article: Article):
+        """
+        写入一篇文章，攒满一批后提交
+
+        Args:
+            article: 文章对象
+        """
+        data = article.to_dict()
+        row = tuple(data[column] for column in _COLUMNS) + (time.time(),)
+        with self._lock:
+            self._buffer.append(row)
+            if len(self._buffer) >= self.batch_size:
+                self._flush_locked()
+
+    def flush(self):
+        """提交缓冲区中的文章"""
+        with self._lock:
+            self._flush_locked()
+
+    def _flush_locked(self):
+        if not self._buffer:
+            return
+        rows, self._buffer = self._buffer, []
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            self._conn.executemany(
+                f"INSERT OR REPLACE INTO articles ({', '.join(_COLUMNS)}, stored_at) "
+                f"VALUES ({', '.join('?' * (len(_COLUMNS) + 1))})",
+                rows
+            )
+            self._conn.execute("COMMIT")
+        except Exception:
+            self._conn.execute("ROLLBACK")
+            raise
+
+    def get(self, url: str) -> Optional[Article]:
+        """
+        按URL读取文章
+
+        Args:
+            url: 文章URL
+
+        Returns:
+            Optional[Article]: 文章对象，不存在时返回None
+        """
+        self.flush()
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM articles WHERE url = ?", (url,)).fetchone()
+        return Article.from_dict(dict(row)) if row else None
+
+    def articles(self, category: Optional[str] = None) -> Iterator[Article]:
+        """
+        逐篇读取文章，不一次性载入全部结果
+
+        Args:
+            category: 只读取该分类，为None时读取全部
+
+        Returns:
+            Iterator[Article]: 按发布时间排列的文章
+        """
+        self.flush()
+        # 使用独立的游标逐行读取，迭代期间不持有锁
+        if category is None:
+            cursor = self._conn.execute("SELECT * FROM articles ORDER BY published_time")
+        else:
+            cursor = self._conn.execute(
+                "SELECT * FROM articles WHERE category = ? ORDER BY published_time", (category,)
+            )
+        for row in cursor:
+            yield Article.from_dict(dict(row))
+
+    def count(self, category: Optional[str] = None) -> int:
+        """统计文章数"""
+        self.flush()
+        with self._lock:
+            if category is None:
+                row = self._conn.execute("SELECT COUNT(*) FROM articles").fetchone()
+            else:
+                row = self._conn.execute("SELECT COUNT(*) FROM articles WHERE category = ?", (category,)).fetchone()
+        return row[0]
+
+    def close(self):
+        """提交缓冲区并关闭数据库"""
+        self.flush()
+        with self._lock:
+            self._conn.close()
+
+    def __enter__(self) -> "ArticleStore":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
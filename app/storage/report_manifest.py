@@ -0,0 +1,183 @@
+#!/usr/bin/env python
+"""
+报告清单模块
+
+记录每份已保存报告覆盖的文章ID、生成时间和内容摘要，供增量报告判断哪些文章已经分析过。
+一份完整报告和其后的各份增量报告组成一条链，链上所有报告覆盖的文章都视为已分析；
+生成新的完整报告后，只保留上一条链的记录。清单写成JSON文件，写入时持有文件锁(清单旁的.lock文件)，
+读取、合并、替换作为一个整体完成，Web进程、守护进程和协调者可以共用同一个清单
+"""
+
+import json
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Union
+
+from ..config.settings import REPORT_MANIFEST_PATH
+from ..utils.file import update_json_file
+from ..utils.logger import logger
+
+
+class ReportRecord:
+    """一份已保存报告的记录"""
+
+    def __init__(
+        self,
+        report: str,
+        category: str,
+        created_at: datetime,
+        article_ids: List[str],
+        summary: str,
+        delta: bool = False
+    ):
+        """
+        初始化报告记录
+
+        Args:
+            report: 报告文件名
+            category: 分类
+            created_at: 生成时间
+            article_ids: 本份报告分析的文章ID
+            summary: 报告摘要，增量报告时随新文章一起发给模型
+            delta: 是否是增量报告
+        """
+        self.report = report
+        self.category = category
+        self.created_at = created_at
+        self.article_ids = article_ids
+        self.summary = summary
+        self.delta = delta
+
+    def to_dict(self) -> dict:
+        """将记录转换为字典"""
+        return {
+            "report": self.report,
+            "category": self.category,
+            "created_at": self.created_at.isoformat(),
+            "article_ids": self.article_ids,
+            "summary": self.summary,
+            "delta": self.delta
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "ReportRecord":
+        """从字典恢复记录，与to_dict互逆"""
+        return cls(
+            report=data["report"],
+            category=data["category"],
+            created_at=datetime.fromisoformat(data["created_at"]),
+            article_ids=list(data.get("article_ids", [])),
+            summary=data.get("summary", ""),
+            delta=bool(data.get("delta", False))
+        )
+
+
+class ReportManifest:
+    """按分类记录已保存报告的清单"""
+
+    def __init__(self, path: Union[str, Path] = REPORT_MANIFEST_PATH):
+        """
+        初始化报告清单
+
+        Args:
+            path: 清单文件路径，不存在时在首次记录报告时创建
+        """
+        self.path = Path(path)
+        self.logger = logger
+        self._lock = threading.Lock()
+
+    def _read(self) -> Dict[str, List[ReportRecord]]:
+        """读取清单文件"""
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            self.logger.warning("读取报告清单失败 %s: %s", self.path, e)
+            return {}
+        return {
+            category: [ReportRecord.from_dict(record) for record in records]
+            for category, records in data.items()
+        }
+
+    def records(self, category: str) -> List[ReportRecord]:
+        """
+        读取分类当前链上的报告记录
+
+        Args:
+            category: 分类
+
+        Returns:
+            List[ReportRecord]: 从最近一份完整报告开始、按生成时间排列的记录，没有完整报告时为空
+        """
+        with self._lock:
+            records = self._read().get(category, [])
+        return _current_chain(records)
+
+    def latest(self, category: str) -> Optional[ReportRecord]:
+        """分类最近一份报告的记录，没有时返回None"""
+        records = self.records(category)
+        return records[-1] if records else None
+
+    def covered_ids(self, category: str) -> Set[str]:
+        """分类当前链上各报告已经分析过的文章ID"""
+        return {article_id for record in self.records(category) for article_id in record.article_ids}
+
+    def add(self, record: ReportRecord):
+        """
+        记录一份报告，与文件中的记录合并后原子写回
+
+        Args:
+            record: 报告记录
+        """
+        def merge() -> dict:
+            data = self._read()
+            records = data.setdefault(record.category, [])
+            records.append(record)
+            records.sort(key=lambda item: item.created_at)
+            if not record.delta:
+                # 只保留上一条链，供查看
+                fulls = [index for index, item in enumerate(records) if not item.delta]
+                if len(fulls) > 2:
+                    del records[:fulls[-2]]
+            return {category: [item.to_dict() for item in items] for category, items in data.items()}
+
+        try:
+            # 线程锁保护本进程内的并发写入，文件锁保护其他进程
+            with self._lock:
+                update_json_file(self.path, merge, ensure_ascii=False, indent=2)
+        except OSError as e:
+            self.logger.warning("写入报告清单失败 %s: %s", self.path, e)
+
+
+def _current_chain(records: List[ReportRecord]) -> List[ReportRecord]:
+    """从最近一份完整报告开始的记录"""
+    for index in range(len(records) - 1, -1, -1):
+        if not records[index].delta:
+            return records[index:]
+    return []
+
+
+_manifests: Dict[Path, ReportManifest] = {}
+_manifests_lock = threading.Lock()
+
+
+def get_report_manifest(path: Union[str, Path] = REPORT_MANIFEST_PATH) -> ReportManifest:
+    """
+    获取进程内共享的报告清单，同一路径只创建一个实例
+
+    Args:
+        path: 清单文件路径
+
+    Returns:
+        ReportManifest: 报告清单
+    """
+    key = Path(path).resolve()
+    manifest = _manifests.get(key)
+    if manifest is None:
+        with _manifests_lock:
+            manifest = _manifests.setdefault(key, ReportManifest(key))
+    return manifest
+
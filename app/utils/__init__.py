@@ -1,12 +1,27 @@
+from typing import TYPE_CHECKING
+
+from ..utils.lazy import lazy_exports
+
+# logger与子模块同名，导入子模块会覆盖包属性，因此直接导入；logger模块本身很轻
 from ..utils.logger import logger, setup_logger
-from ..utils.http import get_random_headers, make_request, get_soup
-from ..utils.file import save_report
-
-__all__ = [
-    'logger', 
-    'setup_logger', 
-    'get_random_headers', 
-    'make_request', 
-    'get_soup',
-    'save_report'
-] 
\ No newline at end of file
+
+if TYPE_CHECKING:
+    from ..utils.http import get_random_headers, get_session, make_request, get_soup
+    from ..utils.file import save_report
+    from ..utils.timing import timed, registry as timing_registry, enable_timing
+
+# http模块依赖requests和bs4，子模块在首次访问时才导入
+_EXPORTS = {
+    'get_random_headers': ('http', 'get_random_headers'),
+    'get_session': ('http', 'get_session'),
+    'make_request': ('http', 'make_request'),
+    'get_soup': ('http', 'get_soup'),
+    'save_report': ('file', 'save_report'),
+    'timed': ('timing', 'timed'),
+    'timing_registry': ('timing', 'registry'),
+    'enable_timing': ('timing', 'enable_timing')
+}
+
+__all__ = ['logger', 'setup_logger'] + list(_EXPORTS)
+
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS, globals())
@@ -0,0 +1,207 @@
+#!/usr/bin/env python
+"""
+网页编码识别与解码模块
+
+BeautifulSoup收到字节时会用UnicodeDammit逐个猜测编码，大页面上开销明显。
+这里按代价从低到高确定编码后直接解码，把文本交给BeautifulSoup：
+1. 字节顺序标记(BOM)
+2. HTTP响应头Content-Type中的charset
+3. 页面开头若干KB内的<meta charset>或<meta http-equiv>
+4. 同一域名上次成功使用的编码
+5. UTF-8，再试GB18030
+声明的编码常与实际不符，因此声明的不是UTF-8时先检查内容是否是合法的UTF-8
+(GBK等编码的中文几乎不可能恰好是合法的UTF-8)。
+GB2312/GBK统一按其超集GB18030解码；全部失败时返回原始字节，交给BeautifulSoup自行识别
+"""
+
+import codecs
+import re
+import threading
+from collections import OrderedDict
+from typing import List, Optional, Tuple, Union
+from urllib.parse import urlparse
+
+from ..config.settings import CHARSET_SCAN_BYTES, CHARSET_HOST_CACHE_SIZE
+from ..utils.metrics import CHARSET_RESOLVED, record_cache
+
+# 编码别名，按超集解码以免遇到扩展字符时失败
+_ALIASES = {
+    "gb2312": "gb18030",
+    "gbk": "gb18030",
+    "x-gbk": "gb18030",
+    "cp936": "gb18030",
+    "windows-936": "gb18030",
+    "iso-8859-1": "cp1252",
+    "latin1": "cp1252",
+    "ascii": "utf-8",
+    "us-ascii": "utf-8"
+}
+
+_BOMS = [
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16")
+]
+
+_HEADER_CHARSET_RE = re.compile(r"charset\s*=\s*[\"']?([\w.:-]+)", re.IGNORECASE)
+_META_CHARSET_RE = re.compile(rb"<meta[^>]+?charset\s*=\s*[\"']?\s*([\w.:-]+)", re.IGNORECASE)
+
+# 没有任何线索时依次尝试的编码
+_FALLBACKS = ["utf-8", "gb18030"]
+
+
+def normalize_charset(name: Optional[str]) -> Optional[str]:
+    """
+    规范化编码名称
+
+    Args:
+        name: 响应头或页面中声明的编码名称
+
+    Returns:
+        Optional[str]: Python可用的编码名称，无法识别时返回None
+    """
+    if not name:
+        return None
+    name = name.strip().strip("\"'").lower()
+    name = _ALIASES.get(name, name)
+    try:
+        return codecs.lookup(name).name
+    except LookupError:
+        return None
+
+
+def charset_from_header(content_type: Optional[str]) -> Optional[str]:
+    """从Content-Type响应头中读取charset"""
+    if not content_type:
+        return None
+    match = _HEADER_CHARSET_RE.search(content_type)
+    return normalize_charset(match.group(1)) if match else None
+
+
+def charset_from_meta(content: bytes, scan_bytes: int = CHARSET_SCAN_BYTES) -> Optional[str]:
+    """在页面开头的scan_bytes字节内查找<meta>声明的charset"""
+    match = _META_CHARSET_RE.search(content, 0, scan_bytes)
+    return normalize_charset(match.group(1).decode("ascii", "ignore")) if match else None
+
+
+def charset_from_bom(content: bytes) -> Optional[str]:
+    """根据字节顺序标记确定编码"""
+    for bom, encoding in _BOMS:
+        if content.startswith(bom):
+            return encoding
+    return None
+
+
+class CharsetResolver:
+    """
+    编码识别器，记住每个域名最近一次成功使用的编码
+    """
+
+    def __init__(self, scan_bytes: int = CHARSET_SCAN_BYTES, host_cache_size: int = CHARSET_HOST_CACHE_SIZE):
+        """
+        初始化编码识别器
+
+        Args:
+            scan_bytes: 查找<meta charset>时扫描的字节数
+            host_cache_size: 最多记住的域名数
+        """
+        self.scan_bytes = scan_bytes
+        self.host_cache_size = host_cache_size
+        self._hosts: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def host_default(self, host: str) -> Optional[str]:
+        """读取域名上次成功使用的编码"""
+        with self._lock:
+            encoding = self._hosts.get(host)
+            if encoding is not None:
+                self._hosts.move_to_end(host)
+        record_cache("charset_host", encoding is not None)
+        return encoding
+
+    def learn(self, host: str, encoding: str):
+        """记住域名成功使用的编码"""
+        if not host:
+            return
+        with self._lock:
+            self._hosts[host] = encoding
+            self._hosts.move_to_end(host)
+            while len(self._hosts) > self.host_cache_size:
+                self._hosts.popitem(last=False)
+
+    def candidates(self, content: bytes, content_type: Optional[str], host: str) -> List[Tuple[str, str]]:
+        """
+        按优先级列出候选编码
+
+        Args:
+            content: 原始响应字节
+            content_type: Content-Type响应头
+            host: 域名
+
+        Returns:
+            List[Tuple[str, str]]: (编码, 来源)列表，已去重
+        """
+        found = [
+            (charset_from_bom(content), "bom"),
+            (charset_from_header(content_type), "header"),
+            (charset_from_meta(content, self.scan_bytes), "meta")
+        ]
+        if host:
+            found.append((self.host_default(host), "host"))
+        found.extend((encoding, "fallback") for encoding in _FALLBACKS)
+
+        candidates = []
+        seen = set()
+        for encoding, source in found:
+            if encoding and encoding not in seen:
+                seen.add(encoding)
+                candidates.append((encoding, source))
+        return candidates
+
+    def decode(self, content: bytes, content_type: Optional[str] = None, url: str = "") -> Union[str, bytes]:
+        """
+        把响应字节解码为文本
+
+        Args:
+            content: 原始响应字节
+            content_type: Content-Type响应头
+            url: 页面URL，用于按域名记住编码
+
+        Returns:
+            Union[str, bytes]: 解码后的文本，所有候选编码都失败时返回原始字节
+        """
+        host = (urlparse(url).hostname or "") if url else ""
+        candidates = self.candidates(content, content_type, host)
+        encoding, source = candidates[0]
+        if encoding != "utf-8" and source != "bom" and not content.isascii():
+            candidates.insert(0, ("utf-8", "utf8"))
+        
+        for encoding, source in candidates:
+            try:
+                text = content.decode(encoding)
+            except (UnicodeDecodeError, LookupError):
+                continue
+            CHARSET_RESOLVED.inc(source=source)
+            self.learn(host, encoding)
+            return text
+
+        CHARSET_RESOLVED.inc(source="sniff")
+        return content
+
+
+_resolver = CharsetResolver()
+
+
+def decode_html(content: bytes, content_type: Optional[str] = None, url: str = "") -> Union[str, bytes]:
+    """
+    用进程内共享的编码识别器解码网页
+
+    Args:
+        content: 原始响应字节
+        content_type: Content-Type响应头
+        url: 页面URL
+
+    Returns:
+        Union[str, bytes]: 解码后的文本，无法确定编码时返回原始字节
+    """
+    return _resolver.decode(content, content_type, url)
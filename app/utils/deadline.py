@@ -0,0 +1,87 @@
+#!/usr/bin/env python
+"""
+截止时间模块
+
+交互式请求(如Web接口的爬取)带一个总的时间预算，从爬取入口一路传到每次HTTP请求：
+请求前的等待、每次尝试的超时、重试前的等待都不超过剩余时间，时间用完时放弃尚未完成的工作，
+调用方拿到截止前已经完成的结果
+"""
+
+import time
+from typing import Optional, Tuple, Union
+
+# 单个值或(连接超时, 读取超时)
+Timeout = Union[float, Tuple[float, float]]
+
+# 交给requests的超时下限，避免传入0变成非阻塞读取
+_MIN_TIMEOUT = 0.001
+
+
+class DeadlineExceeded(Exception):
+    """截止时间已到"""
+
+
+class Deadline:
+    """从创建时开始计时的截止时间"""
+
+    def __init__(self, seconds: float):
+        """
+        初始化截止时间
+
+        Args:
+            seconds: 时间预算(秒)
+        """
+        self.seconds = seconds
+        self.started_at = time.monotonic()
+        self.expires_at = self.started_at + seconds
+
+    @classmethod
+    def after(cls, seconds: Optional[float]) -> Optional["Deadline"]:
+        """
+        创建截止时间，seconds为None时不设截止时间
+
+        Args:
+            seconds: 时间预算(秒)
+
+        Returns:
+            Optional[Deadline]: 截止时间
+        """
+        return cls(seconds) if seconds is not None else None
+
+    def remaining(self) -> float:
+        """剩余秒数，已过期时为0"""
+        return max(self.expires_at - time.monotonic(), 0.0)
+
+    def elapsed(self) -> float:
+        """已用秒数"""
+        return time.monotonic() - self.started_at
+
+    @property
+    def expired(self) -> bool:
+        """是否已过期"""
+        return time.monotonic() >= self.expires_at
+
+    def check(self):
+        """
+        已过期时抛出异常
+
+        Raises:
+            DeadlineExceeded: 截止时间已到
+        """
+        if self.expired:
+            raise DeadlineExceeded(f"超过截止时间({self.seconds}秒)")
+
+    def clamp(self, timeout: Timeout) -> Timeout:
+        """
+        把请求超时限制在剩余时间内，连接超时和读取超时分别限制
+
+        Args:
+            timeout: 单个值或(连接超时, 读取超时)
+
+        Returns:
+            Timeout: 限制后的超时，形式与传入的相同
+        """
+        remaining = max(self.remaining(), _MIN_TIMEOUT)
+        if isinstance(timeout, tuple):
+            return tuple(min(value, remaining) for value in timeout)
+        return min(timeout, remaining)
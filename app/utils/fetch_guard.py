@@ -0,0 +1,324 @@
+#!/usr/bin/env python
+"""
+失败URL与失败域名的快速失败模块
+
+- 负缓存：返回404/410的URL在TTL内不再请求，写回JSON文件(持有文件锁与其他进程写入的条目合并)，多次运行之间保留
+- 熔断器：每个域名一个，连续失败(403/429/5xx/连接错误)达到阈值后打开，
+  打开期间对该域名的请求直接失败；冷却时间到后进入半开状态，只放行一个探测请求，
+  成功则关闭，失败则重新打开并加倍冷却时间
+
+两者都在发出请求前以字典查询判断，已知失效的目标在微秒级返回，不再消耗重试和重试前的等待
+"""
+
+import json
+import multiprocessing.util
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from ..config.settings import (
+    NEGATIVE_CACHE_PATH,
+    NEGATIVE_CACHE_TTL,
+    NEGATIVE_CACHE_MAX_ENTRIES,
+    NEGATIVE_CACHE_SAVE_INTERVAL,
+    CIRCUIT_FAILURE_THRESHOLD,
+    CIRCUIT_RESET_TIMEOUT,
+    CIRCUIT_MAX_RESET_TIMEOUT
+)
+from ..utils.file import update_json_file
+from ..utils.logger import logger
+from ..utils.metrics import CIRCUIT_STATE, record_cache
+
+# 熔断器状态
+CLOSED = "closed"
+HALF_OPEN = "half_open"
+OPEN = "open"
+
+_STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+
+class NegativeCache:
+    """
+    失效URL的负缓存
+    条目为 URL -> (状态码, 过期时间戳)，过期时间用墙上时间以便跨进程、跨运行保存
+    """
+
+    def __init__(
+        self,
+        path: Optional[Path] = NEGATIVE_CACHE_PATH,
+        ttl: float = NEGATIVE_CACHE_TTL,
+        max_entries: int = NEGATIVE_CACHE_MAX_ENTRIES,
+        save_interval: int = NEGATIVE_CACHE_SAVE_INTERVAL
+    ):
+        """
+        初始化负缓存
+
+        Args:
+            path: 缓存文件路径，为None时只在内存中记录
+            ttl: 条目有效期(秒)，过期后重新请求，以防页面恢复
+            max_entries: 最多保存的条目数，超过时淘汰最早过期的
+            save_interval: 每新增多少个条目写回一次文件，进程退出时也会写回
+        """
+        self.path = Path(path) if path else None
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.save_interval = save_interval
+        self.logger = logger
+        self._entries: Dict[str, Tuple[int, float]] = {}
+        self._added: Dict[str, Tuple[int, float]] = {}
+        self._lock = threading.Lock()
+        if self.path is not None:
+            self._entries.update(self._read())
+
+    def _read(self) -> Dict[str, Tuple[int, float]]:
+        """读取缓存文件，丢弃已过期的条目"""
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            self.logger.warning("读取负缓存失败 %s: %s", self.path, e)
+            return {}
+        now = time.time()
+        return {
+            url: (int(status), float(expires))
+            for url, (status, expires) in data.items()
+            if float(expires) > now
+        }
+
+    def get(self, url: str) -> Optional[int]:
+        """
+        查询URL是否已知失效
+
+        Args:
+            url: 请求URL
+
+        Returns:
+            Optional[int]: 记录的状态码，不在缓存中或已过期时返回None
+        """
+        entry = self._entries.get(url)
+        if entry is not None and entry[1] <= time.time():
+            with self._lock:
+                self._entries.pop(url, None)
+            entry = None
+        record_cache("negative_url", entry is not None)
+        return entry[0] if entry is not None else None
+
+    def add(self, url: str, status: int):
+        """
+        记录失效的URL
+
+        Args:
+            url: 请求URL
+            status: 状态码
+        """
+        entry = (status, time.time() + self.ttl)
+        with self._lock:
+            self._entries[url] = entry
+            self._added[url] = entry
+            if len(self._entries) > self.max_entries:
+                self._evict(self._entries)
+            # 写回时取走_added，同时达到间隔的多个线程只有一个写回
+            due = self.save_interval > 0 and len(self._added) >= self.save_interval
+            if due:
+                added, self._added = self._added, {}
+        if due:
+            self._write(added)
+            self.save()
+
+    def discard(self, url: str):
+        """移除URL，页面恢复时调用"""
+        with self._lock:
+            self._entries.pop(url, None)
+
+    def _evict(self, entries: Dict[str, Tuple[int, float]]):
+        """淘汰最早过期的条目，直到不超过max_entries"""
+        excess = len(entries) - self.max_entries
+        for url, _ in sorted(entries.items(), key=lambda item: item[1][1])[:excess]:
+            del entries[url]
+
+    def save(self):
+        """把本进程新增的条目与文件中的条目合并后原子写回"""
+        if self.path is None:
+            return
+        with self._lock:
+            added, self._added = self._added, {}
+        self._write(added)
+
+    def _write(self, added: Dict[str, Tuple[int, float]]):
+        """持有文件锁把新增的条目与文件中的条目合并后原子写回"""
+        if self.path is None or not added:
+            return
+
+        def merge() -> Dict[str, list]:
+            entries = self._read()
+            entries.update(added)
+            if len(entries) > self.max_entries:
+                self._evict(entries)
+            return {url: list(entry) for url, entry in entries.items()}
+
+        try:
+            update_json_file(self.path, merge, ensure_ascii=False)
+        except OSError as e:
+            self.logger.warning("写回负缓存失败 %s: %s", self.path, e)
+
+
+class CircuitBreaker:
+    """单个域名的熔断器"""
+
+    def __init__(
+        self,
+        host: str,
+        failure_threshold: int = CIRCUIT_FAILURE_THRESHOLD,
+        reset_timeout: float = CIRCUIT_RESET_TIMEOUT,
+        max_reset_timeout: float = CIRCUIT_MAX_RESET_TIMEOUT
+    ):
+        """
+        初始化熔断器
+
+        Args:
+            host: 域名
+            failure_threshold: 连续失败多少次后打开
+            reset_timeout: 打开后的冷却时间(秒)，之后进入半开状态
+            max_reset_timeout: 半开探测连续失败时冷却时间加倍的上限(秒)
+        """
+        self.host = host
+        self.failure_threshold = max(failure_threshold, 1)
+        self.base_reset_timeout = reset_timeout
+        self.max_reset_timeout = max_reset_timeout
+        self.reset_timeout = reset_timeout
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """是否放行一次请求，半开状态下同时只放行一个探测请求"""
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+            now = time.monotonic()
+            if self.state == OPEN:
+                if now - self.opened_at < self.reset_timeout:
+                    return False
+                self._transition(HALF_OPEN)
+            # 半开：探测请求未返回结果时，超过冷却时间视为丢失，再放行一个
+            if self._probing and now - self.opened_at < self.reset_timeout * 2:
+                return False
+            self._probing = True
+            return True
+
+    def record_success(self):
+        """记录一次成功，关闭熔断器"""
+        with self._lock:
+            self.failures = 0
+            self._probing = False
+            if self.state != CLOSED:
+                self.reset_timeout = self.base_reset_timeout
+                self._transition(CLOSED)
+
+    def record_failure(self):
+        """记录一次失败，达到阈值或半开探测失败时打开熔断器"""
+        with self._lock:
+            self.failures += 1
+            self._probing = False
+            if self.state == HALF_OPEN:
+                self.reset_timeout = min(self.reset_timeout * 2, self.max_reset_timeout)
+                self._open()
+            elif self.state == CLOSED and self.failures >= self.failure_threshold:
+                self._open()
+
+    def _open(self):
+        self.opened_at = time.monotonic()
+        self._transition(OPEN)
+        logger.warning(
+            "域名 %s 连续失败 %s 次，熔断 %.0f 秒", self.host, self.failures, self.reset_timeout
+        )
+
+    def _transition(self, state: str):
+        self.state = state
+        CIRCUIT_STATE.set(_STATE_VALUES[state], host=self.host)
+
+
+class CircuitBreakerRegistry:
+    """按域名管理熔断器"""
+
+    def __init__(
+        self,
+        failure_threshold: int = CIRCUIT_FAILURE_THRESHOLD,
+        reset_timeout: float = CIRCUIT_RESET_TIMEOUT,
+        max_reset_timeout: float = CIRCUIT_MAX_RESET_TIMEOUT
+    ):
+        """
+        初始化熔断器登记表
+
+        Args:
+            failure_threshold: 连续失败多少次后打开
+            reset_timeout: 打开后的冷却时间(秒)
+            max_reset_timeout: 冷却时间加倍的上限(秒)
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.max_reset_timeout = max_reset_timeout
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def get(self, host: str) -> CircuitBreaker:
+        """获取域名的熔断器，不存在时创建"""
+        breaker = self._breakers.get(host)
+        if breaker is None:
+            with self._lock:
+                breaker = self._breakers.setdefault(
+                    host, CircuitBreaker(host, self.failure_threshold, self.reset_timeout, self.max_reset_timeout)
+                )
+        return breaker
+
+    def states(self) -> Dict[str, str]:
+        """各域名熔断器的状态"""
+        return {host: breaker.state for host, breaker in list(self._breakers.items())}
+
+
+_negative_cache: Optional[NegativeCache] = None
+_negative_cache_pid = 0
+_breakers = CircuitBreakerRegistry()
+_guard_lock = threading.Lock()
+
+
+def get_negative_cache() -> NegativeCache:
+    """
+    获取进程内共享的负缓存，进程退出时写回文件
+
+    Returns:
+        NegativeCache: 共享负缓存
+    """
+    global _negative_cache, _negative_cache_pid
+    # fork出的子进程重新读取文件，不沿用父进程未写回的条目
+    if _negative_cache is None or _negative_cache_pid != os.getpid():
+        with _guard_lock:
+            if _negative_cache is None or _negative_cache_pid != os.getpid():
+                _negative_cache = NegativeCache()
+                _negative_cache_pid = os.getpid()
+                multiprocessing.util.Finalize(None, _negative_cache.save, exitpriority=10)
+    return _negative_cache
+
+
+def get_breaker(host: str) -> CircuitBreaker:
+    """
+    获取域名的熔断器，进程内共享
+
+    Args:
+        host: 域名
+
+    Returns:
+        CircuitBreaker: 熔断器
+    """
+    return _breakers.get(host)
+
+
+def circuit_states() -> Dict[str, str]:
+    """进程内各域名熔断器的状态"""
+    return _breakers.states()
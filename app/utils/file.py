@@ -3,9 +3,20 @@
 文件操作工具模块
 """
 
+import json
+import os
+import tempfile
+import time
+from contextlib import contextmanager
 from datetime import datetime
 from pathlib import Path
-from typing import Optional
+from typing import Any, Callable, Iterator, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
 
 from ..config.settings import OUTPUT_DIR
 from ..utils.logger import logger
@@ -36,17 +47,79 @@ def save_report(content: str, category: str, custom_dir: Optional[Path] = None)
     try:
         with open(filepath, "w", encoding="utf-8") as f:
             f.write(content)
-        logger.info(f"报告已保存到: {filepath}")
+        logger.info("报告已保存到: %s", filepath)
         return filepath
     except Exception as e:
-        logger.error(f"保存报告出错: {e}")
+        logger.error("保存报告出错: %s", e)
         # 创建备用文件路径
         backup_path = output_dir / f"backup_{filename}"
         try:
             with open(backup_path, "w", encoding="utf-8") as f:
                 f.write(content)
-            logger.info(f"报告已保存到备用路径: {backup_path}")
+            logger.info("报告已保存到备用路径: %s", backup_path)
             return backup_path
         except Exception as e2:
-            logger.error(f"保存报告到备用路径出错: {e2}")
-            raise 
\ No newline at end of file
+            logger.error("保存报告到备用路径出错: %s", e2)
+            raise
+
+
+@contextmanager
+def file_lock(path: Path) -> Iterator[None]:
+    """
+    持有跨进程的排他文件锁
+
+    Args:
+        path: 锁文件路径，不存在时创建
+    """
+    with open(path, "a+b") as f:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+            return
+
+        # msvcrt.locking在10秒内拿不到锁时抛出OSError，继续等待
+        while True:
+            try:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+                break
+            except OSError:
+                time.sleep(0.1)
+        try:
+            yield
+        finally:
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def update_json_file(path: Path, merge: Callable[[], Any], **dump_kwargs):
+    """
+    持有文件锁(文件旁的.lock文件)读取、合并并原子替换JSON文件，多个进程和线程同时写回时不会丢失彼此的改动
+
+    Args:
+        path: JSON文件路径
+        merge: 在锁内调用，读取文件中的数据并与本进程的改动合并，返回要写回的数据
+        **dump_kwargs: 传给json.dump的参数
+
+    Raises:
+        OSError: 加锁或写入失败
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with file_lock(path.with_name(f"{path.name}.lock")):
+        data = merge()
+        # 临时文件名唯一，同一进程的多个线程也不会写同一个临时文件
+        temp_path = None
+        try:
+            with tempfile.NamedTemporaryFile(
+                "w", encoding="utf-8", dir=path.parent, prefix=f"{path.name}.", suffix=".tmp", delete=False
+            ) as f:
+                temp_path = f.name
+                json.dump(data, f, **dump_kwargs)
+            os.replace(temp_path, path)
+        except BaseException:
+            if temp_path is not None and os.path.exists(temp_path):
+                os.unlink(temp_path)
+            raise
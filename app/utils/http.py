@@ -4,14 +4,149 @@ HTTP请求工具模块
 """
 
 import random
+import re
+import threading
 import time
-from typing import Dict, Any, Optional, Tuple
+from typing import Dict, Any, Optional, Sequence, Tuple, Union
+from urllib.parse import urlparse
 
 import requests
 from bs4 import BeautifulSoup
 
-from ..config.settings import USER_AGENTS, REQUEST_TIMEOUT, REQUEST_DELAY, RETRY_DELAY
+from ..config.settings import (
+    USER_AGENTS, 
+    REQUEST_TIMEOUT, 
+    REQUEST_DELAY, 
+    RETRY_DELAY, 
+    REQUEST_DELAY_SCALE,
+    DOWNLOAD_URL_CLASSES,
+    DOWNLOAD_MAX_BYTES,
+    DOWNLOAD_ALLOWED_TYPES,
+    DOWNLOAD_STOP_MARKERS,
+    DOWNLOAD_CHUNK_SIZE,
+    NEGATIVE_CACHE_ENABLED,
+    CIRCUIT_BREAKER_ENABLED
+)
+from ..utils.charset import decode_html
+from ..utils.deadline import Deadline, DeadlineExceeded, Timeout
+from ..utils.fetch_guard import get_breaker, get_negative_cache
 from ..utils.logger import logger
+from ..utils.metrics import FETCH_REQUESTS, FETCH_BYTES, PARSE_LATENCY
+from ..utils.timing import timed
+
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+_url_classes = [(name, re.compile(pattern)) for name, pattern in DOWNLOAD_URL_CLASSES]
+
+# 计入域名熔断的失败状态码(5xx另算)，其他响应说明域名可用
+_CIRCUIT_FAILURE_STATUSES = (403, 429)
+
+# 每个线程复用的下载缓冲区
+_buffers = threading.local()
+
+
+def get_session() -> requests.Session:
+    """
+    获取进程内共享的HTTP会话，复用连接池和TLS连接
+    
+    测试和基准测试可以在返回的会话上挂载自定义传输适配器
+    
+    Returns:
+        requests.Session: 共享会话
+    """
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = requests.Session()
+    return _session
+
+
+def classify_url(url: str) -> str:
+    """
+    按DOWNLOAD_URL_CLASSES判断URL的类别
+    
+    Args:
+        url: 请求URL
+        
+    Returns:
+        str: 类别名称，都不匹配时为default
+    """
+    for name, pattern in _url_classes:
+        if pattern.search(url):
+            return name
+    return "default"
+
+
+def _get_buffer(size: int) -> bytearray:
+    """获取当前线程的下载缓冲区，不够大时扩容"""
+    buffer = getattr(_buffers, "buffer", None)
+    if buffer is None or len(buffer) < size:
+        buffer = _buffers.buffer = bytearray(size)
+    return buffer
+
+
+def _read_body(
+    response: requests.Response,
+    max_bytes: int,
+    stop_marker: Optional[bytes],
+    deadline: Optional[Deadline] = None
+) -> Optional[bytes]:
+    """
+    分块读取响应正文到复用的缓冲区
+    
+    Args:
+        response: 以stream=True发出的请求的响应
+        max_bytes: 正文(解压后)的最大字节数
+        stop_marker: 读到该标记后停止读取，正文截止到标记末尾
+        deadline: 截止时间，读取途中到达时放弃
+        
+    Returns:
+        Optional[bytes]: 正文，超过max_bytes时返回None
+        
+    Raises:
+        DeadlineExceeded: 读完之前截止时间已到
+    """
+    length = response.headers.get("Content-Length", "")
+    if length.isdigit() and int(length) > max_bytes:
+        return None
+    
+    buffer = _get_buffer(max_bytes + DOWNLOAD_CHUNK_SIZE)
+    view = memoryview(buffer)
+    size = 0
+    try:
+        for chunk in response.iter_content(DOWNLOAD_CHUNK_SIZE):
+            end = size + len(chunk)
+            if end > max_bytes:
+                return None
+            if deadline is not None and deadline.expired:
+                response.close()
+                deadline.check()
+            view[size:end] = chunk
+            if stop_marker:
+                found = buffer.find(stop_marker, max(size - len(stop_marker) + 1, 0), end)
+                if found >= 0:
+                    size = found + len(stop_marker)
+                    # 剩余部分不再读取，连接无法复用
+                    response.close()
+                    break
+            size = end
+        return bytes(view[:size])
+    finally:
+        view.release()
+
+
+def _random_sleep(delay_range: Tuple[float, float], deadline: Optional[Deadline] = None) -> Optional[float]:
+    """在给定范围内随机休眠，返回实际休眠的秒数；休眠后就会超过截止时间时不休眠，返回None"""
+    delay = random.uniform(*delay_range) * REQUEST_DELAY_SCALE
+    if deadline is not None and delay >= deadline.remaining():
+        return None
+    if delay > 0:
+        with timed("request.sleep"):
+            time.sleep(delay)
+    return delay
 
 
 def get_random_headers() -> Dict[str, str]:
@@ -39,6 +174,7 @@ def get_random_headers() -> Dict[str, str]:
     }
 
 
+@timed("make_request")
 def make_request(
     url: str, 
     method: str = "GET", 
@@ -46,15 +182,27 @@ def make_request(
     data: Optional[Dict[str, Any]] = None,
     headers: Optional[Dict[str, str]] = None,
     cookies: Optional[Dict[str, str]] = None,
-    timeout: int = REQUEST_TIMEOUT,
+    timeout: Timeout = REQUEST_TIMEOUT,
     max_retries: int = 3,
     delay_range: Tuple[float, float] = REQUEST_DELAY,
     retry_delay_range: Tuple[float, float] = RETRY_DELAY,
-    verify: bool = True
+    verify: bool = True,
+    max_bytes: Optional[int] = None,
+    allowed_types: Optional[Sequence[str]] = None,
+    stop_marker: Optional[bytes] = None,
+    deadline: Optional[Deadline] = None
 ) -> Optional[requests.Response]:
     """
     发送HTTP请求，支持重试机制和随机延迟
     
+    正文以流式分块读取：Content-Type不在允许列表中或正文超过大小上限时，
+    不再读取剩余部分并直接放弃，不会重试
+    
+    返回404/410的GET请求记入负缓存，有效期内再次请求时直接返回None；
+    域名连续失败被熔断期间，请求也直接返回None，不等待延迟和重试
+    
+    指定截止时间时，每次尝试的连接和读取超时都不超过剩余时间，剩余时间不够等待延迟或读完正文时放弃并返回None
+    
     Args:
         url: 请求URL
         method: 请求方法 (GET, POST, PUT等)
@@ -62,67 +210,169 @@ def make_request(
         data: 请求体数据
         headers: 请求头
         cookies: Cookie
-        timeout: 请求超时时间(秒)
+        timeout: 请求超时时间(秒)，单个值或(连接超时, 读取超时)
         max_retries: 最大重试次数
         delay_range: 请求前的随机延迟时间范围(秒)
         retry_delay_range: 重试前的随机延迟时间范围(秒) 
         verify: 是否验证SSL证书
+        max_bytes: 正文(解压后)的最大字节数，默认按URL类别取DOWNLOAD_MAX_BYTES
+        allowed_types: 允许的Content-Type，默认为DOWNLOAD_ALLOWED_TYPES，传入空列表时不检查
+        stop_marker: 读到该字节串后停止下载，默认按URL类别取DOWNLOAD_STOP_MARKERS
+        deadline: 截止时间，为None时不限制总耗时
         
     Returns:
         requests.Response: 响应对象，如果所有重试都失败则返回None
     """
     if headers is None:
         headers = get_random_headers()
+    host = urlparse(url).hostname or ""
+    url_class = classify_url(url)
+    if max_bytes is None:
+        max_bytes = DOWNLOAD_MAX_BYTES.get(url_class, DOWNLOAD_MAX_BYTES["default"])
+    if allowed_types is None:
+        allowed_types = DOWNLOAD_ALLOWED_TYPES
+    if stop_marker is None:
+        stop_marker = DOWNLOAD_STOP_MARKERS.get(url_class)
+        
+    # 只有不带参数的GET请求由URL唯一确定，才使用负缓存
+    negative_cache = None
+    if NEGATIVE_CACHE_ENABLED and method.upper() == "GET" and not params and not data:
+        negative_cache = get_negative_cache()
+        cached_status = negative_cache.get(url)
+        if cached_status is not None:
+            FETCH_REQUESTS.inc(host=host, status="negative_cached")
+            logger.debug("页面已知不存在(%s)，跳过: %s", cached_status, url)
+            return None
+            
+    breaker = get_breaker(host) if CIRCUIT_BREAKER_ENABLED and host else None
+    if breaker is not None and not breaker.allow():
+        FETCH_REQUESTS.inc(host=host, status="circuit_open")
+        logger.debug("域名 %s 熔断中，跳过: %s", host, url)
+        return None
         
     # 随机延迟，避免频繁请求
-    time.sleep(random.uniform(*delay_range))
+    if _random_sleep(delay_range, deadline) is None:
+        FETCH_REQUESTS.inc(host=host, status="deadline")
+        logger.warning("剩余时间不足，放弃请求: %s", url)
+        return None
     
     for attempt in range(max_retries):
+        if deadline is not None and deadline.expired:
+            FETCH_REQUESTS.inc(host=host, status="deadline")
+            logger.warning("超过截止时间，放弃请求: %s", url)
+            return None
+            
+        # 重试前域名已被熔断(包括被其他线程的请求熔断)时不再重试
+        if attempt > 0 and breaker is not None and not breaker.allow():
+            FETCH_REQUESTS.inc(host=host, status="circuit_open")
+            logger.warning("域名 %s 已熔断，停止重试: %s", host, url)
+            return None
+            
         try:
-            logger.debug(f"发送{method}请求到: {url} (尝试 {attempt+1}/{max_retries})")
+            logger.debug("发送%s请求到: %s (尝试 %s/%s)", method, url, attempt+1, max_retries)
             
-            response = requests.request(
-                method=method,
-                url=url,
-                params=params,
-                data=data,
-                headers=headers,
-                cookies=cookies,
-                timeout=timeout,
-                verify=verify
-            )
+            with timed("request.network") as timer:
+                response = get_session().request(
+                    method=method,
+                    url=url,
+                    params=params,
+                    data=data,
+                    headers=headers,
+                    cookies=cookies,
+                    timeout=deadline.clamp(timeout) if deadline is not None else timeout,
+                    verify=verify,
+                    stream=True
+                )
+                
+                if response.status_code == 200:
+                    # 先看响应头，再分块读取正文
+                    content_type = response.headers.get("Content-Type", "").split(";")[0].strip().lower()
+                    if content_type and allowed_types and content_type not in allowed_types:
+                        response.close()
+                        if breaker is not None:
+                            breaker.record_success()
+                        FETCH_REQUESTS.inc(host=host, status="blocked_type")
+                        logger.warning("跳过不允许的内容类型(%s): %s", content_type, url)
+                        return None
+                        
+                    body = _read_body(response, max_bytes, stop_marker, deadline)
+                    if body is None:
+                        response.close()
+                        if breaker is not None:
+                            breaker.record_success()
+                        FETCH_REQUESTS.inc(host=host, status="too_large")
+                        logger.warning("响应正文超过%s字节，已放弃: %s", max_bytes, url)
+                        return None
+                    response._content = body
+                    response._content_consumed = True
+                else:
+                    # 错误响应的正文用不到，直接释放连接
+                    response.close()
+                    response._content = b""
+                    response._content_consumed = True
+                    
+                timer.add_bytes(len(response.content))
+                
+            FETCH_REQUESTS.inc(host=host, status=response.status_code)
+            FETCH_BYTES.inc(len(response.content), host=host)
             
+            if breaker is not None:
+                if response.status_code in _CIRCUIT_FAILURE_STATUSES or response.status_code >= 500:
+                    breaker.record_failure()
+                else:
+                    breaker.record_success()
+                    
             # 处理常见状态码
             if response.status_code == 200:
                 return response
             elif response.status_code == 403:
-                logger.warning(f"请求被拒绝(403): {url}")
+                logger.warning("请求被拒绝(403): %s", url)
                 # 更换头部信息重试
                 headers = get_random_headers()
             elif response.status_code in (429, 503):
-                logger.warning(f"请求频率过高或服务不可用({response.status_code}): {url}")
+                logger.warning("请求频率过高或服务不可用(%s): %s", response.status_code, url)
             elif response.status_code in (404, 410):
-                logger.warning(f"页面不存在({response.status_code}): {url}")
+                logger.warning("页面不存在(%s): %s", response.status_code, url)
+                if negative_cache is not None:
+                    negative_cache.add(url, response.status_code)
                 return None  # 不需要重试，资源不存在
             else:
-                logger.warning(f"请求失败({response.status_code}): {url}")
+                logger.warning("请求失败(%s): %s", response.status_code, url)
                 
             # 如果不是最后一次尝试，等待后重试
             if attempt < max_retries - 1:
-                retry_delay = random.uniform(*retry_delay_range)
-                logger.debug(f"等待{retry_delay:.2f}秒后重试...")
-                time.sleep(retry_delay)
+                retry_delay = _random_sleep(retry_delay_range, deadline)
+                if retry_delay is None:
+                    logger.warning("剩余时间不足以重试，放弃请求: %s", url)
+                    return None
+                logger.debug("等待%.2f秒后重试...", retry_delay)
+            
+        except DeadlineExceeded:
+            FETCH_REQUESTS.inc(host=host, status="deadline")
+            logger.warning("超过截止时间，放弃下载: %s", url)
+            return None
             
         except (requests.RequestException, Exception) as e:
-            logger.error(f"请求出错: {url} - {str(e)}")
+            if deadline is not None and deadline.expired:
+                # 超时被截止时间压缩后触发，不算域名失败
+                FETCH_REQUESTS.inc(host=host, status="deadline")
+                logger.warning("超过截止时间，放弃请求: %s - %s", url, e)
+                return None
+                
+            logger.error("请求出错: %s - %s", url, e)
+            FETCH_REQUESTS.inc(host=host, status="error")
+            if breaker is not None:
+                breaker.record_failure()
             
             # 如果不是最后一次尝试，等待后重试
             if attempt < max_retries - 1:
-                retry_delay = random.uniform(*retry_delay_range)
-                logger.debug(f"等待{retry_delay:.2f}秒后重试...")
-                time.sleep(retry_delay)
+                retry_delay = _random_sleep(retry_delay_range, deadline)
+                if retry_delay is None:
+                    logger.warning("剩余时间不足以重试，放弃请求: %s", url)
+                    return None
+                logger.debug("等待%.2f秒后重试...", retry_delay)
             else:
-                logger.error(f"在{max_retries}次尝试后失败")
+                logger.error("在%s次尝试后失败", max_retries)
                 return None
                 
     return None
@@ -131,6 +381,7 @@ def make_request(
 def get_soup(
     url: str, 
     parser: str = "html5lib",
+    deadline: Optional[Deadline] = None,
     **request_kwargs
 ) -> Optional[BeautifulSoup]:
     """
@@ -139,21 +390,32 @@ def get_soup(
     Args:
         url: 请求URL
         parser: BeautifulSoup解析器 ('html5lib', 'lxml', 'html.parser')
+        deadline: 截止时间，下载超过截止时间时返回None
         **request_kwargs: 传递给make_request的参数
         
     Returns:
         BeautifulSoup: 解析后的BeautifulSoup对象，失败则返回None
     """
-    response = make_request(url, **request_kwargs)
-    if not response:
-        return None
+    with timed("get_soup"):
+        response = make_request(url, deadline=deadline, **request_kwargs)
+        if not response:
+            return None
+            
+        with timed("decode"):
+            markup = decode_html(response.content, response.headers.get("Content-Type"), url)
+        return _parse_html(markup, parser)
+        
         
+def _parse_html(content: Union[str, bytes], parser: str) -> Optional[BeautifulSoup]:
+    """使用指定解析器解析HTML(已解码的文本或原始字节)，失败时依次尝试备用解析器"""
     # 尝试使用指定的解析器
     try:
-        soup = BeautifulSoup(response.content, parser)
+        with timed("parse") as timer, PARSE_LATENCY.time(parser=parser):
+            timer.add_bytes(len(content))
+            soup = BeautifulSoup(content, parser)
         return soup
     except Exception as e:
-        logger.error(f"BeautifulSoup解析失败: {str(e)}")
+        logger.error("BeautifulSoup解析失败: %s", e)
         
         # 尝试备用解析器
         backup_parsers = ["lxml", "html.parser", "html5lib"]
@@ -161,11 +423,11 @@ def get_soup(
         
         for backup_parser in backup_parsers:
             try:
-                logger.debug(f"尝试使用备用解析器: {backup_parser}")
-                soup = BeautifulSoup(response.content, backup_parser)
+                logger.debug("尝试使用备用解析器: %s", backup_parser)
+                soup = BeautifulSoup(content, backup_parser)
                 return soup
             except Exception as e2:
-                logger.debug(f"{backup_parser}解析器失败: {str(e2)}")
+                logger.debug("%s解析器失败: %s", backup_parser, e2)
                 
         logger.error("所有解析器都失败")
         return None 
\ No newline at end of file
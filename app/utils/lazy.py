@@ -0,0 +1,42 @@
+#!/usr/bin/env python
+"""
+包级延迟导入工具模块
+
+包的__init__通过PEP 562的模块级__getattr__按需导入子模块，
+导入包本身不会加载requests、bs4、openai等重依赖
+"""
+
+import importlib
+from typing import Callable, Dict, List, Tuple
+
+
+def lazy_exports(
+    package: str,
+    exports: Dict[str, Tuple[str, str]],
+    namespace: dict
+) -> Tuple[Callable[[str], object], Callable[[], List[str]]]:
+    """
+    生成包的__getattr__和__dir__
+
+    Args:
+        package: 包名，即__name__
+        exports: 导出名称 -> (子模块名, 子模块中的属性名)
+        namespace: 包的globals()，首次访问后把结果缓存进去，后续访问不再经过__getattr__
+
+    Returns:
+        Tuple: (__getattr__, __dir__)
+    """
+
+    def __getattr__(name: str):
+        target = exports.get(name)
+        if target is None:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        module_name, attr = target
+        value = getattr(importlib.import_module(f"{package}.{module_name}"), attr)
+        namespace[name] = value
+        return value
+
+    def __dir__() -> List[str]:
+        return sorted(set(namespace) | set(exports))
+
+    return __getattr__, __dir__
@@ -1,21 +1,135 @@
 #!/usr/bin/env python
 """
 日志配置模块
+
+默认使用QueueHandler/QueueListener：调用线程只把日志记录放进队列，
+格式化和控制台/文件I/O都由后台线程完成；日志文件按大小或时间轮转
 """
 
+import atexit
+import json
 import logging
+import logging.handlers
+import multiprocessing
 import os
+import queue
+from datetime import datetime
 from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from ..config.settings import (
+    LOG_DIR,
+    LOG_ASYNC,
+    LOG_JSON,
+    LOG_MAX_BYTES,
+    LOG_BACKUP_COUNT,
+    LOG_ROTATE_WHEN
+)
+
+
+# 每个日志记录器对应的后台写线程
+_listeners: Dict[str, logging.handlers.QueueListener] = {}
+
+
+class JsonFormatter(logging.Formatter):
+    """把日志记录格式化为一行JSON"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            "time": datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "module": record.module,
+            "line": record.lineno,
+            "thread": record.threadName,
+            "process": record.process
+        }
+        if record.exc_info:
+            payload["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(payload, ensure_ascii=False)
+
+
+class LazyQueueHandler(logging.handlers.QueueHandler):
+    """
+    不在调用线程中格式化消息的QueueHandler
+
+    标准QueueHandler.prepare会在入队前格式化消息；队列在进程内，
+    这里直接传递原始记录，把%格式化推迟到后台线程
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+def _stop_listener(name: str):
+    """停止并移除某个日志记录器的后台写线程，队列中剩余的记录会被写完"""
+    listener = _listeners.pop(name, None)
+    if listener is not None:
+        listener.stop()
+
 
+def _stop_all_listeners():
+    """进程退出时刷新所有后台写线程"""
+    for name in list(_listeners):
+        _stop_listener(name)
 
-def setup_logger(name: str = "news_analyzer", log_level: str = "INFO") -> logging.Logger:
+
+atexit.register(_stop_all_listeners)
+
+
+class _DeferredOpenMixin:
+    """首次写入时才创建日志目录并打开文件，导入模块时没有文件系统副作用"""
+
+    def _open(self):
+        Path(self.baseFilename).parent.mkdir(exist_ok=True, parents=True)
+        return super()._open()
+
+
+class DeferredRotatingFileHandler(_DeferredOpenMixin, logging.handlers.RotatingFileHandler):
+    """按大小轮转、延迟打开的文件处理器"""
+
+
+class DeferredTimedRotatingFileHandler(_DeferredOpenMixin, logging.handlers.TimedRotatingFileHandler):
+    """按时间轮转、延迟打开的文件处理器"""
+
+
+def _create_file_handler(name: str) -> logging.Handler:
+    """创建按大小或按时间轮转的文件处理器"""
+    log_file = LOG_DIR / f"{name}.log"
+
+    if LOG_ROTATE_WHEN:
+        return DeferredTimedRotatingFileHandler(
+            log_file,
+            when=LOG_ROTATE_WHEN,
+            backupCount=LOG_BACKUP_COUNT,
+            encoding="utf-8",
+            delay=True
+        )
+    return DeferredRotatingFileHandler(
+        log_file,
+        maxBytes=LOG_MAX_BYTES,
+        backupCount=LOG_BACKUP_COUNT,
+        encoding="utf-8",
+        delay=True
+    )
+
+
+def setup_logger(
+    name: str = "news_analyzer",
+    log_level: str = "INFO",
+    async_mode: Optional[bool] = None,
+    json_format: Optional[bool] = None
+) -> logging.Logger:
     """
     配置并返回一个日志记录器
-    
+
     Args:
         name: 日志记录器名称
         log_level: 日志级别 (DEBUG, INFO, WARNING, ERROR, CRITICAL)
-        
+        async_mode: 是否由后台线程写日志，默认使用LOG_ASYNC
+        json_format: 日志文件是否使用JSON行格式，默认使用LOG_JSON
+
     Returns:
         配置好的日志记录器
     """
@@ -23,47 +137,107 @@ def setup_logger(name: str = "news_analyzer", log_level: str = "INFO") -> loggin
     numeric_level = getattr(logging, log_level.upper(), None)
     if not isinstance(numeric_level, int):
         raise ValueError(f"无效的日志级别: {log_level}")
-    
+
     # 获取环境变量中的日志级别，如果存在的话覆盖默认设置
     env_log_level = os.getenv("LOG_LEVEL")
     if env_log_level:
         numeric_level = getattr(logging, env_log_level.upper(), numeric_level)
-    
-    # 创建日志目录
-    log_dir = Path("./logs")
-    log_dir.mkdir(exist_ok=True, parents=True)
-    
+
+    if async_mode is None:
+        async_mode = LOG_ASYNC
+    if json_format is None:
+        json_format = LOG_JSON
+
     # 配置日志格式
     formatter = logging.Formatter(
         '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
     )
-    
+
     # 控制台处理器
     console_handler = logging.StreamHandler()
     console_handler.setFormatter(formatter)
-    
+
     # 文件处理器
-    file_handler = logging.FileHandler(
-        log_dir / f"{name}.log", 
-        encoding="utf-8"
-    )
-    file_handler.setFormatter(formatter)
-    
+    file_handler = _create_file_handler(name)
+    file_handler.setFormatter(JsonFormatter() if json_format else formatter)
+
     # 获取或创建日志记录器
     logger = logging.getLogger(name)
     logger.setLevel(numeric_level)
-    
-    # 清除现有处理器，避免重复添加
+
+    # 清除现有处理器和后台写线程，避免重复添加
+    _stop_listener(name)
     if logger.handlers:
+        for handler in logger.handlers:
+            handler.close()
         logger.handlers.clear()
-        
+
     # 添加处理器
-    logger.addHandler(console_handler)
-    logger.addHandler(file_handler)
-    
+    if async_mode:
+        log_queue = queue.SimpleQueue()
+        listener = logging.handlers.QueueListener(
+            log_queue,
+            console_handler,
+            file_handler,
+            respect_handler_level=True
+        )
+        listener.start()
+        _listeners[name] = listener
+        logger.addHandler(LazyQueueHandler(log_queue))
+    else:
+        logger.addHandler(console_handler)
+        logger.addHandler(file_handler)
+
     return logger
 
 
+class _ForwardHandler(logging.Handler):
+    """把收到的记录交给指定日志记录器处理"""
+
+    def __init__(self, target: logging.Logger):
+        super().__init__()
+        self.target = target
+
+    def emit(self, record: logging.LogRecord):
+        self.target.handle(record)
+
+
+def start_worker_log_forwarding(
+    name: str = "news_analyzer"
+) -> Tuple["multiprocessing.Queue", logging.handlers.QueueListener]:
+    """
+    创建跨进程日志队列，并在当前进程启动转发线程
+
+    子进程通过attach_worker_queue把日志发送到这个队列，
+    由当前进程的日志记录器统一写出，避免多个进程同时轮转同一个日志文件
+
+    Args:
+        name: 日志记录器名称
+
+    Returns:
+        Tuple: 跨进程队列和转发线程，用完后调用listener.stop()
+    """
+    log_queue = multiprocessing.Queue()
+    listener = logging.handlers.QueueListener(log_queue, _ForwardHandler(logging.getLogger(name)))
+    listener.start()
+    return log_queue, listener
+
+
+def attach_worker_queue(log_queue: "multiprocessing.Queue", name: str = "news_analyzer"):
+    """
+    在子进程中把日志记录发送到父进程的队列
+
+    Args:
+        log_queue: start_worker_log_forwarding返回的队列
+        name: 日志记录器名称
+    """
+    # 从父进程继承的处理器和后台写线程在子进程中不可用
+    _listeners.pop(name, None)
+    worker_logger = logging.getLogger(name)
+    worker_logger.handlers.clear()
+    worker_logger.addHandler(logging.handlers.QueueHandler(log_queue))
+
+
 # 创建默认的日志记录器
 logger = setup_logger()
 
@@ -74,4 +248,4 @@ if __name__ == "__main__":
     logger.info("这是一条信息消息")
     logger.warning("这是一条警告消息")
     logger.error("这是一条错误消息")
-    logger.critical("这是一条严重错误消息") 
\ No newline at end of file
+    logger.critical("这是一条严重错误消息")
@@ -0,0 +1,319 @@
+#!/usr/bin/env python
+"""
+运行指标模块，输出Prometheus文本格式
+
+指标对象内部按标签值分组并用锁保护，可以在waitress线程池中并发更新
+"""
+
+import math
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+
+_INF_LABEL = 'le="+Inf"'
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+
+def _escape(value: str) -> str:
+    """转义标签值"""
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    """格式化标签，如 {host="a",status="200"}"""
+    parts = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _format_value(value: float) -> str:
+    """格式化数值"""
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    """指标基类"""
+
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        """把标签字典转换为按labelnames排列的元组"""
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def samples(self) -> Iterable[str]:
+        """输出样本行"""
+        return []
+
+    def render(self) -> List[str]:
+        """输出HELP/TYPE和样本行"""
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(self.samples())
+        return lines
+
+
+class Counter(_Metric):
+    """只增不减的计数器"""
+
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1.0, **labels):
+        """
+        增加计数
+
+        Args:
+            amount: 增加量
+            **labels: 标签值
+        """
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels) -> float:
+        """获取某组标签的当前值"""
+        with self._lock:
+            return self._values.get(self._key(labels), 0.0)
+
+    def items(self) -> List[Tuple[Tuple[str, ...], float]]:
+        """获取所有标签组合及其值"""
+        with self._lock:
+            return list(self._values.items())
+
+    def samples(self) -> Iterable[str]:
+        for key, value in sorted(self.items()):
+            yield f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+
+
+class Gauge(_Metric):
+    """可增可减的仪表，也可以由回调函数在输出时计算"""
+
+    kind = "gauge"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        function: Optional[Callable[[], Dict[Tuple[str, ...], float]]] = None
+    ):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._function = function
+        if not self.labelnames:
+            self._values[()] = 0.0
+
+    def set(self, value: float, **labels):
+        """设置值"""
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def inc(self, amount: float = 1.0, **labels):
+        """增加值"""
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels):
+        """减少值"""
+        self.inc(-amount, **labels)
+
+    @contextmanager
+    def track_inprogress(self, **labels):
+        """在上下文期间把值加一，用于统计进行中的任务数"""
+        self.inc(**labels)
+        try:
+            yield
+        finally:
+            self.dec(**labels)
+
+    def samples(self) -> Iterable[str]:
+        if self._function is not None:
+            values = self._function()
+        else:
+            with self._lock:
+                values = dict(self._values)
+        for key, value in sorted(values.items()):
+            yield f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+
+
+class Histogram(_Metric):
+    """累积分桶的直方图"""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # 每组标签: [各桶计数..., 总和, 总数]
+        self._values: Dict[Tuple[str, ...], List[float]] = {}
+
+    def observe(self, value: float, **labels):
+        """
+        记录一次观测值
+
+        Args:
+            value: 观测值
+            **labels: 标签值
+        """
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [0.0] * (len(self.buckets) + 2)
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[i] += 1
+                    break
+            state[-2] += value
+            state[-1] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        """对上下文中的代码计时并记录(秒)"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def samples(self) -> Iterable[str]:
+        with self._lock:
+            values = {key: list(state) for key, state in self._values.items()}
+        for key, state in sorted(values.items()):
+            cumulative = 0.0
+            for bound, count in zip(self.buckets, state):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                yield f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {_format_value(cumulative)}"
+            yield f"{self.name}_bucket{_format_labels(self.labelnames, key, _INF_LABEL)} {_format_value(state[-1])}"
+            yield f"{self.name}_sum{_format_labels(self.labelnames, key)} {_format_value(state[-2])}"
+            yield f"{self.name}_count{_format_labels(self.labelnames, key)} {_format_value(state[-1])}"
+
+
+class MetricsRegistry:
+    """指标登记表"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._metrics: Dict[str, _Metric] = {}
+
+    def register(self, metric: _Metric) -> _Metric:
+        """
+        登记指标，同名指标只登记一次
+
+        Args:
+            metric: 指标对象
+
+        Returns:
+            _Metric: 已登记的指标对象
+        """
+        with self._lock:
+            return self._metrics.setdefault(metric.name, metric)
+
+    def render(self) -> str:
+        """按Prometheus文本格式输出所有指标"""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+# 进程内默认的登记表
+registry = MetricsRegistry()
+
+# Web请求
+WEB_REQUEST_LATENCY = registry.register(Histogram(
+    "news_web_request_duration_seconds", "Web请求处理耗时",
+    ["blueprint", "route", "method", "status"]
+))
+
+# 进行中的任务
+CRAWLS_IN_PROGRESS = registry.register(Gauge("news_crawls_in_progress", "进行中的爬取任务数"))
+ANALYSES_IN_PROGRESS = registry.register(Gauge("news_analyses_in_progress", "进行中的分析任务数"))
+
+# 抓取
+FETCH_REQUESTS = registry.register(Counter("news_fetch_requests_total", "HTTP抓取次数", ["host", "status"]))
+FETCH_BYTES = registry.register(Counter("news_fetch_bytes_total", "HTTP抓取下载的字节数", ["host"]))
+PARSE_LATENCY = registry.register(Histogram("news_parse_duration_seconds", "HTML解析耗时", ["parser"]))
+CHARSET_RESOLVED = registry.register(Counter(
+    "news_charset_resolved_total", "网页编码的确定方式(utf8/bom/header/meta/host/fallback/sniff)", ["source"]
+))
+CIRCUIT_STATE = registry.register(Gauge("news_circuit_state", "域名熔断器状态(0关闭/1半开/2熔断)", ["host"]))
+
+# 定时调度
+SCHEDULER_RUNS = registry.register(Counter("news_scheduler_runs_total", "定时调度运行次数", ["category", "result"]))
+
+# 报告
+REPORT_ARTICLES = registry.register(Counter(
+    "news_report_articles_total", "生成报告时的文章数(mode: full/delta, result: analyzed/skipped)", ["mode", "result"]
+))
+
+# 大模型调用
+LLM_TOKENS = registry.register(Counter("news_llm_tokens_total", "大模型token用量", ["model", "direction"]))
+LLM_LATENCY = registry.register(Histogram("news_llm_request_duration_seconds", "大模型请求耗时", ["model", "outcome"]))
+LLM_PROMPT_TRIMMED = registry.register(Counter(
+    "news_llm_prompt_trimmed_tokens_total", "超出提示词预算被截掉的估算token数", ["model"]
+))
+LLM_QUEUE_WAIT = registry.register(Histogram("news_llm_queue_wait_seconds", "大模型请求在调度器中的排队时间"))
+LLM_RETRIES = registry.register(Counter("news_llm_retries_total", "大模型请求重试次数", ["reason"]))
+LLM_COALESCED = registry.register(Counter("news_llm_coalesced_total", "与执行中的相同请求合并的次数"))
+LLM_BACKEND_REQUESTS = registry.register(Counter(
+    "news_llm_backend_requests_total", "多后端分析时各后端的请求数(outcome: ok/error/cancelled)", ["backend", "outcome"]
+))
+LLM_EXTRA_REQUESTS = registry.register(Counter(
+    "news_llm_extra_requests_total", "多后端分析额外发出的请求数(reason: hedge/failover)", ["reason"]
+))
+
+# 缓存
+CACHE_REQUESTS = registry.register(Counter("news_cache_requests_total", "缓存查询次数", ["cache", "result"]))
+
+
+def _cache_hit_ratios() -> Dict[Tuple[str, ...], float]:
+    """按缓存名称计算命中率"""
+    totals: Dict[str, List[float]] = {}
+    for (cache, result), value in CACHE_REQUESTS.items():
+        hits_total = totals.setdefault(cache, [0.0, 0.0])
+        if result == "hit":
+            hits_total[0] += value
+        hits_total[1] += value
+    return {(cache,): hits / total for cache, (hits, total) in totals.items() if total}
+
+
+CACHE_HIT_RATIO = registry.register(Gauge("news_cache_hit_ratio", "缓存命中率", ["cache"], function=_cache_hit_ratios))
+
+
+def record_cache(cache: str, hit: bool):
+    """
+    记录一次缓存查询
+
+    Args:
+        cache: 缓存名称
+        hit: 是否命中
+    """
+    CACHE_REQUESTS.inc(cache=cache, result="hit" if hit else "miss")
@@ -0,0 +1,136 @@
+#!/usr/bin/env python
+"""
+流式迭代工具模块
+
+把同步迭代器放到后台线程中提前执行，结果经有界队列交给消费者：
+队列满时生产线程阻塞，消费慢时不会无限制地提前爬取和占用内存；
+消费者提前退出时生产线程在下一次放入结果时停止
+"""
+
+import asyncio
+import concurrent.futures
+import queue
+import threading
+from typing import AsyncIterator, Iterable, Iterator, TypeVar
+
+from ..utils.logger import logger
+
+T = TypeVar("T")
+
+# 生产线程检查停止标志的间隔(秒)
+_POLL_INTERVAL = 0.1
+
+# 队列中表示结束的标记
+_DONE = object()
+
+
+class _Failure:
+    """包装生产线程中抛出的异常，交给消费者重新抛出"""
+
+    def __init__(self, error: BaseException):
+        self.error = error
+
+
+def _produce(iterable: Iterable[T], put, stop: threading.Event):
+    """在后台线程中迭代，把每个结果、异常和结束标记依次放入队列"""
+    iterator = iter(iterable)
+    try:
+        for item in iterator:
+            if not put(item) or stop.is_set():
+                return
+        put(_DONE)
+    except BaseException as e:
+        put(_Failure(e))
+    finally:
+        close = getattr(iterator, "close", None)
+        if close is not None:
+            close()
+
+
+def prefetch(iterable: Iterable[T], maxsize: int, name: str = "prefetch") -> Iterator[T]:
+    """
+    在后台线程中提前迭代，最多缓冲maxsize个结果
+
+    Args:
+        iterable: 源迭代器
+        maxsize: 队列容量，不大于0时不使用后台线程，按需逐个迭代
+        name: 后台线程名
+
+    Returns:
+        Iterator[T]: 与源迭代器顺序相同的结果
+    """
+    if maxsize <= 0:
+        yield from iterable
+        return
+
+    buffer: "queue.Queue" = queue.Queue(maxsize=maxsize)
+    stop = threading.Event()
+
+    def put(item) -> bool:
+        while not stop.is_set():
+            try:
+                buffer.put(item, timeout=_POLL_INTERVAL)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    thread = threading.Thread(target=_produce, args=(iterable, put, stop), name=name, daemon=True)
+    thread.start()
+    try:
+        while True:
+            item = buffer.get()
+            if item is _DONE:
+                return
+            if isinstance(item, _Failure):
+                raise item.error
+            yield item
+    finally:
+        stop.set()
+        thread.join()
+
+
+async def aprefetch(iterable: Iterable[T], maxsize: int = 1, name: str = "aprefetch") -> AsyncIterator[T]:
+    """
+    异步版本的prefetch：同步迭代在后台线程中进行，不阻塞事件循环
+
+    Args:
+        iterable: 源迭代器
+        maxsize: 队列容量，至少为1
+        name: 后台线程名
+
+    Returns:
+        AsyncIterator[T]: 与源迭代器顺序相同的结果
+    """
+    loop = asyncio.get_running_loop()
+    buffer: "asyncio.Queue" = asyncio.Queue(maxsize=max(maxsize, 1))
+    stop = threading.Event()
+
+    def put(item) -> bool:
+        future = asyncio.run_coroutine_threadsafe(buffer.put(item), loop)
+        while not stop.is_set():
+            try:
+                future.result(timeout=_POLL_INTERVAL)
+                return True
+            except concurrent.futures.TimeoutError:
+                continue
+            except Exception as e:
+                # 事件循环已关闭
+                logger.debug("流式迭代的事件循环不可用: %s", e)
+                return False
+        future.cancel()
+        return False
+
+    thread = threading.Thread(target=_produce, args=(iterable, put, stop), name=name, daemon=True)
+    thread.start()
+    try:
+        while True:
+            item = await buffer.get()
+            if item is _DONE:
+                return
+            if isinstance(item, _Failure):
+                raise item.error
+            yield item
+    finally:
+        stop.set()
+        await loop.run_in_executor(None, thread.join)
@@ -0,0 +1,189 @@
+#!/usr/bin/env python
+"""
+分阶段计时工具模块
+
+timed既可以作为上下文管理器也可以作为装饰器使用，耗时按阶段聚合成直方图；
+未启用时只做一次布尔判断，开销可以忽略
+"""
+
+import functools
+import math
+import random
+import threading
+import time
+from typing import Dict, List, Optional
+
+from ..config.settings import STAGE_TIMING_ENABLED, STAGE_TIMING_MAX_SAMPLES
+
+
+_enabled = STAGE_TIMING_ENABLED
+
+
+def enable_timing(enabled: bool = True):
+    """
+    开启或关闭分阶段计时
+
+    Args:
+        enabled: 是否开启
+    """
+    global _enabled
+    _enabled = enabled
+
+
+def is_timing_enabled() -> bool:
+    """分阶段计时是否开启"""
+    return _enabled
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """
+    计算已排序序列的百分位数(最近秩法：取第ceil(pct/100*n)个值)
+
+    Args:
+        sorted_values: 升序排列的数值
+        pct: 百分位，0-100
+
+    Returns:
+        float: 百分位数，序列为空时返回0
+    """
+    if not sorted_values:
+        return 0.0
+    # 先乘后除，避免如0.07*100=7.000000000000001被向上取整到8
+    rank = math.ceil(pct * len(sorted_values) / 100.0) - 1
+    return sorted_values[min(max(rank, 0), len(sorted_values) - 1)]
+
+
+class StageStats:
+    """单个阶段的耗时统计，样本数超过上限后使用蓄水池抽样"""
+
+    def __init__(self, max_samples: int = STAGE_TIMING_MAX_SAMPLES):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.bytes = 0
+        self.samples: List[float] = []
+        self.max_samples = max_samples
+
+    def add(self, seconds: float, nbytes: int = 0):
+        """记录一次耗时"""
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+        self.bytes += nbytes
+        if len(self.samples) < self.max_samples:
+            self.samples.append(seconds)
+        else:
+            index = random.randrange(self.count)
+            if index < self.max_samples:
+                self.samples[index] = seconds
+
+    def summary(self) -> Dict[str, float]:
+        """汇总统计结果，耗时单位为毫秒"""
+        ordered = sorted(self.samples)
+        return {
+            "count": self.count,
+            "total_s": round(self.total, 6),
+            "p50_ms": round(percentile(ordered, 50) * 1000, 3),
+            "p95_ms": round(percentile(ordered, 95) * 1000, 3),
+            "p99_ms": round(percentile(ordered, 99) * 1000, 3),
+            "max_ms": round(self.max * 1000, 3),
+            "bytes": self.bytes
+        }
+
+
+class TimingRegistry:
+    """线程安全的分阶段耗时登记表"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stages: Dict[str, StageStats] = {}
+
+    def record(self, stage: str, seconds: float, nbytes: int = 0):
+        """
+        记录某阶段的一次耗时
+
+        Args:
+            stage: 阶段名称
+            seconds: 耗时(秒)
+            nbytes: 该阶段处理的字节数
+        """
+        with self._lock:
+            stats = self._stages.get(stage)
+            if stats is None:
+                stats = self._stages[stage] = StageStats()
+            stats.add(seconds, nbytes)
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """获取所有阶段的统计结果"""
+        with self._lock:
+            return {stage: stats.summary() for stage, stats in sorted(self._stages.items())}
+
+    def reset(self):
+        """清空统计，开始新一轮"""
+        with self._lock:
+            self._stages.clear()
+
+    def format_table(self) -> str:
+        """把统计结果格式化为文本表格"""
+        lines = [f"{'stage':<28}{'count':>8}{'total(s)':>12}{'p50(ms)':>12}{'p95(ms)':>12}{'p99(ms)':>12}{'bytes':>12}"]
+        for stage, stats in self.summary().items():
+            lines.append(
+                f"{stage:<28}{stats['count']:>8}{stats['total_s']:>12.3f}"
+                f"{stats['p50_ms']:>12.1f}{stats['p95_ms']:>12.1f}{stats['p99_ms']:>12.1f}{stats['bytes']:>12}"
+            )
+        return "\n".join(lines)
+
+
+# 进程内默认的登记表
+registry = TimingRegistry()
+
+
+class timed:
+    """
+    阶段计时器
+
+    用法:
+        with timed("get_soup") as timer:
+            ...
+            timer.add_bytes(len(content))
+
+        @timed("analyze")
+        def analyze(...):
+            ...
+    """
+
+    __slots__ = ("stage", "nbytes", "_start")
+
+    def __init__(self, stage: str):
+        self.stage = stage
+        self.nbytes = 0
+        self._start: Optional[float] = None
+
+    def add_bytes(self, nbytes: int):
+        """记录本阶段处理的字节数"""
+        self.nbytes += nbytes
+
+    def __enter__(self) -> "timed":
+        if _enabled:
+            self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if self._start is not None:
+            registry.record(self.stage, time.perf_counter() - self._start, self.nbytes)
+            self._start = None
+
+    def __call__(self, func):
+        stage = self.stage
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                registry.record(stage, time.perf_counter() - start)
+
+        return wrapper
@@ -0,0 +1,74 @@
+#!/usr/bin/env python
+"""
+本地token估算工具模块
+
+按字符类别加权估算token数，不依赖分词器：中日韩字符(含全角标点)
+约0.6个token，其他字符约0.3个token，与DeepSeek官方给出的换算比例一致。
+中英文混排的新闻正文误差通常在10%以内，调用方应预留安全余量
+"""
+
+import math
+import re
+
+from ..config.settings import TOKENS_PER_CJK_CHAR, TOKENS_PER_OTHER_CHAR
+
+# 中日韩部首、符号与标点、假名、统一汉字、谚文、兼容汉字、全角字符
+_CJK_RE = re.compile(r"[\u2e80-\u9fff\uac00-\ud7af\uf900-\ufaff\uff00-\uffef]")
+
+# 截断时优先停在这些字符之后
+_SENTENCE_ENDINGS = "。！？；!?;\n"
+
+TRUNCATION_MARKER = "……(内容过长，已截断)"
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    估算文本的token数
+
+    Args:
+        text: 文本
+
+    Returns:
+        int: 估算的token数(向上取整)
+    """
+    if not text:
+        return 0
+    cjk = len(_CJK_RE.findall(text))
+    return int(math.ceil(cjk * TOKENS_PER_CJK_CHAR + (len(text) - cjk) * TOKENS_PER_OTHER_CHAR))
+
+
+def truncate_to_tokens(text: str, max_tokens: int, marker: str = TRUNCATION_MARKER) -> str:
+    """
+    把文本截断到不超过max_tokens，尽量停在句末
+
+    Args:
+        text: 文本
+        max_tokens: token上限(包括截断标记)
+        marker: 追加在截断处的标记
+
+    Returns:
+        str: 截断后的文本，未超过上限时原样返回
+    """
+    if estimate_tokens(text) <= max_tokens:
+        return text
+
+    budget = max_tokens - estimate_tokens(marker)
+    if budget <= 0:
+        return ""
+
+    # 二分查找满足预算的最长前缀
+    lo, hi = 0, len(text)
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if estimate_tokens(text[:mid]) <= budget:
+            lo = mid
+        else:
+            hi = mid - 1
+    head = text[:lo]
+
+    # 句末在最后20%以内时退到句末，避免留下半句话
+    boundary = max(head.rfind(ch) for ch in _SENTENCE_ENDINGS)
+    if boundary >= 0 and boundary + 1 >= lo * 0.8:
+        head = head[:boundary + 1]
+
+    return head.rstrip() + marker
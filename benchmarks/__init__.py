@@ -0,0 +1,3 @@
+"""
+离线性能基准测试
+"""
@@ -0,0 +1,207 @@
+#!/usr/bin/env python
+"""
+分析器并发压测
+
+默认在本地启动模拟LLM服务，用N个并发任务反复调用DeepSeekAnalyzer.analyze，
+输出吞吐量、成功率和尾延迟(JSON)；指定--backends时启动多个模拟服务，改用MultiBackendAnalyzer
+
+用法:
+    python -m benchmarks.bench_analyzer --jobs 40 --concurrency 8 --stream --error-429 0.1
+    python -m benchmarks.bench_analyzer --base-url http://127.0.0.1:8808/v1 --jobs 20
+    python -m benchmarks.bench_analyzer --jobs 4 --articles 60 --topics 5 --no-cluster
+    python -m benchmarks.bench_analyzer --jobs 40 --concurrency 16 --llm-concurrency 4 --rpm 600 --error-429 0.1
+    # 3个后端，其中1个一直返回500，其余5%的请求挂起，对比开关对冲的尾延迟
+    python -m benchmarks.bench_analyzer --jobs 60 --backends 3 --down-backends 1 --timeout-rate 0.05 --stream
+    python -m benchmarks.bench_analyzer --jobs 60 --backends 3 --down-backends 1 --timeout-rate 0.05 --stream --no-hedge
+"""
+
+import argparse
+import logging
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+
+def parse_args():
+    """解析命令行参数"""
+    parser = argparse.ArgumentParser(description="分析器并发压测")
+    parser.add_argument("--jobs", type=int, default=20, help="报告任务总数")
+    parser.add_argument("--concurrency", type=int, default=4, help="并发任务数")
+    parser.add_argument("--articles", type=int, default=5, help="每个任务的文章数")
+    parser.add_argument("--article-chars", type=int, default=1500, help="每篇文章的正文长度")
+    parser.add_argument("--topics", type=int, default=1, help="文章的主题数，大于1时各主题正文不同")
+    parser.add_argument("--no-cluster", action="store_true", help="关闭主题聚类，所有文章放入一个请求")
+    parser.add_argument("--stream", action="store_true", help="使用流式输出")
+    parser.add_argument("--no-scheduler", action="store_true", help="不经调度器，由openai客户端自行重试")
+    parser.add_argument("--llm-concurrency", type=int, default=None, help="调度器并发上限，默认等于--concurrency")
+    parser.add_argument("--rpm", type=float, default=0.0, help="调度器每分钟请求数上限，0表示不限制")
+    parser.add_argument("--tpm", type=float, default=0.0, help="调度器每分钟token数上限，0表示不限制")
+    parser.add_argument("--base-url", default=None, help="使用已有的服务，不启动模拟服务")
+    parser.add_argument("--backends", type=int, default=0, help="启动的模拟服务数，大于0时使用多后端分析器")
+    parser.add_argument("--down-backends", type=int, default=0, help="其中一直返回500的模拟服务数")
+    parser.add_argument("--no-hedge", action="store_true", help="多后端分析器不发出对冲请求")
+    parser.add_argument("--latency", type=float, default=0.1, help="模拟服务首包延迟(秒)")
+    parser.add_argument("--tps", type=float, default=200.0, help="模拟服务输出速度(tokens/秒)")
+    parser.add_argument("--output-tokens", type=int, default=200, help="模拟服务输出token数")
+    parser.add_argument("--error-429", type=float, default=0.0, help="模拟服务返回429的概率")
+    parser.add_argument("--error-500", type=float, default=0.0, help="模拟服务返回500的概率")
+    parser.add_argument("--timeout-rate", type=float, default=0.0, help="模拟服务挂起的概率")
+    parser.add_argument("--timeout-seconds", type=float, default=30.0, help="模拟服务挂起的时长(秒)")
+    parser.add_argument("--output", type=Path, default=None, help="结果JSON文件，默认输出到标准输出")
+    return parser.parse_args()
+
+
+# 多主题压测时各主题正文使用的句子
+_TOPIC_SENTENCES = [
+    "央行宣布下调存款准备金率，银行板块领涨。",
+    "国家队在预选赛中取得胜利，主教练称赞防守。",
+    "新款手机搭载自研芯片，人工智能应用加速落地。",
+    "台风即将登陆沿海地区，气象台发布暴雨预警。",
+    "新能源汽车销量创新高，动力电池产能持续扩张。",
+    "多地出台楼市新政，二手房成交量明显回升。",
+    "国际油价大幅波动，原油库存意外增加。",
+    "高校毕业生规模再创新高，就业服务平台上线。"
+]
+
+
+def make_articles(count: int, chars: int, job: int, topics: int = 1):
+    """生成压测用的文章，不同任务的内容不同，避免命中缓存"""
+    from app.models.article import Article
+
+    articles = []
+    for i in range(count):
+        sentence = "这是一段用于压测的新闻正文。"
+        if topics > 1:
+            sentence = _TOPIC_SENTENCES[i % min(topics, len(_TOPIC_SENTENCES))]
+        body = (sentence * (chars // len(sentence) + 1))[:chars]
+        articles.append(Article(
+            title=f"压测文章 {job}-{i}",
+            url=f"https://example.com/{job}/{i}",
+            content=body,
+            source="bench",
+            category="财经",
+            published_time=datetime(2025, 5, 8, 12, 0)
+        ))
+    return articles
+
+
+def run_jobs(analyzer, args):
+    """
+    并发运行报告任务
+
+    Returns:
+        Tuple[List[float], int, float]: 成功任务的耗时样本、失败数、总耗时
+    """
+    from benchmarks.common import time_call
+
+    def job(index: int):
+        result, elapsed = time_call(analyzer.analyze, make_articles(args.articles, args.article_chars, index, args.topics))
+        return result is not None, elapsed
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+        outcomes = list(executor.map(job, range(args.jobs)))
+    wall = time.perf_counter() - start
+
+    samples = [elapsed for ok, elapsed in outcomes if ok]
+    failures = sum(1 for ok, _ in outcomes if not ok)
+    return samples, failures, wall
+
+
+def main() -> int:
+    """主函数"""
+    args = parse_args()
+
+    from app.analyzers.deepseek_analyzer import DeepSeekAnalyzer
+    from app.analyzers.llm_scheduler import LLMScheduler
+    from app.analyzers.multi_backend_analyzer import LLMBackend, MultiBackendAnalyzer
+    from app.utils.logger import logger
+    from benchmarks.common import summarize, write_results
+    from benchmarks.mock_llm_server import MockLLMServer
+
+    logger.setLevel(logging.WARNING)
+
+    server = None
+    backend_servers = []
+    base_url = args.base_url
+    if args.backends > 0:
+        for index in range(args.backends):
+            down = index < args.down_backends
+            backend_servers.append(MockLLMServer(
+                latency=args.latency,
+                tokens_per_sec=args.tps,
+                output_tokens=args.output_tokens,
+                error_429=0.0 if down else args.error_429,
+                error_500=1.0 if down else args.error_500,
+                timeout_rate=0.0 if down else args.timeout_rate,
+                timeout_seconds=args.timeout_seconds,
+                seed=index
+            ).start())
+        base_url = ",".join(backend.base_url for backend in backend_servers)
+    elif base_url is None:
+        server = MockLLMServer(
+            latency=args.latency,
+            tokens_per_sec=args.tps,
+            output_tokens=args.output_tokens,
+            error_429=args.error_429,
+            error_500=args.error_500,
+            timeout_rate=args.timeout_rate,
+            timeout_seconds=args.timeout_seconds
+        ).start()
+        base_url = server.base_url
+
+    try:
+        scheduler = None
+        if not args.no_scheduler:
+            scheduler = LLMScheduler(
+                max_concurrency=args.llm_concurrency or args.concurrency,
+                requests_per_minute=args.rpm,
+                tokens_per_minute=args.tpm
+            )
+        if backend_servers:
+            analyzer = MultiBackendAnalyzer(
+                backends=[
+                    LLMBackend(f"mock{index}", backend.base_url, "mock", "mock-key")
+                    for index, backend in enumerate(backend_servers)
+                ],
+                hedge=not args.no_hedge, stream=args.stream, cluster=not args.no_cluster,
+                scheduler=scheduler, use_scheduler=not args.no_scheduler
+            )
+        else:
+            analyzer = DeepSeekAnalyzer(
+                api_key="mock-key", base_url=base_url, stream=args.stream, cluster=not args.no_cluster,
+                scheduler=scheduler, use_scheduler=not args.no_scheduler
+            )
+        samples, failures, wall = run_jobs(analyzer, args)
+    finally:
+        if server is not None:
+            server.stop()
+        for backend in backend_servers:
+            backend.stop()
+
+    results = {
+        "analyze": summarize(
+            samples,
+            failures=failures,
+            success_rate=round(len(samples) / args.jobs, 3) if args.jobs else 0.0,
+            wall_s=round(wall, 3),
+            jobs_per_s=round(len(samples) / wall, 3) if wall else 0.0
+        )
+    }
+    write_results(
+        args.output, "analyzer", results,
+        base_url=base_url, jobs=args.jobs, concurrency=args.concurrency, stream=args.stream,
+        articles=args.articles, topics=args.topics, cluster=not args.no_cluster,
+        scheduler=not args.no_scheduler, llm_concurrency=args.llm_concurrency, rpm=args.rpm, tpm=args.tpm,
+        server_status=server.status_counts if server else None,
+        backends=args.backends, down_backends=args.down_backends, hedge=not args.no_hedge,
+        backend_status=[backend.status_counts for backend in backend_servers] or None,
+        backend_states=analyzer.backend_states() if backend_servers else None
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
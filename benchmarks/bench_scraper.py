@@ -0,0 +1,259 @@
+#!/usr/bin/env python
+"""
+爬虫与提取器的离线基准测试
+
+用法:
+    # 录制：访问真实的新浪页面，把响应保存进夹具归档
+    python -m benchmarks.bench_scraper record --categories 财经 科技 --limit 10
+
+    # 回放：从归档读取响应，输出JSON格式的基准测试结果
+    python -m benchmarks.bench_scraper run --repeat 3 --output bench.json
+
+    # 对比两次结果
+    python -m benchmarks.bench_scraper compare base.json bench.json
+"""
+
+import argparse
+import logging
+import os
+import sys
+import time
+from pathlib import Path
+
+DEFAULT_ARCHIVE = Path(__file__).parent / "fixtures" / "sina.zip"
+EXTRACT_METHODS = ["extract_title", "extract_content", "extract_publish_time", "extract_author"]
+
+
+def parse_args():
+    """解析命令行参数"""
+    parser = argparse.ArgumentParser(description="爬虫与提取器离线基准测试")
+    subparsers = parser.add_subparsers(dest="mode", required=True)
+
+    record = subparsers.add_parser("record", help="录制真实响应到夹具归档")
+    record.add_argument("--archive", type=Path, default=DEFAULT_ARCHIVE, help="夹具归档路径")
+    record.add_argument("--categories", nargs="+", default=None, help="要录制的分类，默认全部")
+    record.add_argument("--limit", type=int, default=10, help="每个分类录制的文章数量")
+
+    run = subparsers.add_parser("run", help="回放夹具归档并运行基准测试")
+    run.add_argument("--archive", type=Path, default=DEFAULT_ARCHIVE, help="夹具归档路径")
+    run.add_argument("--categories", nargs="+", default=None, help="要测试的分类，默认全部")
+    run.add_argument("--limit", type=int, default=10, help="每个分类爬取的文章数量，应与录制时一致")
+    run.add_argument("--repeat", type=int, default=3, help="每项测试重复次数")
+    run.add_argument("--output", type=Path, default=None, help="结果JSON文件，默认输出到标准输出")
+
+    compare = subparsers.add_parser("compare", help="对比两次基准测试结果")
+    compare.add_argument("baseline", type=Path, help="基线结果JSON")
+    compare.add_argument("current", type=Path, help="当前结果JSON")
+    compare.add_argument("--metric", default="p50_ms", help="对比的指标")
+
+    return parser.parse_args()
+
+
+def record(args) -> int:
+    """录制分类页、滚动接口和文章页的响应"""
+    from app.config.settings import SINA_CATEGORIES
+    from app.scrapers.sina_scraper import SinaScraper
+    from benchmarks.fixtures import FixtureArchive, recording
+
+    archive = FixtureArchive()
+    categories = args.categories or list(SINA_CATEGORIES.keys())
+
+    with recording(archive):
+        for category in categories:
+            scraper = SinaScraper()
+            articles = scraper.scrape_category(category, limit=args.limit)
+            print(f"{category}: 录制 {len(articles)} 篇文章")
+
+    archive.save(args.archive)
+    print(f"共录制 {len(archive.index)} 个响应到 {args.archive}")
+    return 0
+
+
+def run(args) -> int:
+    """回放夹具并运行各项基准测试"""
+    from bs4 import BeautifulSoup
+
+    from app.config.settings import SINA_CATEGORIES, SINA_ROLL_API_URL
+    from app.extractors.density_extractor import DensityExtractor
+    from app.extractors.sina_extractor import SinaExtractor
+    from app.extractors.template_cache import TemplateCache
+    from app.scrapers.discovery import is_sina_article_url
+    from app.scrapers.sina_scraper import SinaScraper
+    from app.utils.charset import decode_html
+    from app.utils.http import get_soup
+    from app.utils.logger import logger
+    from benchmarks.common import summarize, time_call, write_results
+    from benchmarks.fixtures import FixtureArchive, replaying
+
+    if not args.archive.exists():
+        print(f"夹具归档不存在: {args.archive}，请先运行 record 模式")
+        return 1
+
+    # 日志I/O会干扰计时，只保留警告以上
+    logger.setLevel(logging.WARNING)
+
+    archive = FixtureArchive.load(args.archive)
+    categories = args.categories or list(SINA_CATEGORIES.keys())
+    article_urls = [
+        url for url in archive.urls()
+        if is_sina_article_url(url)
+        and not url.startswith(SINA_ROLL_API_URL)
+        and archive.get(url)["status"] == 200
+    ]
+    results = {}
+
+    with replaying(archive) as adapter:
+        # get_soup: 回放下载 + HTML解析
+        samples = []
+        soups = []
+        soup_urls = []
+        total_bytes = 0
+        for round_index in range(args.repeat):
+            for url in article_urls:
+                soup, elapsed = time_call(get_soup, url, max_retries=1)
+                samples.append(elapsed)
+                if round_index == 0 and soup is not None:
+                    soups.append(soup)
+                    soup_urls.append(url)
+                    total_bytes += len(archive.get(url)["content"])
+        results["get_soup"] = summarize(samples, pages=len(article_urls), bytes=total_bytes)
+
+        # parse.bytes 与 parse.decoded: 交给BeautifulSoup识别编码 与 预先解码后再解析(含解码耗时)
+        title_extractor = SinaExtractor()
+        titles = {}
+        for mode in ("bytes", "decoded"):
+            samples = []
+            agree = 0
+            for round_index in range(args.repeat):
+                for url in article_urls:
+                    entry = archive.get(url)
+                    content_type = next((v for k, v in entry["headers"].items() if k.lower() == "content-type"), None)
+                    start = time.perf_counter()
+                    markup = entry["content"] if mode == "bytes" else decode_html(entry["content"], content_type, url)
+                    soup = BeautifulSoup(markup, "html5lib")
+                    samples.append(time.perf_counter() - start)
+                    if round_index == 0:
+                        title = title_extractor.extract_title(soup)
+                        agree += 1 if titles.setdefault(url, title) == title else 0
+            results[f"parse.{mode}"] = summarize(
+                samples, title_agreement=round(agree / len(article_urls), 3) if article_urls else 0.0
+            )
+
+        # extract_*: 在已解析的页面上单独测量每个提取方法
+        extractor = SinaExtractor()
+        for method_name in EXTRACT_METHODS:
+            method = getattr(extractor, method_name)
+            samples = []
+            hits = 0
+            for _ in range(args.repeat):
+                for soup in soups:
+                    value, elapsed = time_call(method, soup)
+                    samples.append(elapsed)
+                    hits += 1 if value else 0
+            results[f"extractor.{method_name}"] = summarize(
+                samples, success_rate=round(hits / len(samples), 3) if samples else 0.0
+            )
+
+        # extractor.density.*: 文本密度提取器的耗时，以及与选择器提取结果的一致程度
+        # (标题相同的比例、选择器提取到的正文段落被找回的比例)
+        reference = SinaExtractor(learn_templates=False)
+        density = DensityExtractor()
+        for method_name in ("extract_title", "extract_content"):
+            samples = []
+            agree = 0.0
+            for round_index in range(args.repeat):
+                for soup in soups:
+                    value, elapsed = time_call(getattr(density, method_name), soup)
+                    samples.append(elapsed)
+                    if round_index > 0:
+                        continue
+                    expected = getattr(reference, method_name)(soup)
+                    if method_name == "extract_title":
+                        agree += 1 if value == expected else 0
+                    elif expected:
+                        paragraphs = set(expected.split("\n\n"))
+                        agree += len(paragraphs & set(value.split("\n\n"))) / len(paragraphs)
+            metric = "title_agreement" if method_name == "extract_title" else "content_recall"
+            results[f"extractor.density.{method_name}"] = summarize(
+                samples, **{metric: round(agree / len(soups), 3) if soups else 0.0}
+            )
+
+        # extractor.templates: 标题+正文，固定顺序尝试全部选择器 与 先试学到的模板(第一轮用于学习，不计时)
+        for mode in ("off", "learned"):
+            extractor = SinaExtractor(templates=TemplateCache(path=None), learn_templates=mode == "learned")
+            for soup, url in zip(soups, soup_urls):
+                extractor.extract_title(soup, url)
+                extractor.extract_content(soup, url)
+            samples = []
+            for _ in range(args.repeat):
+                for soup, url in zip(soups, soup_urls):
+                    start = time.perf_counter()
+                    extractor.extract_title(soup, url)
+                    extractor.extract_content(soup, url)
+                    samples.append(time.perf_counter() - start)
+            results[f"extractor.templates.{mode}"] = summarize(samples)
+
+        # get_article_urls 与 scrape_category: 按分类测量
+        for category in categories:
+            category_url = SINA_CATEGORIES[category]
+
+            samples = []
+            found = 0
+            for _ in range(args.repeat):
+                urls, elapsed = time_call(SinaScraper().get_article_urls, category_url, args.limit)
+                samples.append(elapsed)
+                found = len(urls)
+            results[f"get_article_urls.{category}"] = summarize(samples, urls=found)
+
+            samples = []
+            scraped = 0
+            for _ in range(args.repeat):
+                articles, elapsed = time_call(SinaScraper().scrape_category, category, args.limit)
+                samples.append(elapsed)
+                scraped = len(articles)
+            summary = summarize(samples, articles=scraped)
+            summary["articles_per_s"] = round(scraped / (summary["total_s"] / len(samples)), 3) if scraped else 0.0
+            results[f"scrape_category.{category}"] = summary
+
+            # iter_category: 流式爬取时第一篇文章的到达时间
+            samples = []
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                for _article in SinaScraper().iter_category(category, args.limit):
+                    break
+                samples.append(time.perf_counter() - start)
+            results[f"iter_category.first_article.{category}"] = summarize(samples)
+
+        misses = adapter.misses
+
+    write_results(
+        args.output, "scraper", results,
+        archive=str(args.archive), repeat=args.repeat, limit=args.limit, fixture_misses=misses
+    )
+    return 0
+
+
+def main() -> int:
+    """主函数"""
+    args = parse_args()
+
+    if args.mode == "compare":
+        from benchmarks.common import compare_results
+        print("\n".join(compare_results(args.baseline, args.current, args.metric)))
+        return 0
+
+    if args.mode == "run":
+        # 回放时不需要礼貌性延迟，必须在导入app之前设置
+        os.environ.setdefault("REQUEST_DELAY_SCALE", "0")
+        # 夹具对未录制的URL返回404，不能写入实际爬取使用的负缓存；
+        # 熔断和模板学习也会让结果依赖之前留下的状态(模板的基准测试自行创建内存中的缓存)
+        os.environ.setdefault("NEGATIVE_CACHE", "0")
+        os.environ.setdefault("CIRCUIT_BREAKER", "0")
+        os.environ.setdefault("EXTRACTOR_TEMPLATES", "0")
+        return run(args)
+
+    return record(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
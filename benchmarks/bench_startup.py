@@ -0,0 +1,146 @@
+#!/usr/bin/env python
+"""
+启动耗时基准测试
+
+每次在新的Python进程中用 -X importtime 运行一个启动场景，
+统计进程总耗时和导入耗时，并列出导入最慢的顶层模块
+
+用法:
+    python -m benchmarks.bench_startup run --repeat 10 --output startup.json
+    python -m benchmarks.bench_startup compare base.json startup.json
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+
+# 场景名称 -> 命令行参数(不含解释器)
+SCENARIOS = {
+    "cli_help": ["main.py", "--help"],
+    "web_cold_start": ["-c", "from web import create_app; create_app()"]
+}
+
+# 启动阶段不应加载的重依赖
+HEAVY_MODULES = ["openai", "bs4", "requests", "lxml", "html5lib"]
+
+
+def parse_args():
+    """解析命令行参数"""
+    parser = argparse.ArgumentParser(description="启动耗时基准测试")
+    subparsers = parser.add_subparsers(dest="mode", required=True)
+
+    run = subparsers.add_parser("run", help="运行启动场景")
+    run.add_argument("--scenarios", nargs="+", choices=list(SCENARIOS), default=None, help="要运行的场景，默认全部")
+    run.add_argument("--repeat", type=int, default=5, help="每个场景运行的次数")
+    run.add_argument("--top", type=int, default=10, help="列出导入最慢的顶层模块数量")
+    run.add_argument("--output", type=Path, default=None, help="结果JSON文件，默认输出到标准输出")
+
+    compare = subparsers.add_parser("compare", help="对比两次基准测试结果")
+    compare.add_argument("baseline", type=Path, help="基线结果JSON")
+    compare.add_argument("current", type=Path, help="当前结果JSON")
+    compare.add_argument("--metric", default="p50_ms", help="对比的指标")
+
+    return parser.parse_args()
+
+
+def parse_importtime(stderr: str) -> Tuple[int, Dict[str, int], List[str]]:
+    """
+    解析 -X importtime 的输出
+
+    每行格式为 "import time: self [us] | cumulative | imported package"，
+    模块名前的缩进表示嵌套层级，没有缩进的是顶层导入
+
+    Args:
+        stderr: 子进程的标准错误输出
+
+    Returns:
+        Tuple: 顶层导入的累计耗时(微秒)、各顶层模块的累计耗时、所有已导入的模块名
+    """
+    total = 0
+    top_level: Dict[str, int] = {}
+    modules: List[str] = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3 or not parts[1].strip().isdigit():
+            continue
+        cumulative = int(parts[1])
+        name = parts[2].rstrip()
+        module = name.strip()
+        modules.append(module)
+        if name.startswith(" ") and not name.startswith("  "):
+            top_level[module] = top_level.get(module, 0) + cumulative
+            total += cumulative
+    return total, top_level, modules
+
+
+def run_scenario(argv: List[str]) -> Tuple[float, str]:
+    """
+    在新进程中运行一次启动场景
+
+    Returns:
+        Tuple[float, str]: 进程总耗时(秒)和标准错误输出
+    """
+    env = dict(os.environ)
+    env.pop("PYTHONPROFILEIMPORTTIME", None)
+    start = time.perf_counter()
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", *argv],
+        cwd=ROOT_DIR, env=env, capture_output=True, text=True
+    )
+    elapsed = time.perf_counter() - start
+    if completed.returncode != 0:
+        raise RuntimeError(f"场景运行失败({completed.returncode}): {completed.stderr[-500:]}")
+    return elapsed, completed.stderr
+
+
+def run(args) -> int:
+    """运行各启动场景"""
+    from benchmarks.common import summarize, write_results
+
+    results = {}
+    for name in args.scenarios or list(SCENARIOS):
+        wall_samples = []
+        import_samples = []
+        top_level: Dict[str, int] = {}
+        modules: List[str] = []
+        for _ in range(args.repeat):
+            elapsed, stderr = run_scenario(SCENARIOS[name])
+            total, top_level, modules = parse_importtime(stderr)
+            wall_samples.append(elapsed)
+            import_samples.append(total / 1e6)
+
+        slowest = sorted(top_level.items(), key=lambda item: item[1], reverse=True)[:args.top]
+        results[f"{name}.wall"] = summarize(wall_samples)
+        results[f"{name}.imports"] = summarize(
+            import_samples,
+            modules=len(modules),
+            heavy_modules=[module for module in HEAVY_MODULES if module in modules],
+            slowest_ms={module: round(us / 1000, 3) for module, us in slowest}
+        )
+
+    write_results(args.output, "startup", results, repeat=args.repeat, executable=sys.executable)
+    return 0
+
+
+def main() -> int:
+    """主函数"""
+    args = parse_args()
+
+    if args.mode == "compare":
+        from benchmarks.common import compare_results
+        print("\n".join(compare_results(args.baseline, args.current, args.metric)))
+        return 0
+
+    return run(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
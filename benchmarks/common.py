@@ -0,0 +1,117 @@
+#!/usr/bin/env python
+"""
+基准测试公共工具：计时统计与JSON结果输出
+"""
+
+import json
+import platform
+import subprocess
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from app.utils.timing import percentile
+
+
+def summarize(samples: List[float], **extra) -> Dict[str, float]:
+    """
+    汇总一组耗时样本
+
+    Args:
+        samples: 耗时样本(秒)
+        **extra: 附加到结果中的字段(如字节数、条目数)
+
+    Returns:
+        Dict[str, float]: 次数、总耗时和各百分位耗时(毫秒)
+    """
+    ordered = sorted(samples)
+    total = sum(ordered)
+    result = {
+        "count": len(ordered),
+        "total_s": round(total, 6),
+        "mean_ms": round(total / len(ordered) * 1000, 3) if ordered else 0.0,
+        "p50_ms": round(percentile(ordered, 50) * 1000, 3),
+        "p95_ms": round(percentile(ordered, 95) * 1000, 3),
+        "p99_ms": round(percentile(ordered, 99) * 1000, 3),
+        "max_ms": round(ordered[-1] * 1000, 3) if ordered else 0.0
+    }
+    result.update(extra)
+    return result
+
+
+def time_call(func: Callable, *args, **kwargs):
+    """
+    调用函数并计时
+
+    Returns:
+        Tuple[Any, float]: 函数返回值和耗时(秒)
+    """
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def git_commit() -> Optional[str]:
+    """获取当前git提交，不在git仓库中则返回None"""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def write_results(path: Optional[Path], suite: str, results: Dict[str, dict], **meta) -> dict:
+    """
+    输出机器可读的基准测试结果
+
+    Args:
+        path: 输出JSON文件路径，为None时打印到标准输出
+        suite: 基准测试套件名称
+        results: 各项基准测试的统计结果
+        **meta: 附加的元信息
+
+    Returns:
+        dict: 完整的结果文档
+    """
+    document = {
+        "suite": suite,
+        "commit": git_commit(),
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "meta": meta,
+        "results": results
+    }
+    text = json.dumps(document, ensure_ascii=False, indent=2)
+    if path is None:
+        print(text)
+    else:
+        Path(path).write_text(text, encoding="utf-8")
+    return document
+
+
+def compare_results(baseline_path: Path, current_path: Path, metric: str = "p50_ms") -> List[str]:
+    """
+    对比两次基准测试结果
+
+    Args:
+        baseline_path: 基线结果JSON
+        current_path: 当前结果JSON
+        metric: 对比的指标
+
+    Returns:
+        List[str]: 每项基准测试一行的对比结果
+    """
+    baseline = json.loads(Path(baseline_path).read_text(encoding="utf-8"))
+    current = json.loads(Path(current_path).read_text(encoding="utf-8"))
+    lines = [f"{'benchmark':<40} {'baseline':>12} {'current':>12} {'ratio':>8}"]
+    for name, stats in current["results"].items():
+        old = baseline["results"].get(name, {}).get(metric)
+        new = stats.get(metric)
+        if old is None or new is None:
+            continue
+        ratio = new / old if old else float("inf")
+        lines.append(f"{name:<40} {old:>12.3f} {new:>12.3f} {ratio:>8.2f}")
+    return lines
@@ -0,0 +1,177 @@
+#!/usr/bin/env python
+"""
+HTTP响应夹具的录制与回放
+
+录制模式在共享会话上挂载RecordingAdapter，真实请求的响应被保存进zip归档；
+回放模式挂载FixtureAdapter，从归档中返回响应，不访问网络
+"""
+
+import hashlib
+import io
+import json
+import zipfile
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, Optional
+
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+from app.utils.http import get_session
+
+
+# 回放时不能保留的响应头，正文已经是解压后的字节
+_DROPPED_HEADERS = {"content-encoding", "content-length", "transfer-encoding"}
+
+
+class FixtureArchive:
+    """
+    响应夹具归档
+    zip中index.json记录URL到状态码、响应头和正文文件的映射，正文存放在bodies/目录下
+    """
+
+    def __init__(self):
+        """初始化空归档"""
+        self.index: Dict[str, dict] = {}
+        self.bodies: Dict[str, bytes] = {}
+
+    def add(self, url: str, status_code: int, headers: Dict[str, str], content: bytes):
+        """
+        加入一条响应
+
+        Args:
+            url: 请求URL(包含查询参数)
+            status_code: 状态码
+            headers: 响应头
+            content: 解压后的响应正文
+        """
+        name = "bodies/" + hashlib.sha1(url.encode("utf-8")).hexdigest() + ".bin"
+        self.index[url] = {
+            "status": status_code,
+            "headers": {k: v for k, v in headers.items() if k.lower() not in _DROPPED_HEADERS},
+            "body": name
+        }
+        self.bodies[name] = content
+
+    def get(self, url: str) -> Optional[dict]:
+        """
+        查找URL对应的响应
+
+        Args:
+            url: 请求URL
+
+        Returns:
+            Optional[dict]: 包含status/headers/content的字典，未录制则返回None
+        """
+        entry = self.index.get(url)
+        if entry is None:
+            return None
+        return {
+            "status": entry["status"],
+            "headers": entry["headers"],
+            "content": self.bodies[entry["body"]]
+        }
+
+    def urls(self) -> Iterator[str]:
+        """遍历已录制的URL"""
+        return iter(self.index)
+
+    def save(self, path: Path):
+        """
+        保存归档
+
+        Args:
+            path: zip文件路径
+        """
+        path = Path(path)
+        path.parent.mkdir(exist_ok=True, parents=True)
+        with zipfile.ZipFile(path, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+            zf.writestr("index.json", json.dumps(self.index, ensure_ascii=False, indent=2))
+            for name, content in self.bodies.items():
+                zf.writestr(name, content)
+
+    @classmethod
+    def load(cls, path: Path) -> "FixtureArchive":
+        """
+        加载归档
+
+        Args:
+            path: zip文件路径
+
+        Returns:
+            FixtureArchive: 归档对象
+        """
+        archive = cls()
+        with zipfile.ZipFile(path) as zf:
+            archive.index = json.loads(zf.read("index.json").decode("utf-8"))
+            for entry in archive.index.values():
+                archive.bodies[entry["body"]] = zf.read(entry["body"])
+        return archive
+
+
+class RecordingAdapter(HTTPAdapter):
+    """透传真实请求，并把每个响应记录进归档"""
+
+    def __init__(self, archive: FixtureArchive, **kwargs):
+        super().__init__(**kwargs)
+        self.archive = archive
+
+    def send(self, request, **kwargs):
+        response = super().send(request, **kwargs)
+        # 录制需要完整正文，流式请求也在这里读完
+        self.archive.add(request.url, response.status_code, dict(response.headers), response.content)
+        return response
+
+
+class FixtureAdapter(BaseAdapter):
+    """从归档返回响应的传输适配器，未录制的URL返回404"""
+
+    def __init__(self, archive: FixtureArchive):
+        super().__init__()
+        self.archive = archive
+        self.misses = 0
+
+    def send(self, request, **kwargs):
+        entry = self.archive.get(request.url)
+        if entry is None:
+            self.misses += 1
+            entry = {"status": 404, "headers": {}, "content": b""}
+
+        response = requests.Response()
+        response.status_code = entry["status"]
+        response.headers = CaseInsensitiveDict(entry["headers"])
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.raw = io.BytesIO(entry["content"])
+        response.url = request.url
+        response.request = request
+        response.reason = "OK" if entry["status"] == 200 else ""
+        return response
+
+    def close(self):
+        pass
+
+
+@contextmanager
+def _mounted(adapter: BaseAdapter):
+    """在共享会话上临时挂载适配器"""
+    session = get_session()
+    previous = {prefix: session.adapters[prefix] for prefix in ("http://", "https://")}
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    try:
+        yield adapter
+    finally:
+        for prefix, original in previous.items():
+            session.mount(prefix, original)
+
+
+def recording(archive: FixtureArchive):
+    """录制模式上下文：真实请求的响应被写入archive"""
+    return _mounted(RecordingAdapter(archive))
+
+
+def replaying(archive: FixtureArchive):
+    """回放模式上下文：所有请求从archive返回，不访问网络"""
+    return _mounted(FixtureAdapter(archive))
@@ -0,0 +1,296 @@
+#!/usr/bin/env python
+"""
+兼容OpenAI接口的本地模拟LLM服务，用于分析器的离线压测
+
+实现 POST /v1/chat/completions 的流式与非流式两种响应，
+可配置首包延迟、输出速度(tokens/秒)和错误注入(429/500/超时)；
+相同的请求消息总是得到相同的输出
+
+用法:
+    python -m benchmarks.mock_llm_server --port 8808 --latency 0.2 --tps 200 --error-429 0.05
+"""
+
+import argparse
+import hashlib
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List, Optional
+
+# 生成确定性输出使用的词表
+_VOCABULARY = [
+    "市场", "政策", "增长", "科技", "企业", "投资", "风险", "趋势", "数据", "消费",
+    "产业", "全球", "创新", "监管", "资本", "预期", "需求", "供应链", "估值", "结构"
+]
+
+
+class MockLLMServer:
+    """模拟LLM服务，在后台线程中运行"""
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: float = 0.1,
+        tokens_per_sec: float = 200.0,
+        output_tokens: int = 200,
+        error_429: float = 0.0,
+        error_500: float = 0.0,
+        timeout_rate: float = 0.0,
+        timeout_seconds: float = 30.0,
+        retry_after: float = 1.0,
+        seed: int = 0
+    ):
+        """
+        初始化模拟服务
+
+        Args:
+            host: 监听地址
+            port: 监听端口，0表示随机分配
+            latency: 首个token之前的延迟(秒)
+            tokens_per_sec: 输出速度
+            output_tokens: 输出token数上限(同时受请求的max_tokens限制)
+            error_429: 返回429的概率
+            error_500: 返回500的概率
+            timeout_rate: 挂起不响应的概率
+            timeout_seconds: 挂起的时长(秒)
+            retry_after: 429响应的Retry-After头(秒)
+            seed: 错误注入的随机种子
+        """
+        self.latency = latency
+        self.tokens_per_sec = tokens_per_sec
+        self.output_tokens = output_tokens
+        self.error_429 = error_429
+        self.error_500 = error_500
+        self.timeout_rate = timeout_rate
+        self.timeout_seconds = timeout_seconds
+        self.retry_after = retry_after
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.request_count = 0
+        self.status_counts = {}
+
+        self._httpd = ThreadingHTTPServer((host, port), self._make_handler())
+        self._httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        """兼容OpenAI客户端的base_url"""
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def start(self) -> "MockLLMServer":
+        """在后台线程中启动服务"""
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self):
+        """在当前线程中运行服务"""
+        self._httpd.serve_forever()
+
+    def stop(self):
+        """停止服务"""
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self) -> "MockLLMServer":
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def pick_fault(self) -> Optional[str]:
+        """按配置的概率决定本次请求注入哪种错误"""
+        with self._lock:
+            self.request_count += 1
+            roll = self._random.random()
+        if roll < self.error_429:
+            return "429"
+        roll -= self.error_429
+        if roll < self.error_500:
+            return "500"
+        roll -= self.error_500
+        if roll < self.timeout_rate:
+            return "timeout"
+        return None
+
+    def record_status(self, status: str):
+        """统计响应状态"""
+        with self._lock:
+            self.status_counts[status] = self.status_counts.get(status, 0) + 1
+
+    def generate_tokens(self, messages: List[dict], max_tokens: Optional[int]) -> List[str]:
+        """
+        根据请求消息生成确定性的输出token
+
+        Args:
+            messages: 请求消息
+            max_tokens: 请求的最大输出token数
+
+        Returns:
+            List[str]: 输出token列表
+        """
+        digest = hashlib.sha256(json.dumps(messages, ensure_ascii=False, sort_keys=True).encode("utf-8")).digest()
+        rng = random.Random(digest)
+        count = min(self.output_tokens, max_tokens or self.output_tokens)
+        return [rng.choice(_VOCABULARY) for _ in range(count)]
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format, *args):
+                pass
+
+            def _send_json(self, status: int, payload: dict, headers: Optional[dict] = None):
+                body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                for key, value in (headers or {}).items():
+                    self.send_header(key, value)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_POST(self):
+                if self.path.rstrip("/") != "/v1/chat/completions":
+                    self._send_json(404, {"error": {"message": "not found", "type": "invalid_request_error"}})
+                    return
+
+                length = int(self.headers.get("Content-Length") or 0)
+                request = json.loads(self.rfile.read(length) or b"{}")
+
+                fault = server.pick_fault()
+                if fault == "429":
+                    server.record_status("429")
+                    self._send_json(
+                        429,
+                        {"error": {"message": "rate limit exceeded", "type": "rate_limit_error"}},
+                        {"Retry-After": str(server.retry_after)}
+                    )
+                    return
+                if fault == "500":
+                    server.record_status("500")
+                    self._send_json(500, {"error": {"message": "internal error", "type": "server_error"}})
+                    return
+                if fault == "timeout":
+                    server.record_status("timeout")
+                    time.sleep(server.timeout_seconds)
+                    self.close_connection = True
+                    return
+
+                messages = request.get("messages", [])
+                tokens = server.generate_tokens(messages, request.get("max_tokens"))
+                prompt_tokens = sum(len(m.get("content", "")) for m in messages) // 2
+                usage = {
+                    "prompt_tokens": prompt_tokens,
+                    "completion_tokens": len(tokens),
+                    "total_tokens": prompt_tokens + len(tokens)
+                }
+                completion_id = "chatcmpl-mock-" + hashlib.md5("".join(tokens).encode("utf-8")).hexdigest()[:12]
+                model = request.get("model", "mock")
+                created = int(time.time())
+                token_interval = 1.0 / server.tokens_per_sec if server.tokens_per_sec > 0 else 0.0
+
+                time.sleep(server.latency)
+
+                if not request.get("stream"):
+                    time.sleep(token_interval * len(tokens))
+                    server.record_status("200")
+                    self._send_json(200, {
+                        "id": completion_id,
+                        "object": "chat.completion",
+                        "created": created,
+                        "model": model,
+                        "choices": [{
+                            "index": 0,
+                            "message": {"role": "assistant", "content": "".join(tokens)},
+                            "finish_reason": "stop"
+                        }],
+                        "usage": usage
+                    })
+                    return
+
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Cache-Control", "no-cache")
+                self.send_header("Connection", "close")
+                self.end_headers()
+                self.close_connection = True
+
+                def send_event(delta: dict, finish_reason: Optional[str] = None, extra: Optional[dict] = None):
+                    chunk = {
+                        "id": completion_id,
+                        "object": "chat.completion.chunk",
+                        "created": created,
+                        "model": model,
+                        "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}]
+                    }
+                    chunk.update(extra or {})
+                    self.wfile.write(f"data: {json.dumps(chunk, ensure_ascii=False)}\n\n".encode("utf-8"))
+                    self.wfile.flush()
+
+                try:
+                    send_event({"role": "assistant", "content": ""})
+                    for token in tokens:
+                        time.sleep(token_interval)
+                        send_event({"content": token})
+                    send_event({}, "stop", {"usage": usage})
+                    self.wfile.write(b"data: [DONE]\n\n")
+                    self.wfile.flush()
+                    server.record_status("200")
+                except (BrokenPipeError, ConnectionResetError):
+                    # 客户端提前断开(如对冲请求被取消)
+                    server.record_status("aborted")
+
+        return Handler
+
+
+def parse_args():
+    """解析命令行参数"""
+    parser = argparse.ArgumentParser(description="兼容OpenAI接口的模拟LLM服务")
+    parser.add_argument("--host", default="127.0.0.1", help="监听地址")
+    parser.add_argument("--port", type=int, default=8808, help="监听端口")
+    parser.add_argument("--latency", type=float, default=0.1, help="首个token之前的延迟(秒)")
+    parser.add_argument("--tps", type=float, default=200.0, help="输出速度(tokens/秒)")
+    parser.add_argument("--output-tokens", type=int, default=200, help="输出token数上限")
+    parser.add_argument("--error-429", type=float, default=0.0, help="返回429的概率")
+    parser.add_argument("--error-500", type=float, default=0.0, help="返回500的概率")
+    parser.add_argument("--timeout-rate", type=float, default=0.0, help="挂起不响应的概率")
+    parser.add_argument("--timeout-seconds", type=float, default=30.0, help="挂起的时长(秒)")
+    parser.add_argument("--retry-after", type=float, default=1.0, help="429响应的Retry-After(秒)")
+    parser.add_argument("--seed", type=int, default=0, help="错误注入的随机种子")
+    return parser.parse_args()
+
+
+def main():
+    """主函数"""
+    args = parse_args()
+    server = MockLLMServer(
+        host=args.host,
+        port=args.port,
+        latency=args.latency,
+        tokens_per_sec=args.tps,
+        output_tokens=args.output_tokens,
+        error_429=args.error_429,
+        error_500=args.error_500,
+        timeout_rate=args.timeout_rate,
+        timeout_seconds=args.timeout_seconds,
+        retry_after=args.retry_after,
+        seed=args.seed
+    )
+    print(f"模拟LLM服务已启动在 {server.base_url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,182 @@
+#!/usr/bin/env python
+"""
+新闻爬取与分析工具守护进程入口
+
+常驻运行，按分类定时增量爬取，累计到足够多的新文章后生成报告，
+替代用cron每小时启动一次main.py
+"""
+
+import argparse
+import signal
+import sys
+
+from app.config.settings import (
+    SINA_CATEGORIES,
+    PARSE_WORKERS,
+    SCHEDULER_INTERVAL,
+    SCHEDULER_INTERVALS,
+    SCHEDULER_JITTER,
+    SCHEDULER_CRAWL_LIMIT,
+    SCHEDULER_MIN_NEW_ARTICLES,
+    SCHEDULER_MAX_PENDING_AGE,
+    DELTA_REPORTS
+)
+from app.utils.logger import logger
+from app.utils.timing import enable_timing, registry as timing_registry
+
+
+def parse_args():
+    """解析命令行参数"""
+    parser = argparse.ArgumentParser(description="新闻爬取与分析工具守护进程")
+    parser.add_argument(
+        "--categories",
+        nargs="+",
+        default=None,
+        help=f"要调度的新闻分类，默认全部，支持: {', '.join(SINA_CATEGORIES.keys())}"
+    )
+    parser.add_argument(
+        "--interval",
+        type=float,
+        default=SCHEDULER_INTERVAL / 60,
+        help="默认爬取间隔(分钟)"
+    )
+    parser.add_argument(
+        "--category-interval",
+        action="append",
+        default=[],
+        metavar="分类=分钟",
+        help="单独设置某个分类的爬取间隔，可重复，如 --category-interval 财经=30"
+    )
+    parser.add_argument(
+        "--jitter",
+        type=float,
+        default=SCHEDULER_JITTER,
+        help="间隔的随机抖动比例"
+    )
+    parser.add_argument(
+        "--limit",
+        type=int,
+        default=SCHEDULER_CRAWL_LIMIT,
+        help="每次爬取时考察的文章数量"
+    )
+    parser.add_argument(
+        "--min-new",
+        type=int,
+        default=SCHEDULER_MIN_NEW_ARTICLES,
+        help="累计多少篇新文章才触发分析"
+    )
+    parser.add_argument(
+        "--max-wait",
+        type=float,
+        default=SCHEDULER_MAX_PENDING_AGE / 60,
+        help="新文章最长等待时间(分钟)，超过后即使数量不足也触发分析"
+    )
+    parser.add_argument(
+        "--parse-workers",
+        type=int,
+        default=PARSE_WORKERS,
+        help="解析进程数，0表示在当前进程内解析"
+    )
+    parser.add_argument(
+        "--no-analyze",
+        action="store_true",
+        help="只爬取，不调用大模型分析"
+    )
+    parser.add_argument(
+        "--delta",
+        action="store_true",
+        default=DELTA_REPORTS,
+        help="增量报告: 以上一份报告的摘要为背景只分析新文章，生成\"HH:MM以来的更新\"报告"
+    )
+    parser.add_argument(
+        "--once",
+        action="store_true",
+        help="每个分类只运行一次后退出"
+    )
+    parser.add_argument(
+        "--timings",
+        action="store_true",
+        help="统计各阶段耗时并在退出时输出汇总表"
+    )
+    parser.add_argument(
+        "--debug",
+        action="store_true",
+        help="启用调试模式"
+    )
+
+    return parser.parse_args()
+
+
+def parse_intervals(values) -> dict:
+    """
+    解析 分类=分钟 形式的间隔配置
+
+    Returns:
+        dict: 分类到间隔(秒)的映射
+    """
+    intervals = dict(SCHEDULER_INTERVALS)
+    for value in values:
+        category, sep, minutes = value.partition("=")
+        if not sep:
+            raise ValueError(f"间隔格式应为 分类=分钟: {value}")
+        intervals[category.strip()] = float(minutes) * 60
+    return intervals
+
+
+def main():
+    """主函数"""
+    args = parse_args()
+
+    if args.debug:
+        logger.setLevel("DEBUG")
+    if args.timings:
+        enable_timing()
+
+    if not args.no_analyze:
+        from main import check_environment
+        if not check_environment():
+            return 1
+
+    from app.scheduler.news_scheduler import NewsScheduler
+
+    try:
+        scheduler = NewsScheduler(
+            categories=args.categories,
+            intervals=parse_intervals(args.category_interval),
+            default_interval=args.interval * 60,
+            jitter=args.jitter,
+            crawl_limit=args.limit,
+            min_new_articles=args.min_new,
+            max_pending_age=args.max_wait * 60,
+            parse_workers=args.parse_workers,
+            analyze=not args.no_analyze,
+            delta=args.delta
+        )
+    except ValueError as e:
+        logger.error("%s", e)
+        return 1
+
+    # 收到终止信号时完成当前任务后退出
+    def handle_signal(signum, frame):
+        logger.info("收到信号 %s，准备退出", signum)
+        scheduler.stop()
+
+    signal.signal(signal.SIGINT, handle_signal)
+    signal.signal(signal.SIGTERM, handle_signal)
+
+    try:
+        with scheduler:
+            if args.once:
+                scheduler.run_once()
+            else:
+                scheduler.run_forever()
+    finally:
+        if args.timings:
+            print("\n=== 各阶段耗时 ===\n")
+            print(timing_registry.format_table())
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
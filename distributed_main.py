@@ -0,0 +1,222 @@
+#!/usr/bin/env python
+"""
+分布式爬取入口
+
+协调者发现文章URL放入共享队列，一个或多个工作者进程领取URL、下载提取后写回结果。
+默认使用SQLite队列文件，同一主机上的进程共享同一个文件即可协作
+
+用法:
+    # 启动4个工作者进程，队列为空时继续等待新任务
+    python distributed_main.py worker --processes 4
+
+    # 发现URL放入队列，等待完成后按分类生成分析报告
+    python distributed_main.py coordinator --categories 财经 科技 --limit 50 --wait --analyze
+
+    # 查看队列状态
+    python distributed_main.py status
+"""
+
+import argparse
+import multiprocessing
+import signal
+import sys
+from pathlib import Path
+
+from app.config.settings import (
+    SINA_CATEGORIES,
+    PARSE_WORKERS,
+    WORK_QUEUE_PATH,
+    WORK_QUEUE_LEASE_SECONDS,
+    WORK_QUEUE_BATCH_SIZE,
+    DELTA_REPORTS
+)
+from app.utils.logger import logger
+
+
+def parse_args():
+    """解析命令行参数"""
+    parser = argparse.ArgumentParser(description="分布式爬取")
+    parser.add_argument("--queue", type=Path, default=WORK_QUEUE_PATH, help="SQLite队列文件路径")
+    subparsers = parser.add_subparsers(dest="mode", required=True)
+
+    coordinator = subparsers.add_parser("coordinator", help="发现文章URL并放入队列")
+    coordinator.add_argument(
+        "--categories",
+        nargs="+",
+        default=None,
+        help=f"要爬取的分类，默认全部，支持: {', '.join(SINA_CATEGORIES.keys())}"
+    )
+    coordinator.add_argument("--limit", type=int, default=10, help="每个分类放入的URL数量")
+    coordinator.add_argument("--wait", action="store_true", help="等待工作者处理完队列")
+    coordinator.add_argument("--timeout", type=float, default=None, help="最长等待时间(秒)")
+    coordinator.add_argument("--analyze", action="store_true", help="处理完成后按分类分析并保存报告，隐含--wait")
+    coordinator.add_argument(
+        "--delta", action="store_true", default=DELTA_REPORTS, help="只分析上一份报告之后的新文章，生成增量报告"
+    )
+
+    worker = subparsers.add_parser("worker", help="领取并处理队列中的URL")
+    worker.add_argument("--processes", type=int, default=1, help="工作者进程数")
+    worker.add_argument("--worker-id", default=None, help="工作者ID前缀，默认使用主机名和进程号")
+    worker.add_argument("--batch-size", type=int, default=WORK_QUEUE_BATCH_SIZE, help="每次领取的任务数")
+    worker.add_argument("--lease", type=float, default=WORK_QUEUE_LEASE_SECONDS, help="租约时长(秒)")
+    worker.add_argument("--parse-workers", type=int, default=PARSE_WORKERS, help="每个工作者的解析进程数")
+    worker.add_argument("--exit-when-empty", action="store_true", help="队列处理完后退出")
+
+    subparsers.add_parser("status", help="查看队列状态")
+
+    return parser.parse_args()
+
+
+def run_worker(
+    queue_path: Path,
+    worker_id,
+    batch_size: int,
+    lease: float,
+    parse_workers: int,
+    exit_when_empty: bool,
+    log_queue=None
+) -> int:
+    """
+    在当前进程中运行一个工作者
+
+    Args:
+        log_queue: 在子进程中运行时，日志转发到父进程的队列
+
+    Returns:
+        int: 成功处理的任务数
+    """
+    if log_queue is not None:
+        from app.utils.logger import attach_worker_queue
+        attach_worker_queue(log_queue)
+
+    from app.distributed.sqlite_queue import SqliteWorkQueue
+    from app.distributed.worker import CrawlWorker
+
+    with SqliteWorkQueue(queue_path, lease_seconds=lease) as queue:
+        with CrawlWorker(
+            queue,
+            worker_id=worker_id,
+            batch_size=batch_size,
+            lease_seconds=lease,
+            parse_workers=parse_workers
+        ) as worker:
+            # 收到终止信号时完成当前批次后退出，未完成的租约到期后由其他工作者接手
+            def handle_signal(signum, frame):
+                worker.stop()
+
+            signal.signal(signal.SIGINT, handle_signal)
+            signal.signal(signal.SIGTERM, handle_signal)
+            return worker.run(exit_when_empty=exit_when_empty)
+
+
+def worker_main(args) -> int:
+    """启动一个或多个工作者进程"""
+    options = (args.batch_size, args.lease, args.parse_workers, args.exit_when_empty)
+
+    if args.processes <= 1:
+        run_worker(args.queue, args.worker_id, *options)
+        return 0
+
+    from app.utils.logger import start_worker_log_forwarding
+
+    # 子进程的日志统一由主进程写出
+    log_queue, log_listener = start_worker_log_forwarding()
+    processes = []
+    for index in range(args.processes):
+        worker_id = f"{args.worker_id}-{index}" if args.worker_id else None
+        process = multiprocessing.Process(target=run_worker, args=(args.queue, worker_id, *options, log_queue))
+        process.start()
+        processes.append(process)
+
+    # 信号会同时发给子进程，主进程只需等待子进程退出
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    try:
+        for process in processes:
+            process.join()
+    finally:
+        log_listener.stop()
+    return 0 if all(process.exitcode == 0 for process in processes) else 1
+
+
+def coordinator_main(args) -> int:
+    """发现URL，必要时等待完成并生成报告"""
+    from app.distributed.coordinator import Coordinator
+    from app.distributed.sqlite_queue import SqliteWorkQueue
+
+    if args.analyze:
+        from main import check_environment
+        if not check_environment():
+            return 1
+
+    categories = args.categories or list(SINA_CATEGORIES.keys())
+
+    with SqliteWorkQueue(args.queue) as queue, Coordinator(queue) as coordinator:
+        added = coordinator.discover(categories, limit=args.limit)
+        logger.info("共新增任务 %s 个", sum(added.values()))
+
+        if not (args.wait or args.analyze):
+            return 0
+
+        def report_progress(stats):
+            logger.info(
+                "队列进度: 待领取 %s，处理中 %s，完成 %s，失败 %s",
+                stats["pending"], stats["leased"], stats["done"], stats["failed"]
+            )
+
+        if not coordinator.wait(timeout=args.timeout, on_progress=report_progress):
+            logger.warning("等待超时，队列尚未处理完")
+            return 1
+
+        if not args.analyze:
+            return 0
+
+        from app.analyzers.delta import DeltaReporter
+        from app.analyzers.multi_backend_analyzer import create_analyzer
+
+        analyzer = create_analyzer()
+        for category in categories:
+            articles = coordinator.collect(category)
+            if not articles:
+                logger.warning("分类 '%s' 没有爬取到文章", category)
+                continue
+            result = DeltaReporter(analyzer, category, delta=args.delta).run(articles)
+            if result is None:
+                logger.error("分类 '%s' 分析失败", category)
+                continue
+            if result.path is None:
+                logger.info("分类 '%s' 没有上一份报告之后的新文章", category)
+                continue
+            logger.info("分类 '%s' 的分析报告已保存到: %s", category, result.path)
+
+    return 0
+
+
+def status_main(args) -> int:
+    """输出队列状态和失败的任务"""
+    from app.distributed.sqlite_queue import SqliteWorkQueue
+
+    if not args.queue.exists():
+        print(f"队列文件不存在: {args.queue}")
+        return 1
+
+    with SqliteWorkQueue(args.queue) as queue:
+        stats = queue.stats()
+        print("  ".join(f"{state}: {count}" for state, count in stats.items()))
+        for failure in queue.failures():
+            print(f"[失败] {failure['category']} {failure['url']} (尝试 {failure['attempts']} 次): {failure['error']}")
+    return 0
+
+
+def main() -> int:
+    """主函数"""
+    args = parse_args()
+
+    if args.mode == "worker":
+        return worker_main(args)
+    if args.mode == "coordinator":
+        return coordinator_main(args)
+    return status_main(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,16 +4,22 @@
 """
 
 import argparse
+import importlib.util
 import sys
 import os
-from typing import Optional, List
+from typing import TYPE_CHECKING, Optional, List
 
+# 爬虫和分析器依赖requests、bs4、openai，导入较慢，在使用时才导入，
+# 这样 --help 和参数错误可以立即返回
 from app.models.article import Article
-from app.scrapers.sina_scraper import SinaScraper
-from app.analyzers.deepseek_analyzer import DeepSeekAnalyzer
 from app.utils.logger import logger
-from app.utils.file import save_report
-from app.config.settings import DEEPSEEK_API_KEY, SINA_CATEGORIES
+from app.utils.timing import enable_timing, registry as timing_registry
+from app.config.settings import (
+    DEEPSEEK_API_KEY, SINA_CATEGORIES, PARSE_WORKERS, EXTRACTOR, ANALYZER, DELTA_REPORTS, load_llm_backends
+)
+
+if TYPE_CHECKING:
+    from app.analyzers.delta import DeltaResult
 
 
 def parse_args():
@@ -30,11 +36,40 @@ def parse_args():
         default=5, 
         help="爬取的文章数量"
     )
+    parser.add_argument(
+        "--parse-workers", 
+        type=int, 
+        default=PARSE_WORKERS, 
+        help="解析进程数，0表示在当前进程内解析"
+    )
+    parser.add_argument(
+        "--extractor", 
+        choices=["sina", "density"], 
+        default=EXTRACTOR, 
+        help="提取器: sina(按新浪页面的选择器) 或 density(按文本密度)"
+    )
+    parser.add_argument(
+        "--analyzer", 
+        choices=["deepseek", "multi"], 
+        default=ANALYZER, 
+        help="分析器: deepseek(单一服务) 或 multi(按LLM_BACKENDS在多个服务之间路由、对冲和故障转移)"
+    )
+    parser.add_argument(
+        "--delta", 
+        action="store_true", 
+        default=DELTA_REPORTS, 
+        help="增量报告: 只分析上一份报告之后的新文章，生成\"HH:MM以来的更新\"报告"
+    )
     parser.add_argument(
         "--preview", 
         action="store_true", 
         help="是否预览报告内容"
     )
+    parser.add_argument(
+        "--timings", 
+        action="store_true", 
+        help="统计各阶段耗时并在结束时输出汇总表"
+    )
     parser.add_argument(
         "--debug", 
         action="store_true", 
@@ -44,51 +79,72 @@ def parse_args():
     return parser.parse_args()
 
 
-def check_environment() -> bool:
+def check_environment(analyzer: str = ANALYZER) -> bool:
     """
     检查运行环境是否满足要求
     
+    Args:
+        analyzer: 分析器名称
+        
     Returns:
         bool: 环境是否满足要求
     """
     # 检查API密钥
-    if not DEEPSEEK_API_KEY:
+    if analyzer == "multi":
+        try:
+            backends = load_llm_backends()
+        except ValueError as e:
+            logger.error(str(e))
+            return False
+        if not any(backend.get("api_key") or os.getenv(backend.get("api_key_env", "")) for backend in backends):
+            logger.error("LLM_BACKENDS中没有任何后端设置了API密钥")
+            return False
+    elif not DEEPSEEK_API_KEY:
         logger.error("请设置DEEPSEEK_API_KEY环境变量")
         logger.info("Windows: set DEEPSEEK_API_KEY=your_key_here")
         logger.info("Linux/Mac: export DEEPSEEK_API_KEY=your_key_here")
         return False
         
-    # 检查必要的Python包
-    try:
-        import openai
-        import requests
-        import bs4
-    except ImportError as e:
-        logger.error(f"缺少必要的Python包: {e}")
+    # 检查必要的Python包，只查找不导入
+    missing = [name for name in ("openai", "requests", "bs4") if importlib.util.find_spec(name) is None]
+    if missing:
+        logger.error(f"缺少必要的Python包: {', '.join(missing)}")
         logger.info("请安装必要的依赖: pip install -r requirements.txt")
         return False
         
     return True
 
 
-def crawl_news(category: str, limit: int) -> List[Article]:
+def crawl_news(
+    category: str, 
+    limit: int, 
+    parse_workers: int = PARSE_WORKERS, 
+    extractor: str = EXTRACTOR
+) -> List[Article]:
     """
     爬取指定分类的新闻
     
     Args:
         category: 新闻分类
         limit: 爬取数量
+        parse_workers: 解析进程数
+        extractor: 提取器名称
         
     Returns:
         List[Article]: 文章列表
     """
+    from app.scrapers.sina_scraper import SinaScraper, EXTRACTOR_CLASSES
+    
     logger.info(f"开始爬取 {category} 分类的新闻，数量: {limit}")
     
     # 创建爬虫
-    scraper = SinaScraper()
+    scraper = SinaScraper(parse_workers=parse_workers, extractor_class=EXTRACTOR_CLASSES[extractor])
     
     # 爬取文章
-    articles = scraper.scrape_category(category, limit=limit)
+    try:
+        articles = scraper.scrape_category(category, limit=limit)
+    finally:
+        scraper.close()
     
     if not articles:
         logger.error("未爬取到任何文章")
@@ -98,29 +154,37 @@ def crawl_news(category: str, limit: int) -> List[Article]:
     return articles
 
 
-def analyze_news(articles: List[Article]) -> Optional[str]:
+def analyze_news(
+    articles: List[Article], 
+    category: str, 
+    analyzer: str = ANALYZER, 
+    delta: bool = DELTA_REPORTS
+) -> Optional["DeltaResult"]:
     """
-    分析新闻文章
+    分析新闻文章并保存报告
     
     Args:
         articles: 文章列表
+        category: 新闻分类
+        analyzer: 分析器名称
+        delta: 是否只分析上一份报告之后的新文章
         
     Returns:
-        Optional[str]: 分析结果，失败则返回None
+        Optional[DeltaResult]: 分析结果，失败则返回None；没有新文章时结果的path为None
     """
     if not articles:
         logger.error("没有文章可以分析")
         return None
         
-    logger.info("开始分析文章...")
+    from app.analyzers.delta import DeltaReporter
+    from app.analyzers.multi_backend_analyzer import create_analyzer
     
-    # 创建分析器
-    analyzer = DeepSeekAnalyzer()
+    logger.info("开始分析文章...")
     
-    # 分析文章
-    result = analyzer.analyze(articles)
+    # 分析文章并保存报告，增量模式下只分析新文章
+    result = DeltaReporter(create_analyzer(analyzer), category, delta=delta).run(articles)
     
-    if not result:
+    if result is None:
         logger.error("分析失败")
         return None
         
@@ -142,35 +206,56 @@ def preview_report(content: str, max_lines: int = 10):
     print("\n...(更多内容请查看完整报告)...\n")
 
 
-def main():
-    """主函数"""
-    # 解析命令行参数
-    args = parse_args()
+def run(args) -> int:
+    """
+    执行一次爬取与分析
     
+    Args:
+        args: 命令行参数
+        
+    Returns:
+        int: 退出码
+    """
     # 检查环境
-    if not check_environment():
+    if not check_environment(args.analyzer):
         return 1
     
     # 爬取新闻
-    articles = crawl_news(args.category, args.limit)
+    articles = crawl_news(args.category, args.limit, args.parse_workers, args.extractor)
     if not articles:
         return 1
     
-    # 分析新闻
-    analysis_result = analyze_news(articles)
-    if not analysis_result:
+    # 分析新闻并保存报告
+    analysis_result = analyze_news(articles, args.category, args.analyzer, args.delta)
+    if analysis_result is None:
         return 1
-    
-    # 保存报告
-    report_path = save_report(analysis_result, args.category)
-    logger.info(f"分析报告已保存到: {report_path}")
+    if analysis_result.path is None:
+        logger.info("没有上一份报告之后的新文章，不生成报告")
+        return 0
+    logger.info(f"分析报告已保存到: {analysis_result.path}")
     
     # 预览报告
     if args.preview:
-        preview_report(analysis_result)
+        preview_report(analysis_result.content)
         
     return 0
 
 
+def main():
+    """主函数"""
+    # 解析命令行参数
+    args = parse_args()
+    
+    if args.timings:
+        enable_timing()
+        
+    try:
+        return run(args)
+    finally:
+        if args.timings:
+            print("\n=== 各阶段耗时 ===\n")
+            print(timing_registry.format_table())
+
+
 if __name__ == "__main__":
     sys.exit(main()) 
\ No newline at end of file
@@ -0,0 +1,119 @@
+#!/usr/bin/env python
+"""
+离线批量重新提取入口
+
+改进提取器后，对已经下载过的原始页面重新提取，不访问网络。
+原始页面来自目录(*.html/*.shtml等，URL取自页面中的canonical链接)、tar归档或zip归档(含基准测试的夹具归档)，
+提取结果写成JSON Lines文件或写入SQLite文章库，结束时输出处理速度和各字段的提取成功率
+
+用法:
+    # 重新提取夹具归档中的文章页，写成JSONL
+    python reextract_main.py benchmarks/fixtures/sina.zip --output articles.jsonl
+
+    # 用8个进程、文本密度提取器处理一个目录，写入文章库
+    python reextract_main.py ./raw_pages --store articles.db --workers 8 --extractor density
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+from app.config.settings import (
+    ARTICLE_STORE_PATH,
+    EXTRACTOR,
+    REEXTRACT_WORKERS,
+    REEXTRACT_CHUNK_SIZE
+)
+from app.utils.logger import logger
+
+
+def parse_args():
+    """解析命令行参数"""
+    parser = argparse.ArgumentParser(description="离线批量重新提取")
+    parser.add_argument("source", type=Path, help="原始页面目录、tar归档或zip归档")
+    output = parser.add_mutually_exclusive_group()
+    output.add_argument("--output", type=Path, default=None, help="输出的JSON Lines文件")
+    output.add_argument(
+        "--store",
+        type=Path,
+        nargs="?",
+        const=ARTICLE_STORE_PATH,
+        default=None,
+        help=f"写入SQLite文章库，不指定路径时为 {ARTICLE_STORE_PATH}"
+    )
+    parser.add_argument("--workers", type=int, default=REEXTRACT_WORKERS, help="提取进程数，0表示在当前进程内提取")
+    parser.add_argument("--chunk-size", type=int, default=REEXTRACT_CHUNK_SIZE, help="每次提交给提取进程的页面数")
+    parser.add_argument(
+        "--extractor",
+        choices=["sina", "density"],
+        default=EXTRACTOR,
+        help="提取器: sina(按新浪页面的选择器) 或 density(按文本密度)"
+    )
+    parser.add_argument("--parser", default="html5lib", help="BeautifulSoup解析器，如html5lib、lxml")
+    parser.add_argument("--category", default=None, help="页面分类，默认按URL推断")
+    parser.add_argument("--limit", type=int, default=None, help="最多处理的页面数")
+    parser.add_argument("--report", type=Path, default=None, help="统计结果JSON文件，默认只输出到标准输出")
+    return parser.parse_args()
+
+
+class _DiscardSink:
+    """不输出文章，只统计"""
+
+    def put(self, article):
+        pass
+
+    def close(self):
+        pass
+
+
+def main() -> int:
+    """主函数"""
+    args = parse_args()
+
+    from itertools import islice
+
+    from app.scrapers.reextract import Reextractor, JsonlWriter, iter_raw_pages
+    from app.scrapers.sina_scraper import EXTRACTOR_CLASSES
+
+    try:
+        pages = iter_raw_pages(args.source, args.category)
+    except ValueError as e:
+        logger.error("%s", e)
+        return 1
+    if args.limit is not None:
+        pages = islice(pages, args.limit)
+
+    if args.output is not None:
+        sink = JsonlWriter(args.output)
+    elif args.store is not None:
+        from app.storage.article_store import ArticleStore
+        sink = ArticleStore(args.store)
+    else:
+        logger.warning("未指定 --output 或 --store，只统计不输出文章")
+        sink = _DiscardSink()
+
+    reextractor = Reextractor(
+        workers=args.workers,
+        chunk_size=args.chunk_size,
+        extractor_class=EXTRACTOR_CLASSES[args.extractor],
+        parser=args.parser
+    )
+    try:
+        report = reextractor.run(pages, sink)
+    finally:
+        sink.close()
+
+    summary = report.to_dict()
+    logger.info(
+        "重新提取完成: %s 个页面，%s 篇文章，%.1f 页/秒",
+        summary["pages"], summary["articles"], summary["pages_per_s"]
+    )
+    print(json.dumps(summary, ensure_ascii=False, indent=2))
+    if args.report is not None:
+        args.report.write_text(json.dumps(summary, ensure_ascii=False, indent=2), encoding="utf-8")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
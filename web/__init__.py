@@ -2,9 +2,13 @@
 Web应用初始化
 """
 
-from flask import Flask
+import time
+
+from flask import Flask, g, request
 from flask_cors import CORS
 
+from app.utils.metrics import WEB_REQUEST_LATENCY
+
 def create_app():
     """创建Flask应用实例"""
     app = Flask(__name__, 
@@ -26,4 +30,22 @@ def create_app():
     app.register_blueprint(report_api, url_prefix="/api/reports")
     app.register_blueprint(main_routes)
     
+    # 记录每个请求的处理耗时
+    @app.before_request
+    def start_timer():
+        g.request_start = time.perf_counter()
+        
+    @app.after_request
+    def record_latency(response):
+        start = g.pop("request_start", None)
+        if start is not None:
+            WEB_REQUEST_LATENCY.observe(
+                time.perf_counter() - start,
+                blueprint=request.blueprint or "app",
+                route=request.url_rule.rule if request.url_rule else "unmatched",
+                method=request.method,
+                status=response.status_code
+            )
+        return response
+    
     return app 
\ No newline at end of file
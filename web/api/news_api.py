@@ -2,13 +2,13 @@
 新闻相关API
 """
 
+import json
 import os
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, Response, request, jsonify, stream_with_context
 
-from app.scrapers.sina_scraper import SinaScraper
-from app.analyzers.deepseek_analyzer import DeepSeekAnalyzer
-from app.utils.file import save_report
-from app.config.settings import SINA_CATEGORIES
+from app.config.settings import SINA_CATEGORIES, SCRAPE_DEADLINE, SCRAPE_MAX_DEADLINE, DELTA_REPORTS
+from app.utils.metrics import CRAWLS_IN_PROGRESS, ANALYSES_IN_PROGRESS
+from app.utils.timing import is_timing_enabled, registry as timing_registry
 
 news_api = Blueprint("news_api", __name__)
 
@@ -20,58 +20,112 @@ def get_categories():
         "data": list(SINA_CATEGORIES.keys())
     })
 
-@news_api.route("/scrape", methods=["POST"])
-def scrape_news():
-    """爬取新闻并分析"""
-    data = request.json
+@news_api.route("/timings", methods=["GET"])
+def get_timings():
+    """获取各阶段耗时统计，reset=1时读取后清空"""
+    stages = timing_registry.summary()
+    if request.args.get("reset") == "1":
+        timing_registry.reset()
+        
+    return jsonify({
+        "success": True,
+        "data": {
+            "enabled": is_timing_enabled(),
+            "stages": stages
+        }
+    })
+
+def _validate_scrape_params(data, default_deadline=SCRAPE_DEADLINE):
+    """校验爬取参数，返回 (分类, 数量, 截止时间秒数, 错误响应)；未传deadline且default_deadline为None时不限制耗时"""
     category = data.get("category", "财经")
     limit = data.get("limit", 5)
+    deadline = data.get("deadline")
+    if deadline is None:
+        deadline = default_deadline
     
-    # 参数验证
     if category not in SINA_CATEGORIES:
-        return jsonify({
+        return category, limit, deadline, (jsonify({
             "success": False,
             "message": f"不支持的分类: {category}"
-        }), 400
+        }), 400)
     
     if not isinstance(limit, int) or limit < 1 or limit > 20:
-        return jsonify({
+        return category, limit, deadline, (jsonify({
             "success": False,
             "message": "limit参数必须是1-20之间的整数"
-        }), 400
+        }), 400)
+    
+    if deadline is not None and (
+        isinstance(deadline, bool) or not isinstance(deadline, (int, float)) or not 0 < deadline <= SCRAPE_MAX_DEADLINE
+    ):
+        return category, limit, deadline, (jsonify({
+            "success": False,
+            "message": f"deadline参数必须是0-{SCRAPE_MAX_DEADLINE}之间的秒数"
+        }), 400)
+    
+    return category, limit, deadline, None
+
+def _no_articles_response(stats):
+    """没有爬到文章时的响应，截止时间到达时返回504"""
+    if stats.deadline_exceeded:
+        return jsonify({
+            "success": False,
+            "message": "截止时间内未爬取到任何文章",
+            "data": stats.to_dict()
+        }), 504
+    return jsonify({
+        "success": False,
+        "message": "未爬取到任何文章",
+        "data": stats.to_dict()
+    }), 404
+
+def _article_summary(article):
+    """文章的摘要信息，用于接口响应"""
+    return {
+        "id": article.get_id(),
+        "title": article.title,
+        "url": article.url,
+        "source": article.source,
+        "category": article.category,
+        "published_time": article.published_time.isoformat() if article.published_time else None,
+        "author": article.author,
+        "content_preview": article.content[:200] + "..." if len(article.content) > 200 else article.content
+    }
+
+@news_api.route("/scrape", methods=["POST"])
+def scrape_news():
+    """爬取新闻并分析"""
+    # 爬虫依赖requests和bs4，首次调用时才导入，加快Web服务启动
+    from app.scrapers.base_scraper import CrawlStats
+    from app.scrapers.sina_scraper import SinaScraper
+    from app.utils.deadline import Deadline
+    
+    # 参数验证
+    category, limit, deadline, error = _validate_scrape_params(request.json)
+    if error:
+        return error
     
     try:
         # 创建爬虫
         scraper = SinaScraper()
+        stats = CrawlStats()
         
-        # 爬取文章
-        articles = scraper.scrape_category(category, limit=limit)
+        # 爬取文章，截止时间到达时返回已经爬好的部分
+        with CRAWLS_IN_PROGRESS.track_inprogress():
+            articles = scraper.scrape_category(category, limit=limit, deadline=Deadline(deadline), stats=stats)
         
         if not articles:
-            return jsonify({
-                "success": False,
-                "message": "未爬取到任何文章"
-            }), 404
+            return _no_articles_response(stats)
         
         # 准备响应数据
-        article_data = []
-        for article in articles:
-            article_data.append({
-                "id": article.get_id(),
-                "title": article.title,
-                "url": article.url,
-                "source": article.source,
-                "category": article.category,
-                "published_time": article.published_time.isoformat() if article.published_time else None,
-                "author": article.author,
-                "content_preview": article.content[:200] + "..." if len(article.content) > 200 else article.content
-            })
+        article_data = [_article_summary(article) for article in articles]
         
         return jsonify({
             "success": True,
             "data": {
                 "articles": article_data,
-                "count": len(article_data)
+                "count": len(article_data),
+                **stats.to_dict()
             }
         })
         
@@ -81,47 +135,104 @@ def scrape_news():
             "message": f"爬取过程出错: {str(e)}"
         }), 500
 
+@news_api.route("/scrape/stream", methods=["POST"])
+def scrape_news_stream():
+    """流式爬取新闻，每提取完一篇就输出一行JSON(NDJSON)，最后一行为汇总"""
+    from app.scrapers.base_scraper import CrawlStats
+    from app.scrapers.sina_scraper import SinaScraper
+    from app.utils.deadline import Deadline
+    
+    category, limit, deadline, error = _validate_scrape_params(request.json)
+    if error:
+        return error
+    
+    def generate():
+        scraper = SinaScraper()
+        stats = CrawlStats()
+        count = 0
+        try:
+            with CRAWLS_IN_PROGRESS.track_inprogress():
+                # 客户端读取慢时，后台爬取在提前爬好STREAM_PREFETCH篇后暂停
+                for article in scraper.iter_category(category, limit=limit, deadline=Deadline(deadline), stats=stats):
+                    count += 1
+                    yield json.dumps({"type": "article", "data": _article_summary(article)}, ensure_ascii=False) + "\n"
+        finally:
+            scraper.close()
+        yield json.dumps({"type": "done", "count": count, **stats.to_dict()}, ensure_ascii=False) + "\n"
+    
+    return Response(stream_with_context(generate()), mimetype="application/x-ndjson")
+
 @news_api.route("/analyze", methods=["POST"])
 def analyze_news():
     """分析新闻"""
+    from app.scrapers.base_scraper import CrawlStats
+    from app.scrapers.sina_scraper import SinaScraper
+    from app.analyzers.llm_scheduler import PRIORITY_INTERACTIVE
+    from app.analyzers.delta import DeltaReporter
+    from app.analyzers.multi_backend_analyzer import create_analyzer
+    from app.utils.deadline import Deadline
+    
+    # 只有传入deadline时才限制爬取阶段的耗时
     data = request.json
-    category = data.get("category", "财经")
-    limit = data.get("limit", 5)
+    category, limit, deadline, error = _validate_scrape_params(data, default_deadline=None)
+    if error:
+        return error
+    
+    delta = data.get("delta", DELTA_REPORTS)
+    if not isinstance(delta, bool):
+        return jsonify({
+            "success": False,
+            "message": "delta参数必须是布尔值"
+        }), 400
     
     try:
         # 创建爬虫
         scraper = SinaScraper()
+        stats = CrawlStats()
         
         # 爬取文章
-        articles = scraper.scrape_category(category, limit=limit)
+        with CRAWLS_IN_PROGRESS.track_inprogress():
+            articles = scraper.scrape_category(
+                category, limit=limit, deadline=Deadline.after(deadline), stats=stats
+            )
         
         if not articles:
-            return jsonify({
-                "success": False,
-                "message": "未爬取到任何文章"
-            }), 404
+            return _no_articles_response(stats)
         
-        # 创建分析器
-        analyzer = DeepSeekAnalyzer()
+        # 创建分析器，交互请求优先于后台批量任务；多后端分析器的后端在进程内共享，跨请求保留延迟样本和健康状态
+        analyzer = create_analyzer(priority=PRIORITY_INTERACTIVE)
         
-        # 分析文章
-        result = analyzer.analyze(articles)
+        # 分析文章并保存报告，增量模式下只分析上一份报告之后的新文章
+        with ANALYSES_IN_PROGRESS.track_inprogress():
+            result = DeltaReporter(analyzer, category, delta=delta).run(articles)
         
-        if not result:
+        if result is None:
             return jsonify({
                 "success": False,
                 "message": "分析失败"
             }), 500
         
-        # 保存报告
-        report_path = save_report(result, category)
+        if result.path is None:
+            return jsonify({
+                "success": True,
+                "message": f"{result.since}以来没有新文章",
+                "data": {
+                    "report_content": None,
+                    "report_path": None,
+                    "article_count": len(articles),
+                    **result.to_dict(),
+                    "crawl": stats.to_dict()
+                }
+            })
         
         return jsonify({
             "success": True,
             "data": {
-                "report_content": result,
-                "report_path": str(report_path),
-                "article_count": len(articles)
+                "report_content": result.content,
+                "report_path": str(result.path),
+                "article_count": len(articles),
+                **result.to_dict(),
+                "crawl": stats.to_dict()
             }
         })
         
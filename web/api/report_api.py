@@ -16,11 +16,11 @@ def list_reports():
     try:
         reports = []
         
-        # 确保目录存在
-        OUTPUT_DIR.mkdir(exist_ok=True, parents=True)
+        # 目录在首次保存报告时创建，不存在时没有报告
+        report_files = OUTPUT_DIR.glob("*.md") if OUTPUT_DIR.exists() else []
         
         # 查找所有MD文件
-        for file in OUTPUT_DIR.glob("*.md"):
+        for file in report_files:
             if file.is_file():
                 # 解析文件名获取元数据
                 filename = file.name
@@ -2,7 +2,9 @@
 Web路由定义
 """
 
-from flask import Blueprint, render_template, redirect, url_for
+from flask import Blueprint, Response, render_template, redirect, url_for
+
+from app.utils.metrics import registry as metrics_registry
 
 main_routes = Blueprint("main", __name__)
 
@@ -19,4 +21,9 @@ def scraper():
 @main_routes.route("/reports")
 def reports():
     """报告页面"""
-    return render_template("reports.html") 
\ No newline at end of file
+    return render_template("reports.html")
+
+@main_routes.route("/metrics")
+def metrics():
+    """Prometheus格式的运行指标"""
+    return Response(metrics_registry.render(), mimetype="text/plain; version=0.0.4")
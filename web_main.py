@@ -6,12 +6,12 @@
 import os
 import argparse
 from dotenv import load_dotenv
-from waitress import serve
 
 # 加载环境变量
 load_dotenv()
 
 from web import create_app
+from app.utils.timing import enable_timing
 
 def parse_args():
     """解析命令行参数"""
@@ -19,12 +19,15 @@ def parse_args():
     parser.add_argument("--host", default="127.0.0.1", help="监听地址")
     parser.add_argument("--port", type=int, default=5000, help="监听端口")
     parser.add_argument("--debug", action="store_true", help="启用调试模式")
+    parser.add_argument("--timings", action="store_true", help="统计各阶段耗时，可通过 /api/news/timings 查看")
     
     return parser.parse_args()
 
 def main():
     """主函数"""
     args = parse_args()
+    if args.timings:
+        enable_timing()
     app = create_app()
     
     if args.debug:
@@ -32,6 +35,7 @@ def main():
         app.run(host=args.host, port=args.port, debug=True)
     else:
         # 生产模式
+        from waitress import serve
         print(f"服务已启动在 http://{args.host}:{args.port}")
         serve(app, host=args.host, port=args.port)
 